@@ -0,0 +1,60 @@
+"""
+Admin Endpoints
+Cache statistics, top keys and invalidation for admin users
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.auth import get_current_active_admin
+from app.core.cache import cache
+from app.core.negative import negative_cache
+from app.models.models import User
+from app.scrapers.selector_plans import get_plan_stats
+from app.services import cache_warmer
+from app.services.categories import category_store
+from app.services.prefetch import prefetcher
+
+router = APIRouter()
+
+
+@router.get("/cache/stats", summary="Cache statistics")
+async def cache_stats(admin: User = Depends(get_current_active_admin)):
+    """
+    Global and per-namespace cache statistics.
+    Namespaces are key prefixes: page (listings), video (scrapes), resp (encoded responses), ...
+    """
+    return {
+        "cache": cache.get_stats(),
+        "namespaces": cache.namespace_stats(),
+        "negative": negative_cache.get_stats(),
+        "warmer": cache_warmer.get_stats(),
+        "prefetch": prefetcher.get_stats(),
+        "categories": category_store.get_stats(),
+        "selector_plans": get_plan_stats(),
+    }
+
+
+@router.get("/cache/keys", summary="Top cache keys")
+async def cache_keys(
+    by: str = Query("hits", pattern="^(hits|bytes)$"),
+    limit: int = Query(20, ge=1, le=500),
+    prefix: str = Query("", description="Only keys starting with this, e.g. page:xnxx:"),
+    admin: User = Depends(get_current_active_admin),
+):
+    """Resident keys with the most hits or the most bytes."""
+    return cache.top_keys(by=by, limit=limit, prefix=prefix)
+
+
+@router.delete("/cache/keys", summary="Invalidate cache keys")
+async def invalidate_cache(
+    prefix: Optional[str] = Query(None, description="Key prefix, e.g. resp:/api/v1/videos"),
+    tag: Optional[str] = Query(None, description="Tag, e.g. a site name (page:, video: and resp: keys)"),
+    admin: User = Depends(get_current_active_admin),
+):
+    """Drop every key matching the prefix and/or tag."""
+    if not prefix and not tag:
+        raise HTTPException(status_code=400, detail="prefix or tag required")
+    removed = await cache.invalidate(prefix=prefix or None, tag=tag or None)
+    return {"removed": removed, "prefix": prefix, "tag": tag}
@@ -16,7 +16,8 @@ async def get_similar_videos(
     try:
         # First, we need to info about the source video (tags, category, etc.)
         # We use get_video_info which now returns 'related_videos' too!
-        video_metadata = await get_video_info(url)
+        # The related profile skips stream extraction and proxy resolution
+        video_metadata = await get_video_info(url, include="related")
         
         # Pass full metadata to engine
         recommendations = await RecommendationEngine.get_similar_videos(video_metadata, limit=limit)
@@ -1 +1,6 @@
 """Middleware package"""
+
+from .response_cache import ResponseCacheMiddleware
+from .http_cache import HttpCacheMiddleware
+
+__all__ = ['ResponseCacheMiddleware', 'HttpCacheMiddleware']
@@ -0,0 +1,123 @@
+"""
+HTTP Cache Middleware
+Cache-Control, ETag, Vary and 304 Not Modified for cacheable GET routes
+
+Without validators the app and any CDN in front of us refetch every
+response in full. For the routes in ROUTE_MAX_AGE this middleware sets
+`Cache-Control: public, max-age=<server-side TTL>, stale-while-revalidate`,
+`Vary: Accept-Encoding` and a strong ETag, and answers a matching
+If-None-Match with 304.
+
+The ETag normally comes with the response: the response cache stores one
+with every body and the categories store pre-computes its own, so a
+conditional hit is decided from the headers and the cached body is dropped
+without being serialized again. Only responses arriving without an ETag are
+buffered and hashed here. Registered outside the response cache and inside
+CORS, so 304s still carry CORS and rate-limit headers.
+"""
+
+from typing import Optional
+
+from app.config.settings import settings
+from app.core.etag import etag_matches, make_etag
+
+from .response_cache import ROUTE_TTLS
+
+# Routes given caching headers, with their max-age in seconds
+ROUTE_MAX_AGE: dict[str, int] = {
+    **ROUTE_TTLS,
+    "/api/v1/categories": settings.CACHE_TTL_CATEGORIES,
+}
+
+# Dropped from 304s: they describe a body that isn't sent
+_BODY_HEADERS = frozenset({b"content-length", b"content-type", b"content-encoding"})
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _request_header(scope, name: bytes) -> Optional[str]:
+    value = _header(scope["headers"], name)
+    return value.decode("latin-1") if value is not None else None
+
+
+class HttpCacheMiddleware:
+    """Pure ASGI middleware adding caching headers and 304s for ROUTE_MAX_AGE"""
+
+    def __init__(self, app, routes: Optional[dict[str, int]] = None):
+        self.app = app
+        self.routes = ROUTE_MAX_AGE if routes is None else routes
+
+    def _cache_headers(self, headers: list, max_age: int) -> list:
+        headers = list(headers)
+        if _header(headers, b"cache-control") is None:
+            value = f"public, max-age={max_age}, stale-while-revalidate={settings.CACHE_STALE_TTL}"
+            headers.append((b"cache-control", value.encode()))
+        vary = b",".join(v for k, v in headers if k.lower() == b"vary").lower()
+        if b"accept-encoding" not in vary:
+            headers.append((b"vary", b"Accept-Encoding"))
+        return headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        max_age = self.routes.get(scope["path"])
+        if max_age is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = _request_header(scope, b"if-none-match")
+        start: Optional[dict] = None
+        chunks: list[bytes] = []
+        # "pass": forward as is; "drop": 304 sent, swallow the body;
+        # "buffer": no ETag yet, hash the body once complete
+        mode = "pass"
+
+        async def send_not_modified(headers):
+            headers = [(k, v) for k, v in headers if k.lower() not in _BODY_HEADERS]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def wrapped(message):
+            nonlocal start, mode
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status not in (200, 304):
+                    await send(message)
+                    return
+                headers = self._cache_headers(message.get("headers", ()), max_age)
+                etag = _header(headers, b"etag")
+                if status == 200 and etag is None:
+                    start = {**message, "headers": headers}
+                    mode = "buffer"
+                    return
+                if status == 200 and etag_matches(if_none_match, etag.decode("latin-1")):
+                    mode = "drop"
+                    await send_not_modified(headers)
+                    return
+                await send({**message, "headers": headers})
+                return
+
+            if message["type"] != "http.response.body" or mode == "pass":
+                await send(message)
+                return
+            if mode == "drop":
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            etag = make_etag(body)
+            headers = start["headers"] + [(b"etag", etag.encode())]
+            if etag_matches(if_none_match, etag):
+                await send_not_modified(headers)
+                return
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, wrapped)
@@ -0,0 +1,310 @@
+"""
+Response Cache Middleware
+Caches the encoded response of hot idempotent GET endpoints
+
+The data behind /videos and the global search/trending
+endpoints is cached already, but a hit still rebuilds pydantic models,
+validates them and JSON-encodes the result. This middleware keeps the
+final body bytes (plus a gzip copy for larger bodies) and replays them
+without entering the route at all. The static app version and media
+provider responses are kept the same way. A strong ETag of the body is computed
+when it is stored (see http_cache for the conditional request handling).
+
+Entries live in the shared cache under resp:{path}?{query}, with the query
+sorted and URL-valued params canonicalized. They have no stale window of
+their own: the page and search caches underneath already serve stale data
+while refreshing, and an entry is never kept longer than the cached data it
+was built from stays fresh (not at all if that data was already stale), so
+the bytes are never older than the data's own TTL allows. They are
+tagged with the site(s) they were built from, like the page entries, so
+invalidating a site's tag also drops its encoded responses. Only 200
+responses without Set-Cookie are stored. Empty results are kept for at most
+NEGATIVE_TTL_EMPTY, and search/trending responses to which no site
+contributed are not stored at all. Registered inside CORS and the rate limiter, so hits still
+get per-request CORS and rate-limit headers.
+
+/videos pages served here, hits included, are reported to the next-page
+prefetcher; the route doesn't report them again when it renders for the
+cache.
+"""
+
+import gzip
+import json
+import logging
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from app.config.settings import settings
+from app.core.cache import cache, track_freshness
+from app.core.etag import make_etag
+from app.core.urls import canonical_url
+from app.scrapers import list_scraper
+from app.services.global_search import TRENDING_URLS, record_query
+from app.services.prefetch import prefetcher
+from app.services.video_cache import site_name
+
+logger = logging.getLogger(__name__)
+
+# Bodies at least this large also get a gzip copy
+GZIP_MIN_BYTES = 1024
+
+VIDEOS_PATH = "/api/v1/videos"
+SEARCH_PATH = "/api/v1/search/global"
+TRENDING_PATH = "/api/v1/trending/global"
+
+# Cached routes and their TTLs
+ROUTE_TTLS: dict[str, int] = {
+    VIDEOS_PATH: settings.CACHE_TTL_LIST,
+    SEARCH_PATH: settings.CACHE_TTL_SEARCH,
+    TRENDING_PATH: settings.CACHE_TTL_SEARCH,
+    "/api/v1/media/providers": settings.CACHE_TTL_STATIC,
+    "/api/apphub/version": settings.CACHE_TTL_STATIC,
+}
+
+_URL_PARAMS = frozenset({"base_url", "url"})
+
+# Scope key telling the route its response is rendered for this cache
+RENDERING_SCOPE_KEY = "apphub.response_cache"
+_SKIP_HEADERS = frozenset({b"content-length", b"content-encoding", b"vary"})
+
+
+class _Uncacheable(Exception):
+    """Carries a response that must reach the client but not the cache"""
+
+    def __init__(self, response: tuple):
+        super().__init__(response[0])
+        self.response = response
+
+
+def response_key(path: str, query_string: bytes) -> str:
+    """Cache key of a GET response: path plus normalized query"""
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    params = sorted((k, canonical_url(v) if k in _URL_PARAMS else v) for k, v in params)
+    return f"resp:{path}?{urlencode(params)}"
+
+
+def response_tags(path: str, params: list[tuple[str, str]]) -> tuple[str, ...]:
+    """Sites a cached response is built from (its invalidation tags)"""
+    if path == VIDEOS_PATH:
+        for name, value in params:
+            if name == "base_url":
+                try:
+                    host = urlsplit(value).hostname or ""
+                except ValueError:
+                    return ()
+                scraper = list_scraper(host)
+                return (site_name(scraper),) if scraper is not None else ()
+        return ()
+    if path in (SEARCH_PATH, TRENDING_PATH):
+        sites = tuple(sorted({value.lower() for name, value in params if name == "sites"}))
+        # No sites= means every site global search/trending covers
+        return sites or tuple(TRENDING_URLS)
+    return ()
+
+
+def response_ttl(path: str, body: bytes, ttl: float) -> float:
+    """
+    TTL for a rendered 200 body of a cached route
+
+    Returns:
+        ttl, at most NEGATIVE_TTL_EMPTY for empty results, or 0 (not
+        stored) for a search/trending response no site contributed to
+    """
+    if path == VIDEOS_PATH:
+        return min(ttl, settings.NEGATIVE_TTL_EMPTY) if body == b"[]" else ttl
+    if path not in (SEARCH_PATH, TRENDING_PATH):
+        return ttl
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return ttl
+    if not isinstance(payload, dict) or "total_results" not in payload:
+        return ttl
+    if payload.get("sites_searched", payload.get("sites")) == 0:
+        return 0
+    if payload["total_results"] == 0:
+        return min(ttl, settings.NEGATIVE_TTL_EMPTY)
+    return ttl
+
+
+def _observe_listing(params: list[tuple[str, str]], served: int):
+    """Report a served /videos page to the prefetcher (route's clamping)"""
+    query = dict(params)
+    try:
+        page = max(int(query.get("page", 1)), 1)
+        limit = min(max(int(query.get("limit", 20)), 1), 60)
+        host = urlsplit(query["base_url"]).hostname or ""
+    except (KeyError, ValueError):
+        return
+    scraper = list_scraper(host)
+    if scraper is not None:
+        prefetcher.observe(scraper, query["base_url"], page, limit, served)
+
+
+def _item_count(path: str, body: bytes) -> Optional[int]:
+    if path != VIDEOS_PATH:
+        return None
+    try:
+        items = json.loads(body)
+    except ValueError:
+        return None
+    return len(items) if isinstance(items, list) else None
+
+
+def _render_scope(scope, path: str, query_string: bytes) -> dict:
+    """
+    Minimal request scope for rendering a shared response
+
+    The rendered bytes serve every client and may be produced after the
+    request that triggered them is gone, so nothing client-specific
+    (headers, client address) is passed to the route.
+    """
+    host = next((value for name, value in scope["headers"] if name == b"host"), b"localhost")
+    render_scope = {
+        "type": "http",
+        "asgi": scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": scope.get("scheme", "http"),
+        "server": scope.get("server"),
+        "client": None,
+        "root_path": scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "query_string": query_string,
+        "headers": [(b"host", host)],
+        RENDERING_SCOPE_KEY: True,
+    }
+    for name in ("app", "state"):
+        if name in scope:
+            render_scope[name] = scope[name]
+    return render_scope
+
+
+def _accepts_gzip(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            return b"gzip" in value.lower()
+    return False
+
+
+class ResponseCacheMiddleware:
+    """Pure ASGI middleware serving cached response bytes for ROUTE_TTLS"""
+
+    def __init__(self, app, routes: Optional[dict[str, int]] = None):
+        self.app = app
+        self.routes = ROUTE_TTLS if routes is None else routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        ttl = self.routes.get(scope["path"])
+        if ttl is None:
+            await self.app(scope, receive, send)
+            return
+
+        query_string = scope.get("query_string", b"")
+        path = scope["path"]
+        key = response_key(path, query_string)
+        params = parse_qsl(query_string.decode("latin-1"))
+        if path == SEARCH_PATH:
+            # Counted here, hits never reach the search service
+            for name, value in params:
+                if name == "query":
+                    record_query(value)
+        state = {"hit": True, "fresh_for": None}
+        render_scope = _render_scope(scope, path, query_string)
+
+        async def render():
+            state["hit"] = False
+            with track_freshness() as freshness:
+                response = await self._render(render_scope)
+            state["fresh_for"] = min(freshness, default=None)
+            return response
+
+        def entry_ttl(response) -> float:
+            seconds = response_ttl(path, response[2], ttl)
+            if state["fresh_for"] is not None:
+                seconds = min(seconds, max(state["fresh_for"], 0))
+            return seconds
+
+        try:
+            response = await cache.get_or_set(
+                key,
+                render,
+                ttl_seconds=entry_ttl,
+                tags=response_tags(path, params),
+            )
+        except _Uncacheable as e:
+            response = e.response
+            state["hit"] = False
+        # Entries stored before the item count was kept have four fields
+        count = response[4] if len(response) > 4 else None
+        if path == VIDEOS_PATH and settings.PREFETCH_ENABLED and count is not None:
+            _observe_listing(params, count)
+        await self._send(scope, send, response, "HIT" if state["hit"] else "MISS")
+
+    async def _render(self, scope) -> tuple:
+        """
+        Run the route and capture its response
+
+        Returns:
+            (status, headers, body, gzip_body or None, item count of a
+            /videos list or None)
+
+        Raises:
+            _Uncacheable: for responses that must not be stored
+        """
+        status = 500
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+        cacheable = True
+
+        async def receive():
+            # GET: no body; never report a disconnect, a background
+            # refresh outlives the request that started it
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def capture(message):
+            nonlocal status, cacheable
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    name = name.lower()
+                    if name == b"set-cookie":
+                        cacheable = False
+                    if name not in _SKIP_HEADERS:
+                        headers.append((name, value))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        if not any(name == b"etag" for name, _ in headers):
+            # Hashed once here; conditional requests on hits reuse it
+            headers.append((b"etag", make_etag(body).encode()))
+        gz = gzip.compress(body, 5) if len(body) >= GZIP_MIN_BYTES else None
+        count = _item_count(scope["path"], body) if status == 200 else None
+        response = (status, tuple(headers), body, gz, count)
+        if status != 200 or not cacheable:
+            raise _Uncacheable(response)
+        return response
+
+    async def _send(self, scope, send, response: tuple, state: str):
+        status, headers, body, gz = response[:4]
+        headers = list(headers)
+        if gz is not None:
+            headers.append((b"vary", b"Accept-Encoding"))
+            if _accepts_gzip(scope):
+                body = gz
+                headers.append((b"content-encoding", b"gzip"))
+                # Distinct representation, distinct strong ETag
+                headers = [
+                    (name, value[:-1] + b'-gz"' if name == b"etag" and value.endswith(b'"') else value)
+                    for name, value in headers
+                ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        headers.append((b"x-cache", state.encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
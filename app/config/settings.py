@@ -41,8 +41,52 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_ENABLED: bool = True
+    REDIS_CACHE_PREFIX: str = "sc:"
+    # Key for the HMAC on shared-tier (Redis/shm) cache entries (default: SECRET_KEY)
+    CACHE_SIGNING_KEY: str = ""
+    # Shared-memory L2 for several workers on one host (used instead of Redis)
+    CACHE_SHM_ENABLED: bool = False
+    CACHE_SHM_PATH: str = "/dev/shm/apphub-cache"
+    CACHE_SHM_BYTES: int = 64 * 1024 * 1024
+    # Warm restarts: snapshot periodically and at shutdown, restore at startup
+    CACHE_SNAPSHOT_ENABLED: bool = True
+    CACHE_SNAPSHOT_PATH: str = "./data/cache.snapshot"
+    CACHE_SNAPSHOT_INTERVAL: int = 600  # seconds
     CACHE_TTL_SCRAPE: int = 3600  # 1 hour
     CACHE_TTL_LIST: int = 900  # 15 minutes
+    CACHE_MAX_ENTRIES: int = 50000
+    CACHE_MAX_BYTES: int = 128 * 1024 * 1024  # Estimated size of cached values
+    CACHE_POLICY: str = "tinylfu"  # "lru" or "tinylfu"
+    CACHE_TTL_SEARCH: int = 600  # 10 minutes
+    CACHE_TTL_CATEGORIES: int = 3600  # Category lists change rarely
+    CACHE_TTL_STATIC: int = 300  # App version and media provider config
+    CATEGORIES_RELOAD_CHECK_SECONDS: float = 5.0  # How often categories.json files are checked for changes
+    RESPONSE_CACHE_ENABLED: bool = True  # Cache encoded responses of hot GETs
+    HTTP_CACHE_ENABLED: bool = True  # Cache-Control / ETag / 304 on cacheable GETs
+    CACHE_WARM_ENABLED: bool = True  # Refresh trending/category/search pages ahead of expiry
+    CACHE_WARM_INTERVAL: int = 120  # seconds between warming passes
+    CACHE_WARM_INITIAL_DELAY: int = 30  # Let startup traffic go first
+    CACHE_WARM_PAGES: int = 3  # Trending pages per site
+    CACHE_WARM_TOP_CATEGORIES: int = 5  # Per site, by video_count
+    CACHE_WARM_TOP_SEARCHES: int = 10
+    CACHE_WARM_PAUSE: float = 0.5  # seconds between warming fetches
+    PREFETCH_ENABLED: bool = True  # Load the next /videos page(s) after serving one
+    PREFETCH_MAX_DEPTH: int = 3  # Pages ahead at most
+    PREFETCH_MIN_PROBABILITY: float = 0.3  # Prefetch while scroll-through**depth stays above this
+    PREFETCH_WINDOW: int = 600  # seconds within which page N+1 counts as scrolled through
+    PREFETCH_CONCURRENCY: int = 2  # Prefetch fetches in flight at once
+    BACKGROUND_REQUESTS_PER_MINUTE: int = 10  # Per site, for warming/prefetch
+    NEGATIVE_TTL_NOT_FOUND: int = 600  # Upstream 404
+    NEGATIVE_TTL_GONE: int = 6 * 3600  # Upstream 410
+    NEGATIVE_TTL_CHALLENGE: int = 60  # Cloudflare challenge
+    NEGATIVE_TTL_EMPTY: int = 120  # Listing page without cards
+    NEGATIVE_TTL_PARSE: int = 300  # Scraper failed on the page
+    CACHE_TTL_INFO: int = 300  # Streams whose signed URLs show no expiry
+    CACHE_INFO_EXPIRY_MARGIN: int = 120  # Drop info this long before stream URLs expire
+    CACHE_STALE_TTL: int = 1800  # Serve stale while refreshing, past the TTL
+    CACHE_STALE_IF_ERROR: int = 6 * 3600  # Serve stale past that when upstream fails
+    CACHE_COMPRESS_MIN_BYTES: int = 32 * 1024  # Compress larger values (0 = off)
+    CACHE_COMPRESS_MAX_RATIO: float = 0.6  # Keep compressed only below this size ratio
     
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
@@ -67,6 +111,7 @@ class Settings(BaseSettings):
     SCRAPER_TIMEOUT: int = 30
     SCRAPER_MAX_RETRIES: int = 3
     SCRAPER_RETRY_DELAY: int = 2
+    MASA49_WP_REST: bool = True  # Page through wp-json before scraping themed HTML
     
     # HLS Proxy
     HLS_PROXY_ENABLED: bool = True
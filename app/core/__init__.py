@@ -7,12 +7,12 @@ Modules:
 - limiter: Rate limiting
 """
 
-from .cache import cache, cleanup_task as cache_cleanup
+from .cache import cache, cleanup_task as cache_cleanup, snapshot_task as cache_snapshot
 from .pool import pool, fetch_html
 from .limiter import rate_limit_middleware, cleanup_task as rate_limit_cleanup
 
 __all__ = [
-    'cache', 'cache_cleanup',
+    'cache', 'cache_cleanup', 'cache_snapshot',
     'pool', 'fetch_html',
     'rate_limit_middleware', 'rate_limit_cleanup'
 ]
@@ -0,0 +1,80 @@
+"""
+Outbound Request Budgets
+Per-site token buckets for background upstream traffic
+
+Live requests are never throttled here. Background work (cache warming,
+prefetching) asks the budget before each upstream fetch, so it can't get
+a site to rate-limit or block us on behalf of requests nobody made yet.
+"""
+
+from time import monotonic
+from typing import Optional
+
+from app.config.settings import settings
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class OutboundBudget:
+    """Token bucket per site: `per_minute` requests, bursting to `burst`"""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        """
+        Args:
+            per_minute: Sustained background requests per site and minute
+            burst: Bucket size (default: per_minute)
+        """
+        self.rate = per_minute / 60.0
+        self.burst = burst if burst is not None else per_minute
+        self._buckets: dict[str, _Bucket] = {}
+        self._granted = 0
+        self._denied = 0
+
+    def _bucket(self, site: str) -> _Bucket:
+        now = monotonic()
+        bucket = self._buckets.get(site)
+        if bucket is None:
+            bucket = self._buckets[site] = _Bucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        return bucket
+
+    def try_acquire(self, site: str, cost: float = 1.0) -> bool:
+        """
+        Take `cost` tokens from a site's bucket if it has them
+
+        Returns:
+            True if the request may go out now
+        """
+        bucket = self._bucket(site)
+        if bucket.tokens < cost:
+            self._denied += 1
+            return False
+        bucket.tokens -= cost
+        self._granted += 1
+        return True
+
+    def available(self, site: str) -> float:
+        """Tokens a site has left right now"""
+        return self._bucket(site).tokens
+
+    def get_stats(self) -> dict:
+        """Get budget statistics"""
+        return {
+            "per_minute": self.rate * 60,
+            "burst": self.burst,
+            "granted": self._granted,
+            "denied": self._denied,
+            "sites": {site: round(self._bucket(site).tokens, 2) for site in list(self._buckets)},
+        }
+
+
+# Shared by every background producer of upstream traffic
+background_budget = OutboundBudget(settings.BACKGROUND_REQUESTS_PER_MINUTE)
@@ -1,168 +1,1093 @@
 """
 In-Memory Cache with TTL (Zero Cost - No Redis Needed)
 Provides LRU eviction and automatic expiration
+
+Timestamps come from time.monotonic() and each entry is a small slotted
+record. Every operation completes without awaiting, so on the single
+threaded event loop no lock is needed: a coroutine can never observe a
+half-applied update.
+
+Besides the entry count, the cache is bounded by an estimated byte budget:
+each value is sized once at set() and least recently used entries are
+evicted until the total fits.
+
+Eviction policy is either plain LRU or W-TinyLFU: new entries land in a
+small LRU window, and an entry leaving the window only displaces a
+resident entry if a count-min frequency sketch says it is requested more
+often. One-off lookups then can't flush hot pages.
+
+get_or_set() supports stale-while-revalidate: past the soft TTL the stale
+value is returned at once and a single background refresh runs; past the
+hard TTL the caller waits for the refresh, but if it fails the stale value
+is still served (stale-if-error) for a grace period.
+
+An optional lower tier (Redis, see redis_cache.RedisTier, or a host-local
+shared-memory table, see shm_cache.SharedMemoryTier) sits behind the
+in-process dict: L1 misses fall through to it, entries fetched from it are
+installed in L1 with their remaining TTLs, and writes reach it in
+pipelined batches without delaying the caller.
+
+The cache can be snapshotted to a compressed file (periodically and at
+shutdown) and restored at startup, so deploys come up warm.
+
+Values are frozen when stored (see frozen.freeze): every hit returns the
+same read-only object, so no request can change what the next one sees.
+
+Large values (crawls, full scrapes with related videos, ...) can be kept
+compressed: above a size threshold the pickled value is deflated with a
+preset dictionary of strings common to our payloads, and kept that way
+only if it shrinks enough. Hits on such entries pay a decompress+unpickle
+(and get a fresh, still frozen, copy); the time spent both ways is in the
+stats.
 """
 
 from collections import OrderedDict
-from datetime import datetime, timedelta
-from typing import Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter, time as wall_time
+from typing import Any, Callable, Optional, Union
 import asyncio
+import heapq
+import inspect
 import logging
+import os
+import pickle
+import sys
+import zlib
+
+from app.config.settings import settings
+from app.core.frozen import freeze
+from app.core.redis_cache import RedisTier, signing_key_configured
+from app.core.urls import get_stats as url_stats
 
 logger = logging.getLogger(__name__)
 
+# Collector of the innermost track_freshness() block, if any
+_freshness: ContextVar[Optional[list[float]]] = ContextVar("cache_freshness", default=None)
+
+
+@contextmanager
+def track_freshness():
+    """
+    Collect how long the cached values read inside the block stay fresh
+
+    Yields a list that receives the seconds until stale (negative once
+    stale) of every get_or_set() hit in this task and the tasks it starts.
+    Anything built from those values is no fresher than their minimum.
+    """
+    seen: list[float] = []
+    token = _freshness.set(seen)
+    try:
+        yield seen
+    finally:
+        _freshness.reset(token)
+
+
+def _note_freshness(entry, now: float):
+    seen = _freshness.get()
+    if seen is not None:
+        seen.append(entry.stale_at - now)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory held by a value
+
+    Walks containers and object attributes, counting every distinct object
+    once (shared strings and sub-objects are not double counted). This is
+    an estimate: allocator overhead is ignored.
+
+    Args:
+        value: Value to size
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen: set[int] = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if obj is None or obj is True or obj is False:
+            continue
+        oid = id(obj)
+        if oid in seen:
+            continue
+        seen.add(oid)
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, int, float)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            attrs = getattr(obj, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for slot in getattr(type(obj), "__slots__", ()):
+                stack.append(getattr(obj, slot, None))
+    return total
+
+
+# Preset dictionary for entry compression: strings that recur in pickled
+# scrape/listing values. Entries packed with a different dictionary (L2,
+# snapshots from another build) are skipped rather than misread.
+_ZDICT = pickle.dumps(
+    {
+        "url": "https://www.", "title": "", "thumbnail_url": "https://", "duration": "10:00",
+        "views": "1K", "uploader_name": "", "uploader_avatar_url": "", "category": "",
+        "tags": [], "preview_url": "", "description": "", "related_videos": [],
+        "video": {"has_video": True, "streams": [{"quality": "720p", "format": "mp4", "url": ""}],
+                  "default": "", "hls": ".m3u8"},
+    },
+    protocol=pickle.HIGHEST_PROTOCOL,
+) + b"".join(s.encode() for s in (
+    "app.core.frozen", "FrozenDict", "app.services.listing", "VideoCard",
+    "xvideos", "xnxx", "xhamster", "pornhub", "youporn", "redtube", "beeg", "spankbang", "masa49",
+    "1080p", "480p", "240p", ".jpg", ".webp", ".mp4", "/videos/", "/video-", ".com/",
+))
+_ZDICT_ID = zlib.crc32(_ZDICT)
+
+
+class _Packed:
+    """A cached value kept as a deflated pickle"""
+
+    __slots__ = ("data", "dict_id")
+
+    def __init__(self, data: bytes, dict_id: int = _ZDICT_ID):
+        self.data = data
+        self.dict_id = dict_id
+
+    def __reduce__(self):
+        return _Packed, (self.data, self.dict_id)
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of recent key frequencies (TinyLFU)
+
+    Four rows of saturating 4-bit counters (stored one per byte). After
+    `10 x width` increments every counter is halved, so the sketch tracks
+    recent popularity rather than all-time counts.
+    """
+
+    _HALVE = bytes(i >> 1 for i in range(256))
+    _DEPTH = 4
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Expected number of resident entries
+        """
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(self._DEPTH)]
+        self._sample_size = 10 * width
+        self._additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        mask = self._mask
+        return [(h1 + i * h2) & mask for i in range(self._DEPTH)]
+
+    def increment(self, key: str):
+        """Record one access of key"""
+        for row, i in zip(self._rows, self._indexes(key)):
+            if row[i] < 15:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [row.translate(self._HALVE) for row in self._rows]
+            self._additions //= 2
+
+    def frequency(self, key: str) -> int:
+        """Estimated recent access count of key (0-15)"""
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+
+
+class _Entry:
+    """
+    Cached value with its monotonic timestamps and size
+
+    stale_at is the soft TTL, hard_at the end of the stale-while-revalidate
+    window and expires_at the point the entry is dropped (hard_at plus the
+    stale-if-error grace). Entries set without a stale window have all three
+    equal.
+    """
+
+    __slots__ = ("value", "created_at", "stale_at", "hard_at", "expires_at", "size", "hits", "tags")
+
+    def __init__(
+        self,
+        value: Any,
+        created_at: float,
+        stale_at: float,
+        hard_at: float,
+        expires_at: float,
+        size: int,
+        tags: tuple[str, ...] = (),
+    ):
+        self.value = value
+        self.created_at = created_at
+        self.stale_at = stale_at
+        self.hard_at = hard_at
+        self.expires_at = expires_at
+        self.size = size
+        self.hits = 0
+        self.tags = tags
+
 
 class SimpleCache:
-    """Thread-safe in-memory cache with TTL and LRU eviction"""
-    
-    def __init__(self, max_size: int = 10000):
+    """Event-loop-safe in-memory cache with TTL and LRU or W-TinyLFU eviction"""
+
+    POLICIES = ("lru", "tinylfu")
+    WINDOW_RATIO = 0.01
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        stale_if_error_seconds: int = 0,
+        l2=None,
+        compress_min_bytes: Optional[int] = None,
+        compress_max_ratio: float = 0.6,
+    ):
         """
         Initialize cache
-        
+
         Args:
             max_size: Maximum number of items to store
+            max_bytes: Estimated byte budget for cached values (None = unbounded)
+            policy: "lru" or "tinylfu" (window LRU + frequency admission)
+            stale_if_error_seconds: How long past the hard TTL an entry set
+                with a stale window is kept to serve when its refresh fails
+            l2: Optional lower tier (e.g. RedisTier) shared between processes
+            compress_min_bytes: Values estimated at least this large are
+                stored compressed (None = never)
+            compress_max_ratio: Keep the compressed form only if it is at
+                most this fraction of the estimated size
         """
-        self.cache = OrderedDict()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy}")
+        self.policy = policy
+        # Main region; with tinylfu, new keys start in self._window
+        self.cache: OrderedDict[str, _Entry] = OrderedDict()
+        self._window: OrderedDict[str, _Entry] = OrderedDict()
+        self._sketch: Optional[FrequencySketch] = None
         self.max_size = max_size
-        self._lock = asyncio.Lock()
+        self.max_bytes = max_bytes
+        self._window_size = 0
+        self._window_bytes: Optional[int] = None
+        if policy == "tinylfu":
+            self._sketch = FrequencySketch(max_size)
+            self._window_size = max(1, int(max_size * self.WINDOW_RATIO))
+            if max_bytes is not None:
+                self._window_bytes = max(1, int(max_bytes * self.WINDOW_RATIO))
+        self._bytes = 0
+        self._win_bytes = 0
         self._hits = 0
         self._misses = 0
-    
-    async def set(self, key: str, value: Any, ttl_seconds: int = 3600):
+        self._evictions = 0
+        self._rejected = 0
+        self.stale_if_error_seconds = stale_if_error_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refresh_tasks: set[asyncio.Task] = set()
+        self._stale_hits = 0
+        self._stale_errors = 0
+        self._refreshes = 0
+        self.l2 = l2
+        self._l2_pending: list[tuple[str, _Entry]] = []
+        self._l2_flush_scheduled = False
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_max_ratio = compress_max_ratio
+        self._packed = 0
+        self._pack_skipped = 0
+        self._pack_in_bytes = 0
+        self._pack_out_bytes = 0
+        self._pack_seconds = 0.0
+        self._unpacks = 0
+        self._unpack_seconds = 0.0
+        # Per key namespace (text before the first ':'): [hits, misses, evictions]
+        self._ns: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.cache) + len(self._window)
+
+    def _entries(self):
+        """All (key, entry) pairs, window first"""
+        yield from self._window.items()
+        yield from self.cache.items()
+
+    def _ns_counts(self, key: str) -> list[int]:
+        ns = key.partition(":")[0]
+        counts = self._ns.get(ns)
+        if counts is None:
+            counts = self._ns[ns] = [0, 0, 0]
+        return counts
+
+    def _hit(self, key: str, entry: _Entry):
+        self._hits += 1
+        entry.hits += 1
+        self._ns_counts(key)[0] += 1
+
+    def _miss(self, key: str):
+        self._misses += 1
+        self._ns_counts(key)[1] += 1
+
+    def _evicted(self, key: str):
+        self._evictions += 1
+        self._ns_counts(key)[2] += 1
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            entry = self._window.pop(key, None)
+            if entry is None:
+                return None
+            self._win_bytes -= entry.size
+        self._bytes -= entry.size
+        return entry
+
+    def _over_budget(self, size: int) -> bool:
+        """Would `size` more bytes (one more entry) overflow the cache"""
+        if len(self) >= self.max_size:
+            return True
+        return self.max_bytes is not None and self._bytes + size > self.max_bytes
+
+    def _evict_for(self, size: int):
+        """Evict least recently used entries until `size` more bytes fit (LRU)"""
+        cache = self.cache
+        while cache and self._over_budget(size):
+            victim_key, entry = cache.popitem(last=False)
+            self._bytes -= entry.size
+            self._evicted(victim_key)
+
+    def _admit_from_window(self):
+        """
+        Move entries overflowing the window into the main region
+
+        Each candidate must beat the main region's LRU victims on estimated
+        frequency, otherwise the candidate is the one evicted.
+        """
+        window = self._window
+        sketch = self._sketch
+        while window and (
+            len(window) > self._window_size
+            or (self._window_bytes is not None and self._win_bytes > self._window_bytes)
+        ):
+            key, candidate = window.popitem(last=False)
+            self._win_bytes -= candidate.size
+            # Account the candidate as leaving, then see if main has room
+            self._bytes -= candidate.size
+            admitted = True
+            if self._over_budget(candidate.size):
+                freq = sketch.frequency(key)
+                while self.cache and self._over_budget(candidate.size):
+                    victim_key = next(iter(self.cache))
+                    if freq <= sketch.frequency(victim_key):
+                        admitted = False
+                        break
+                    victim = self.cache.pop(victim_key)
+                    self._bytes -= victim.size
+                    self._evicted(victim_key)
+            if admitted:
+                self.cache[key] = candidate
+                self._bytes += candidate.size
+            else:
+                self._evicted(key)
+
+    def _pack(self, value: Any, size: int) -> tuple[Any, int]:
+        """Compress a large value if that pays off; returns (value, size)"""
+        if self.compress_min_bytes is None or size < self.compress_min_bytes:
+            return value, size
+        start = perf_counter()
+        try:
+            raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return value, size
+        compressor = zlib.compressobj(1, zdict=_ZDICT)
+        data = compressor.compress(raw) + compressor.flush()
+        self._pack_seconds += perf_counter() - start
+        packed = _Packed(data)
+        packed_size = estimate_size(packed)
+        if packed_size > size * self.compress_max_ratio:
+            self._pack_skipped += 1
+            return value, size
+        self._packed += 1
+        self._pack_in_bytes += size
+        self._pack_out_bytes += packed_size
+        return packed, packed_size
+
+    def _value(self, entry: _Entry) -> Any:
+        """The entry's value, decompressing a packed one"""
+        value = entry.value
+        if type(value) is not _Packed:
+            return value
+        start = perf_counter()
+        decompressor = zlib.decompressobj(zdict=_ZDICT)
+        value = pickle.loads(decompressor.decompress(value.data) + decompressor.flush())
+        self._unpacks += 1
+        self._unpack_seconds += perf_counter() - start
+        return value
+
+    def set_nowait(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 3600,
+        stale_ttl_seconds: int = 0,
+        tags: tuple[str, ...] = (),
+    ):
+        """Synchronous set, for callers that are not coroutines"""
+        value = freeze(value)
+        value, size = self._pack(value, estimate_size(value))
+        size += sys.getsizeof(key)
+        if self.max_bytes is not None and size > self.max_bytes // 4:
+            # One value must not flush a quarter of the cache
+            self._remove(key)
+            self._rejected += 1
+            logger.warning("Cache REJECT: %s (%s bytes over per-entry limit)", key, size)
+            return
+
+        now = monotonic()
+        stale_at = now + ttl_seconds
+        hard_at = stale_at + stale_ttl_seconds
+        expires_at = hard_at + self.stale_if_error_seconds if stale_ttl_seconds else hard_at
+        entry = _Entry(value, now, stale_at, hard_at, expires_at, size, tuple(tags))
+        self._store(key, entry)
+        if self.l2 is not None:
+            self._write_behind(key, entry)
+        logger.debug("Cache SET: %s (TTL: %ss, %s bytes)", key, ttl_seconds, size)
+
+    def _store(self, key: str, entry: _Entry):
+        """Insert an entry into the right region, evicting as needed"""
+        size = entry.size
+        if self._sketch is None:
+            self._remove(key)
+            self._evict_for(size)
+            self.cache[key] = entry
+            self._bytes += size
+        else:
+            self._sketch.increment(key)
+            resident = key in self.cache
+            self._remove(key)
+            if resident:
+                # Updating a resident key keeps its place in main
+                self._evict_for(size)
+                self.cache[key] = entry
+                self._bytes += size
+            else:
+                self._window[key] = entry
+                self._win_bytes += size
+                self._bytes += size
+                self._admit_from_window()
+
+    def _write_behind(self, key: str, entry: _Entry):
+        """Queue an L2 write; writes made in the same loop tick share one pipeline"""
+        self._l2_pending.append((key, entry))
+        if self._l2_flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (sync caller outside the app): L1 only
+            self._l2_pending.clear()
+            return
+        self._l2_flush_scheduled = True
+        loop.call_soon(self._spawn, self._flush_l2())
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _flush_l2(self):
+        self._l2_flush_scheduled = False
+        pending, self._l2_pending = self._l2_pending, []
+        if not pending:
+            return
+        offset = wall_time() - monotonic()
+        await self.l2.set_many(
+            (key, e.value, e.stale_at + offset, e.hard_at + offset, e.expires_at - monotonic(), e.tags)
+            for key, e in pending
+        )
+
+    def _install(self, key: str, found: tuple[Any, float, float, tuple[str, ...]]) -> Optional[_Entry]:
+        """Put an entry fetched from L2 into L1, converting wall-clock times"""
+        value, stale_wall, hard_wall, tags = found
+        if type(value) is _Packed and value.dict_id != _ZDICT_ID:
+            return None
+        value = freeze(value)
+        offset = monotonic() - wall_time()
+        stale_at = stale_wall + offset
+        hard_at = hard_wall + offset
+        grace = self.stale_if_error_seconds if hard_at > stale_at else 0
+        expires_at = hard_at + grace
+        now = monotonic()
+        if now > expires_at:
+            return None
+        entry = _Entry(value, now, stale_at, hard_at, expires_at, estimate_size(value) + sys.getsizeof(key), tuple(tags))
+        if self.max_bytes is not None and entry.size > self.max_bytes // 4:
+            return entry
+        self._store(key, entry)
+        return entry
+
+    async def _lookup_l2(self, key: str) -> Optional[_Entry]:
+        if self.l2 is None:
+            return None
+        found = await self.l2.get(key)
+        if found is None:
+            return None
+        return self._install(key, found)
+
+    async def preload(self, keys):
+        """
+        Pull L1-missing keys from L2 in one round trip
+
+        Call before fanning out to several get_or_set() calls so each of
+        them finds its entry in L1.
+
+        Args:
+            keys: Cache keys about to be read
+        """
+        if self.l2 is None:
+            return
+        missing = [k for k in keys if k not in self.cache and k not in self._window]
+        if not missing:
+            return
+        for key, found in (await self.l2.get_many(missing)).items():
+            self._install(key, found)
+
+    def _lookup(self, key: str, now: float) -> Optional[_Entry]:
+        """Find a live entry (fresh or stale) and mark it recently used"""
+        region = self.cache
+        entry = region.get(key)
+        if self._sketch is not None:
+            self._sketch.increment(key)
+            if entry is None:
+                region = self._window
+                entry = region.get(key)
+        if entry is None:
+            return None
+
+        if now > entry.expires_at:
+            self._remove(key)
+            logger.debug("Cache EXPIRED: %s", key)
+            return None
+
+        # Move to end (most recently used)
+        region.move_to_end(key)
+        return entry
+
+    def ttl_remaining(self, key: str) -> Optional[float]:
+        """
+        Seconds until a key goes stale, without counting a hit or touching
+        its recency (negative once stale, None if not in L1)
+        """
+        entry = self.cache.get(key) or self._window.get(key)
+        if entry is None or monotonic() > entry.expires_at:
+            return None
+        return entry.stale_at - monotonic()
+
+    @property
+    def loads_in_flight(self) -> int:
+        """Factory calls currently running (misses and refreshes)"""
+        return len(self._inflight)
+
+    def get_nowait(self, key: str) -> Optional[Any]:
+        """Synchronous get, for callers that are not coroutines"""
+        now = monotonic()
+        entry = self._lookup(key, now)
+        if entry is None or now > entry.stale_at:
+            self._miss(key)
+            return None
+        self._hit(key, entry)
+        return self._value(entry)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 3600,
+        stale_ttl_seconds: int = 0,
+        tags: tuple[str, ...] = (),
+    ):
         """
         Set a value in cache with TTL
-        
+
         Args:
             key: Cache key
             value: Value to store
             ttl_seconds: Time to live in seconds (default: 1 hour)
+            stale_ttl_seconds: How long past the TTL get_or_set may serve the
+                value while refreshing it (default: 0, no stale serving)
+            tags: Labels for invalidate(tag=...)
         """
-        async with self._lock:
-            # Remove oldest item if at capacity
-            if len(self.cache) >= self.max_size and key not in self.cache:
-                self.cache.popitem(last=False)
-            
-            # Store with expiration
-            self.cache[key] = {
-                "value": value,
-                "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds),
-                "created_at": datetime.utcnow()
-            }
-            
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            
-            logger.debug(f"Cache SET: {key} (TTL: {ttl_seconds}s)")
-    
+        self.set_nowait(key, value, ttl_seconds, stale_ttl_seconds, tags)
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Get a value from cache
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value or None if not found/expired
         """
-        async with self._lock:
-            if key not in self.cache:
-                self._misses += 1
-                logger.debug(f"Cache MISS: {key}")
-                return None
-            
-            item = self.cache[key]
-            
-            # Check expiration
-            if datetime.utcnow() > item["expires_at"]:
-                del self.cache[key]
-                self._misses += 1
-                logger.debug(f"Cache EXPIRED: {key}")
-                return None
-            
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            
-            self._hits += 1
-            logger.debug(f"Cache HIT: {key}")
-            return item["value"]
-    
+        value = self.get_nowait(key)
+        if value is None and self.l2 is not None:
+            entry = await self._lookup_l2(key)
+            if entry is not None and monotonic() <= entry.stale_at:
+                self._misses -= 1
+                self._ns_counts(key)[1] -= 1
+                self._hit(key, entry)
+                return self._value(entry)
+        return value
+
     async def delete(self, key: str):
-        """Delete a key from cache"""
-        async with self._lock:
-            if key in self.cache:
-                del self.cache[key]
-                logger.debug(f"Cache DELETE: {key}")
-    
+        """Delete a key from cache (and from L2)"""
+        if self._remove(key) is not None:
+            logger.debug("Cache DELETE: %s", key)
+        if self.l2 is not None:
+            await self.l2.delete(key)
+
+    async def close(self):
+        """Flush pending L2 writes and close the L2 connection"""
+        if self.l2 is not None:
+            await self._flush_l2()
+            await self.l2.close()
+
     async def clear(self):
-        """Clear all cache entries"""
-        async with self._lock:
-            self.cache.clear()
-            self._hits = 0
-            self._misses = 0
-            logger.info("Cache CLEARED")
-    
+        """Clear all cache entries (L1 only; L2 is shared with other processes)"""
+        self.cache.clear()
+        self._window.clear()
+        self._bytes = 0
+        self._win_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._ns.clear()
+        logger.info("Cache CLEARED")
+
+    def _snapshot_bytes(self, entries: list[tuple[str, _Entry]]) -> bytes:
+        offset = wall_time() - monotonic()
+        records = [
+            (key, e.value, e.stale_at + offset, e.hard_at + offset, e.expires_at + offset, e.tags)
+            for key, e in entries
+        ]
+        return _SNAPSHOT_MAGIC + zlib.compress(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+    async def snapshot(self, path: str) -> int:
+        """
+        Write live entries with their remaining TTLs to disk
+
+        The entry list is copied on the event loop; pickling, compression
+        and the atomic file replace run in a worker thread.
+
+        Args:
+            path: Snapshot file
+
+        Returns:
+            Number of entries written
+        """
+        now = monotonic()
+        # Least recently used first, so restore rebuilds the same order
+        entries = [(key, e) for key, e in self._entries() if e.expires_at > now]
+
+        def write():
+            data = self._snapshot_bytes(entries)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            return len(data)
+
+        try:
+            size = await asyncio.to_thread(write)
+        except Exception as e:
+            logger.warning(f"Cache snapshot to {path} failed: {e}")
+            return 0
+        logger.info(f"Cache snapshot: {len(entries)} entries, {size} bytes -> {path}")
+        return len(entries)
+
+    def restore(self, path: str) -> int:
+        """
+        Load a snapshot written by snapshot(), skipping expired entries
+
+        Args:
+            path: Snapshot file
+
+        Returns:
+            Number of entries restored
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Cache snapshot {path} unreadable: {e}")
+            return 0
+        if not data.startswith(_SNAPSHOT_MAGIC):
+            logger.warning(f"Cache snapshot {path} has an unknown format, ignoring")
+            return 0
+        try:
+            records = pickle.loads(zlib.decompress(data[len(_SNAPSHOT_MAGIC):]))
+        except Exception as e:
+            logger.warning(f"Cache snapshot {path} is corrupt, ignoring: {e}")
+            return 0
+
+        offset = monotonic() - wall_time()
+        now = monotonic()
+        restored = 0
+        for key, value, stale_wall, hard_wall, expires_wall, *tags in records:
+            expires_at = expires_wall + offset
+            if expires_at <= now:
+                continue
+            if type(value) is _Packed and value.dict_id != _ZDICT_ID:
+                continue
+            value = freeze(value)
+            size = estimate_size(value) + sys.getsizeof(key)
+            # Snapshots written before tags were kept have five fields
+            tags = tuple(tags[0]) if tags else ()
+            self._store(key, _Entry(value, now, stale_wall + offset, hard_wall + offset, expires_at, size, tags))
+            restored += 1
+        logger.info(f"Cache restored {restored}/{len(records)} entries from {path}")
+        return restored
+
     async def cleanup_expired(self):
         """Remove all expired entries"""
-        async with self._lock:
-            now = datetime.utcnow()
-            expired_keys = [
-                key for key, item in self.cache.items()
-                if now > item["expires_at"]
-            ]
-            
-            for key in expired_keys:
-                del self.cache[key]
-            
-            if expired_keys:
-                logger.info(f"Cache cleanup: removed {len(expired_keys)} expired entries")
-    
+        now = monotonic()
+        expired_keys = [
+            key for key, entry in self._entries()
+            if now > entry.expires_at
+        ]
+
+        for key in expired_keys:
+            self._remove(key)
+
+        if expired_keys:
+            logger.info(f"Cache cleanup: removed {len(expired_keys)} expired entries")
+
     def get_stats(self) -> dict:
         """Get cache statistics"""
         total_requests = self._hits + self._misses
         hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
-        
+
+        size = len(self)
+        largest = max((e.size for _, e in self._entries()), default=0)
+
         return {
-            "size": len(self.cache),
+            "policy": self.policy,
+            "size": size,
+            "window_size": len(self._window),
             "max_size": self.max_size,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "bytes_used_percent": round(self._bytes / self.max_bytes * 100, 2) if self.max_bytes else None,
+            "avg_entry_bytes": self._bytes // size if size else 0,
+            "largest_entry_bytes": largest,
+            "evictions": self._evictions,
+            "rejected": self._rejected,
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate_percent": round(hit_rate, 2),
-            "total_requests": total_requests
+            "total_requests": total_requests,
+            "stale_hits": self._stale_hits,
+            "stale_if_error_hits": self._stale_errors,
+            "background_refreshes": self._refreshes,
+            "l2": self.l2.get_stats() if self.l2 is not None else None,
+            "canonical_urls": url_stats(),
+            "compression": {
+                "min_bytes": self.compress_min_bytes,
+                "packed_entries": self._packed,
+                "skipped_entries": self._pack_skipped,
+                "ratio": round(self._pack_out_bytes / self._pack_in_bytes, 3) if self._pack_in_bytes else None,
+                "bytes_saved": self._pack_in_bytes - self._pack_out_bytes,
+                "compress_ms": round(self._pack_seconds * 1000, 2),
+                "decompressions": self._unpacks,
+                "decompress_ms": round(self._unpack_seconds * 1000, 2),
+                "avg_decompress_us": round(self._unpack_seconds / self._unpacks * 1e6, 1) if self._unpacks else 0,
+            },
         }
-    
+
+    _AGE_BUCKETS = ((60, "<1m"), (300, "1-5m"), (900, "5-15m"), (3600, "15-60m"), (float("inf"), ">1h"))
+
+    def namespace_stats(self) -> dict[str, dict]:
+        """
+        Statistics per key namespace (the text before the first ':')
+
+        Returns:
+            {namespace: {hits, misses, hit_rate_percent, evictions, size,
+            bytes, age}} where age counts resident entries per age bucket
+        """
+        now = monotonic()
+        result: dict[str, dict] = {}
+
+        def stats_for(ns: str) -> dict:
+            stats = result.get(ns)
+            if stats is None:
+                hits, misses, evictions = self._ns.get(ns, (0, 0, 0))
+                total = hits + misses
+                stats = result[ns] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate_percent": round(hits / total * 100, 2) if total else 0,
+                    "evictions": evictions,
+                    "size": 0,
+                    "bytes": 0,
+                    "age": {label: 0 for _, label in self._AGE_BUCKETS},
+                }
+            return stats
+
+        for key, entry in self._entries():
+            stats = stats_for(key.partition(":")[0])
+            stats["size"] += 1
+            stats["bytes"] += entry.size
+            age = now - entry.created_at
+            for limit, label in self._AGE_BUCKETS:
+                if age < limit:
+                    stats["age"][label] += 1
+                    break
+        for ns in self._ns:
+            stats_for(ns)
+        return result
+
+    def top_keys(self, by: str = "hits", limit: int = 20, prefix: str = "") -> list[dict]:
+        """
+        Resident keys with the most hits or bytes
+
+        Args:
+            by: "hits" or "bytes"
+            limit: Number of keys
+            prefix: Only keys starting with this
+
+        Returns:
+            [{key, hits, bytes, age_seconds, ttl_seconds, tags}]
+        """
+        if by not in ("hits", "bytes"):
+            raise ValueError(f"Unknown ordering: {by}")
+        attr = "hits" if by == "hits" else "size"
+        now = monotonic()
+        entries = ((k, e) for k, e in self._entries() if k.startswith(prefix))
+        return [
+            {
+                "key": key,
+                "hits": entry.hits,
+                "bytes": entry.size,
+                "age_seconds": round(now - entry.created_at, 1),
+                "ttl_seconds": round(entry.stale_at - now, 1),
+                "tags": list(entry.tags),
+            }
+            for key, entry in heapq.nlargest(limit, entries, key=lambda item: getattr(item[1], attr))
+        ]
+
+    async def invalidate(self, prefix: Optional[str] = None, tag: Optional[str] = None) -> int:
+        """
+        Drop every resident key with the prefix and/or tag (also from L2)
+
+        L2 entries whose keys aren't resident here can't be enumerated and
+        expire on their own.
+
+        Returns:
+            Number of L1 entries removed
+        """
+        if prefix is None and tag is None:
+            raise ValueError("prefix or tag required")
+        keys = [
+            key for key, entry in self._entries()
+            if (prefix is None or key.startswith(prefix)) and (tag is None or tag in entry.tags)
+        ]
+        for key in keys:
+            self._remove(key)
+        if self.l2 is not None:
+            await asyncio.gather(*(self.l2.delete(key) for key in keys))
+        logger.info("Cache INVALIDATE prefix=%s tag=%s: %s entries", prefix, tag, len(keys))
+        return len(keys)
+
+    async def _load(
+        self,
+        key: str,
+        factory,
+        ttl_seconds: int,
+        stale_ttl_seconds: int,
+        cache_if: Optional[Callable[[Any], bool]],
+        tags: tuple[str, ...] = (),
+    ) -> Any:
+        """
+        Run factory once per key at a time; concurrent callers share the result
+
+        If the caller running the factory is cancelled, the load is abandoned
+        rather than failed: callers waiting on it retry, and the first of them
+        runs the factory itself.
+        """
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = factory()
+            if inspect.isawaitable(value):
+                value = await value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a load nobody else waited on doesn't warn
+            future.exception()
+            raise
+        else:
+            value = freeze(value)
+            ttl = ttl_seconds(value) if callable(ttl_seconds) else ttl_seconds
+            if value is not None and ttl > 0 and (cache_if is None or cache_if(value)):
+                self.set_nowait(key, value, ttl, stale_ttl_seconds, tags)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refresh_in_background(self, key: str, factory, ttl_seconds: int, stale_ttl_seconds: int, cache_if, tags=()):
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._load(key, factory, ttl_seconds, stale_ttl_seconds, cache_if, tags)
+            except Exception as e:
+                logger.warning("Cache refresh failed for %s: %s", key, e)
+
+        self._refreshes += 1
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def refresh(
+        self,
+        key: str,
+        factory,
+        ttl_seconds: Union[float, Callable[[Any], float]] = 3600,
+        stale_ttl_seconds: int = 0,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        tags: tuple[str, ...] = (),
+    ) -> Any:
+        """
+        Recompute a key now, even if it is still fresh (cache warming)
+
+        Shares the in-flight load with concurrent get_or_set misses; the
+        arguments are those of get_or_set.
+
+        Returns:
+            Computed value
+        """
+        self._refreshes += 1
+        return await self._load(key, factory, ttl_seconds, stale_ttl_seconds, cache_if, tags)
+
     async def get_or_set(
-        self, 
-        key: str, 
-        factory, 
-        ttl_seconds: int = 3600
+        self,
+        key: str,
+        factory,
+        ttl_seconds: Union[float, Callable[[Any], float]] = 3600,
+        stale_ttl_seconds: int = 0,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        tags: tuple[str, ...] = (),
     ) -> Any:
         """
         Get value from cache, or compute and cache it if not found
-        
+
+        Concurrent misses for the same key share one factory call.
+
         Args:
             key: Cache key
-            factory: Async function to compute value if not cached
-            ttl_seconds: TTL for newly cached value
-            
+            factory: Function (sync or async) computing the value if not cached
+            ttl_seconds: Soft TTL for newly cached value, or a function of
+                the value returning it (values with TTL <= 0 aren't cached)
+            stale_ttl_seconds: Window past the soft TTL in which the stale
+                value is returned immediately while one background refresh
+                runs. Past it the refresh is awaited, and the stale value is
+                only returned if the refresh raises.
+            cache_if: Predicate deciding whether a computed value is cached
+                (None results are never cached)
+            tags: Labels for invalidate(tag=...)
+
         Returns:
             Cached or computed value
         """
-        # Try to get from cache
-        value = await self.get(key)
-        if value is not None:
-            return value
-        
-        # Compute value
-        value = await factory() if asyncio.iscoroutinefunction(factory) else factory()
-        
-        # Cache it
-        await self.set(key, value, ttl_seconds)
-        
-        return value
+        now = monotonic()
+        entry = self._lookup(key, now)
+        if entry is None and self.l2 is not None:
+            entry = await self._lookup_l2(key)
+            now = monotonic()
+        if entry is not None:
+            _note_freshness(entry, now)
+            if now <= entry.stale_at:
+                self._hit(key, entry)
+                return self._value(entry)
+            if now <= entry.hard_at:
+                self._hit(key, entry)
+                self._stale_hits += 1
+                self._refresh_in_background(key, factory, ttl_seconds, stale_ttl_seconds, cache_if, tags)
+                return self._value(entry)
+        self._miss(key)
+
+        try:
+            return await self._load(key, factory, ttl_seconds, stale_ttl_seconds, cache_if, tags)
+        except Exception as e:
+            if entry is None:
+                raise
+            self._stale_errors += 1
+            logger.warning("Serving stale %s after refresh error: %s", key, e)
+            _note_freshness(entry, monotonic())
+            return self._value(entry)
+
+
+_SNAPSHOT_MAGIC = b"SCSNAP1\n"
+
+
+def _make_l2():
+    """Lower tier from settings: host-local shared memory, else Redis, else none"""
+    if (settings.CACHE_SHM_ENABLED or settings.REDIS_ENABLED) and not signing_key_configured():
+        # Entries are unpickled: never trust a tier others could sign for
+        logger.warning("Shared cache tier disabled: set CACHE_SIGNING_KEY (or SECRET_KEY) to a private value")
+        return None
+    if settings.CACHE_SHM_ENABLED:
+        from app.core.shm_cache import SharedMemoryTier
+        try:
+            return SharedMemoryTier(settings.CACHE_SHM_PATH, size_bytes=settings.CACHE_SHM_BYTES)
+        except OSError as e:
+            logger.warning(f"Shared-memory cache unavailable ({e}), falling back")
+    if settings.REDIS_ENABLED:
+        return RedisTier(settings.REDIS_URL, prefix=settings.REDIS_CACHE_PREFIX)
+    return None
 
 
 # Global cache instance
-cache = SimpleCache(max_size=50000)
+cache = SimpleCache(
+    max_size=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    policy=settings.CACHE_POLICY,
+    stale_if_error_seconds=settings.CACHE_STALE_IF_ERROR,
+    l2=_make_l2(),
+    compress_min_bytes=settings.CACHE_COMPRESS_MIN_BYTES or None,
+    compress_max_ratio=settings.CACHE_COMPRESS_MAX_RATIO,
+)
 
 
 # Background task to cleanup expired entries
@@ -171,3 +1096,11 @@ async def cleanup_task():
     while True:
         await asyncio.sleep(300)  # Every 5 minutes
         await cache.cleanup_expired()
+
+
+# Background task to snapshot the cache to disk
+async def snapshot_task():
+    """Periodic cache snapshot (see SimpleCache.snapshot)"""
+    while True:
+        await asyncio.sleep(settings.CACHE_SNAPSHOT_INTERVAL)
+        await cache.snapshot(settings.CACHE_SNAPSHOT_PATH)
@@ -0,0 +1,22 @@
+"""
+Entity Tags
+Strong ETags for response bodies and If-None-Match matching
+"""
+
+import hashlib
+from typing import Optional
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag (quoted) of a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
@@ -0,0 +1,69 @@
+"""
+Frozen Cache Values
+Read-only containers for values shared through the cache
+
+A cached value is handed to every request that hits it, so it must never
+be mutated in place. freeze() turns dicts into FrozenDict and lists into
+tuples once, when the value is stored; requests that need per-request
+fields build a small overlay with overlay() instead of copying the
+payload, and nested structures stay shared.
+
+FrozenDict subclasses dict, so pydantic models, json and FastAPI accept it
+as they would the original dict.
+"""
+
+from typing import Any, Mapping
+
+
+class FrozenDict(dict):
+    """dict that raises on mutation"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached value is read-only; use overlay() to add fields")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # Default dict-subclass pickling replays __setitem__
+        return FrozenDict, (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """
+    Read-only version of a value
+
+    Args:
+        value: Value built from dicts, lists, sets and scalars
+
+    Returns:
+        The value with dicts as FrozenDict, lists as tuples and sets as
+        frozensets (already frozen dicts are returned as they are)
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def overlay(base: Mapping[str, Any], **fields: Any) -> dict[str, Any]:
+    """
+    Per-request view of a cached mapping with extra or replaced fields
+
+    Only the top-level keys are copied; nested values are shared with the
+    cached original.
+    """
+    return {**base, **fields}
@@ -0,0 +1,146 @@
+"""
+Negative Cache
+Remembers upstream URLs that just failed, so they fail fast for a while
+
+Removed videos and dead category pages otherwise cost a full scrape (often
+several pagination candidates or timeouts) on every request. Failures are
+classified and kept for a class-specific TTL:
+
+    not_found   upstream 404
+    gone        upstream 410 (removed for good, long TTL)
+    challenge   Cloudflare (or similar) bot challenge, short TTL
+    empty       page parsed to no cards
+    parse       page fetched but the scraper failed on it
+
+Transient errors (timeouts, connection resets, 5xx) are not remembered.
+A remembered failure is replayed as the same kind of exception (an
+httpx.HTTPStatusError with the upstream status, or UpstreamParseError), so
+callers' existing error mapping applies unchanged.
+
+Entries live in their own small LRU so the lookups on every request don't
+skew the main cache's hit rate.
+"""
+
+import json
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config.settings import settings
+from app.core.cache import SimpleCache
+
+logger = logging.getLogger(__name__)
+
+_PARSE_ERRORS = (AttributeError, IndexError, KeyError, TypeError, ValueError, json.JSONDecodeError)
+_CHALLENGE_MARKERS = ("just a moment", "cf-chl", "challenge-platform", "attention required", "cf-browser-verification")
+
+
+class UpstreamParseError(Exception):
+    """A remembered scraper failure on a page that was fetched fine"""
+
+
+def _ttls() -> dict[str, int]:
+    return {
+        "not_found": settings.NEGATIVE_TTL_NOT_FOUND,
+        "gone": settings.NEGATIVE_TTL_GONE,
+        "challenge": settings.NEGATIVE_TTL_CHALLENGE,
+        "empty": settings.NEGATIVE_TTL_EMPTY,
+        "parse": settings.NEGATIVE_TTL_PARSE,
+    }
+
+
+def _is_challenge(response) -> bool:
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("cf-mitigated") == "challenge":
+        return True
+    try:
+        text = response.text[:4096].lower()
+    except Exception:
+        return False
+    return any(marker in text for marker in _CHALLENGE_MARKERS)
+
+
+def classify(exc: BaseException) -> Optional[tuple[str, Optional[int]]]:
+    """
+    Failure class of an exception raised while loading from upstream
+
+    Returns:
+        (kind, upstream status) or None for errors that shouldn't be cached
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status == 404:
+        return "not_found", 404
+    if status == 410:
+        return "gone", 410
+    if status in (403, 429, 503) and _is_challenge(response):
+        return "challenge", status
+    if status is None and isinstance(exc, _PARSE_ERRORS):
+        return "parse", None
+    return None
+
+
+class NegativeCache:
+    """Short-lived record of failed upstream keys"""
+
+    def __init__(self, max_size: int = 20000):
+        self._entries = SimpleCache(max_size=max_size, policy="lru")
+        self._counts: dict[str, int] = dict.fromkeys(_ttls(), 0)
+        self._served = 0
+
+    def check(self, key: str, url: str = "") -> bool:
+        """
+        Fail fast if key is remembered as failed
+
+        Returns:
+            True for a remembered empty page (caller returns no items),
+            False if nothing is remembered
+
+        Raises:
+            httpx.HTTPStatusError or UpstreamParseError replaying the failure
+        """
+        found = self._entries.get_nowait(key)
+        if found is None:
+            return False
+        self._served += 1
+        kind, status = found
+        if kind == "empty":
+            return True
+        if status is not None:
+            request = httpx.Request("GET", url or "https://invalid/")
+            raise httpx.HTTPStatusError(
+                f"Upstream returned {status} (cached)",
+                request=request,
+                response=httpx.Response(status, request=request),
+            )
+        raise UpstreamParseError(f"Upstream page could not be parsed (cached {kind})")
+
+    def remember(self, key: str, kind: str, status: Optional[int] = None):
+        """Record a failure of the given class"""
+        ttl = _ttls()[kind]
+        if ttl <= 0:
+            return
+        self._counts[kind] += 1
+        self._entries.set_nowait(key, (kind, status), ttl)
+        logger.debug("Negative cache %s: %s (%ss)", kind, key, ttl)
+
+    def remember_error(self, key: str, exc: BaseException):
+        """Record exc if it is a cacheable failure"""
+        found = classify(exc)
+        if found is not None:
+            self.remember(key, *found)
+
+    def get_stats(self) -> dict:
+        """Get negative cache statistics"""
+        stats = self._entries.get_stats()
+        return {
+            "size": stats["size"],
+            "lookups": stats["total_requests"],
+            "served": self._served,
+            "recorded": dict(self._counts),
+            "ttls": _ttls(),
+        }
+
+
+negative_cache = NegativeCache()
@@ -0,0 +1,281 @@
+"""
+Redis L2 Cache Tier
+Shared second tier behind the in-process SimpleCache
+
+Entries are stored as one compact binary blob: a fixed header with the
+wall-clock soft/hard expiry, an HMAC-SHA256 of the rest, then the pickled
+value and its tags. The Redis key TTL is set to the entry's remaining lifetime so Redis
+drops it on its own.
+
+The tier is shared with whatever else can write to that Redis, so nothing
+is unpickled unless its HMAC verifies under CACHE_SIGNING_KEY (SECRET_KEY
+by default); anything else reads as a miss. While that key is still one of
+the published placeholder defaults there is no secret to sign with: the
+cache runs without a lower tier and loads() reports misses.
+
+Redis is optional: if the package is missing, the server is unreachable or
+a command fails, the tier reports misses and the cache keeps working as
+L1-only. After a failure the tier stays off for a short cool-down instead
+of paying a connect timeout on every request.
+"""
+
+import hashlib
+import hmac
+import logging
+import pickle
+import struct
+import time
+from typing import Any, Iterable, Optional
+
+from app.config.settings import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 3
+_HEADER = struct.Struct("!Bdd")  # version, stale_at, hard_at (epoch seconds)
+_MAC_SIZE = hashlib.sha256().digest_size
+
+
+# SECRET_KEY values shipped in settings.py, docker-compose.yml and .env.example
+_PLACEHOLDER_KEYS = frozenset({
+    "",
+    Settings.model_fields["SECRET_KEY"].default,
+    "change-this-secret-key-in-production",
+    "change-this-to-a-secure-random-string-min-32-characters-long",
+})
+
+
+def _signing_key() -> bytes:
+    return (settings.CACHE_SIGNING_KEY or settings.SECRET_KEY).encode("utf-8")
+
+
+def signing_key_configured() -> bool:
+    """Whether shared-tier entries can be signed with a non-public key"""
+    return (settings.CACHE_SIGNING_KEY or settings.SECRET_KEY) not in _PLACEHOLDER_KEYS
+
+
+def _mac(header: bytes, payload: bytes) -> bytes:
+    return hmac.new(_signing_key(), header + payload, hashlib.sha256).digest()
+
+
+def dumps(value: Any, stale_at: float, hard_at: float, tags: tuple[str, ...] = ()) -> bytes:
+    """
+    Serialize a cache entry
+
+    Args:
+        value: Cached value (must be picklable)
+        stale_at: Wall-clock soft expiry
+        hard_at: Wall-clock end of the stale window
+        tags: The entry's invalidation tags
+
+    Returns:
+        Header + HMAC + pickled (value, tags)
+    """
+    header = _HEADER.pack(_FORMAT_VERSION, stale_at, hard_at)
+    payload = pickle.dumps((value, tuple(tags)), protocol=pickle.HIGHEST_PROTOCOL)
+    return header + _mac(header, payload) + payload
+
+
+def loads(data: bytes) -> Optional[tuple[Any, float, float, tuple[str, ...]]]:
+    """
+    Deserialize a cache entry
+
+    Returns:
+        (value, stale_at, hard_at, tags), or None for an unknown format, an
+        entry whose HMAC doesn't verify (never unpickled), or any entry while
+        the signing key is a public placeholder
+    """
+    if not signing_key_configured():
+        return None
+    if len(data) < _HEADER.size + _MAC_SIZE:
+        return None
+    version, stale_at, hard_at = _HEADER.unpack_from(data)
+    if version != _FORMAT_VERSION:
+        return None
+    header = data[:_HEADER.size]
+    mac = data[_HEADER.size:_HEADER.size + _MAC_SIZE]
+    payload = data[_HEADER.size + _MAC_SIZE:]
+    if not hmac.compare_digest(mac, _mac(header, payload)):
+        return None
+    value, tags = pickle.loads(payload)
+    return value, stale_at, hard_at, tags
+
+
+class RedisTier:
+    """Redis-backed second cache tier that degrades to misses on errors"""
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "sc:",
+        timeout: float = 0.25,
+        retry_after: float = 30.0,
+    ):
+        """
+        Initialize tier (connects lazily)
+
+        Args:
+            url: Redis URL
+            prefix: Key prefix, keeps cache keys apart from other Redis users
+            timeout: Socket timeout in seconds for every command
+            retry_after: Seconds to stay off after a Redis error
+        """
+        self.url = url
+        self.prefix = prefix
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._client = None
+        self._down_until = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                logger.warning("redis package not installed, L2 cache disabled")
+                self._down_until = float("inf")
+                return None
+            self._client = redis.from_url(
+                self.url,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout,
+            )
+        return self._client
+
+    def _failed(self, op: str, e: Exception):
+        self._errors += 1
+        if self.available:
+            logger.warning(f"Redis cache {op} failed, L1-only for {self.retry_after:.0f}s: {e}")
+        self._down_until = time.monotonic() + self.retry_after
+
+    def _decode(self, data: Optional[bytes]) -> Optional[tuple[Any, float, float, tuple[str, ...]]]:
+        if data is None:
+            self._misses += 1
+            return None
+        try:
+            entry = loads(data)
+        except Exception as e:
+            logger.debug("Undecodable L2 entry: %s", e)
+            entry = None
+        if entry is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return entry
+
+    async def get(self, key: str) -> Optional[tuple[Any, float, float, tuple[str, ...]]]:
+        """
+        Get an entry
+
+        Returns:
+            (value, stale_at, hard_at, tags) with wall-clock times, or None
+        """
+        if not self.available:
+            return None
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            data = await client.get(self.prefix + key)
+        except Exception as e:
+            self._failed("get", e)
+            return None
+        return self._decode(data)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, tuple[Any, float, float, tuple[str, ...]]]:
+        """
+        Get several entries in one round trip (MGET)
+
+        Returns:
+            Mapping of found keys to (value, stale_at, hard_at, tags)
+        """
+        keys = list(keys)
+        if not keys or not self.available:
+            return {}
+        client = self._get_client()
+        if client is None:
+            return {}
+        try:
+            values = await client.mget([self.prefix + k for k in keys])
+        except Exception as e:
+            self._failed("mget", e)
+            return {}
+        found = {}
+        for key, data in zip(keys, values):
+            entry = self._decode(data)
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    async def set_many(self, entries: Iterable[tuple[str, Any, float, float, float, tuple[str, ...]]]):
+        """
+        Write entries in one pipelined round trip
+
+        Args:
+            entries: (key, value, stale_at, hard_at, ttl_seconds, tags) tuples
+                with wall-clock times; ttl_seconds becomes the Redis key TTL
+        """
+        if not self.available:
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                queued = 0
+                for key, value, stale_at, hard_at, ttl_seconds, tags in entries:
+                    ttl_ms = int(ttl_seconds * 1000)
+                    if ttl_ms <= 0:
+                        continue
+                    pipe.set(self.prefix + key, dumps(value, stale_at, hard_at, tags), px=ttl_ms)
+                    queued += 1
+                if queued:
+                    await pipe.execute()
+        except Exception as e:
+            self._failed("set", e)
+
+    async def set(
+        self, key: str, value: Any, stale_at: float, hard_at: float, ttl_seconds: float, tags: tuple[str, ...] = (),
+    ):
+        """Write one entry (see set_many)"""
+        await self.set_many([(key, value, stale_at, hard_at, ttl_seconds, tags)])
+
+    async def delete(self, key: str):
+        """Delete an entry"""
+        if not self.available:
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            await client.delete(self.prefix + key)
+        except Exception as e:
+            self._failed("delete", e)
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+
+    def get_stats(self) -> dict:
+        """Get tier statistics"""
+        total = self._hits + self._misses
+        return {
+            "url": self.url.split("@")[-1],
+            "available": self.available,
+            "hits": self._hits,
+            "misses": self._misses,
+            "errors": self._errors,
+            "hit_rate_percent": round(self._hits / total * 100, 2) if total else 0,
+        }
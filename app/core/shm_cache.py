@@ -0,0 +1,269 @@
+"""
+Shared-Memory Cache Tier
+mmap'd hash table shared by every worker process on a host
+
+Layout of the backing file (under /dev/shm by default, so it never touches
+disk):
+
+    header | slot table (open addressing) | data ring
+
+A slot holds the key hash, the offset/length/sequence of the newest record
+for that key and its wall-clock expiry. Records are appended to the data
+ring (key, then an entry encoded and HMAC-signed like the Redis tier, since
+any process that can open the file can write to it); when the ring wraps,
+old records are overwritten and their slots simply stop validating.
+
+Writers serialize on an flock of the file. Readers take no lock: they copy
+a slot, read the record it points to and accept it only if the record's
+sequence number, key and CRC all match, so a record being overwritten
+concurrently reads as a miss rather than garbage.
+
+Same interface as redis_cache.RedisTier, so it plugs into SimpleCache as
+the lower tier.
+"""
+
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Iterable, Optional
+
+from app.core.redis_cache import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"SHMCACHE"
+_VERSION = 1
+# magic, version, n_slots, data_size, head, next_seq
+_HEADER = struct.Struct("<8sIIQQQ")
+_HEADER_SIZE = 64
+# key_hash, offset, length, seq, expires_at
+_SLOT = struct.Struct("<QQIQd")
+_SLOT_SIZE = 40
+# seq, key_len, payload_len, crc32
+_RECORD = struct.Struct("<QIII")
+_PROBES = 8
+
+
+def _key_hash(key: bytes) -> int:
+    # Stable across processes, unlike hash(); 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryTier:
+    """Cross-process cache tier on an mmap'd hash table"""
+
+    def __init__(self, path: str, size_bytes: int = 64 * 1024 * 1024, n_slots: int = 65536):
+        """
+        Open (or create) the shared table
+
+        Args:
+            path: Backing file; every worker must use the same path
+            size_bytes: Size of the data ring
+            n_slots: Hash table slots (max distinct keys)
+        """
+        self.path = path
+        self.n_slots = n_slots
+        self.data_size = size_bytes
+        self._slots_at = _HEADER_SIZE
+        self._data_at = _HEADER_SIZE + n_slots * _SLOT_SIZE
+        self._total = self._data_at + size_bytes
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if os.fstat(self._fd).st_size != self._total:
+                os.ftruncate(self._fd, self._total)
+            self._mm = mmap.mmap(self._fd, self._total)
+            magic, version, slots, data_size, _, _ = _HEADER.unpack_from(self._mm, 0)
+            if (magic, version, slots, data_size) != (_MAGIC, _VERSION, n_slots, size_bytes):
+                # New file or different geometry: start empty
+                self._mm[:self._data_at] = bytes(self._data_at)
+                _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, n_slots, size_bytes, 0, 1)
+
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _slot_index(self, h: int, probe: int) -> int:
+        return (h + probe) % self.n_slots
+
+    def _read_slot(self, index: int) -> tuple[int, int, int, int, float]:
+        return _SLOT.unpack_from(self._mm, self._slots_at + index * _SLOT_SIZE)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        kb = key.encode()
+        h = _key_hash(kb)
+        now = time.time()
+        mm = self._mm
+        for probe in range(_PROBES):
+            slot_hash, offset, length, seq, expires_at = self._read_slot(self._slot_index(h, probe))
+            if slot_hash == 0:
+                return None
+            if slot_hash != h or length == 0:
+                continue
+            if expires_at < now:
+                return None
+            start = self._data_at + offset
+            rec = bytes(mm[start:start + length])
+            if len(rec) < _RECORD.size:
+                return None
+            rseq, key_len, payload_len, crc = _RECORD.unpack_from(rec, 0)
+            body = rec[_RECORD.size:]
+            if rseq != seq or key_len + payload_len != len(body) or body[:key_len] != kb:
+                return None
+            if zlib.crc32(body) != crc:
+                return None
+            return body[key_len:]
+        return None
+
+    def _write(self, key: str, payload: bytes, expires_at: float) -> bool:
+        """Append a record and point the key's slot at it (lock held)"""
+        kb = key.encode()
+        body = kb + payload
+        length = _RECORD.size + len(body)
+        if length > self.data_size // 8:
+            self._rejected += 1
+            return False
+
+        mm = self._mm
+        magic, version, slots, data_size, head, seq = _HEADER.unpack_from(mm, 0)
+        if head + length > self.data_size:
+            head = 0
+
+        # Pick a slot: same key, else an empty/expired one, else the soonest to expire
+        h = _key_hash(kb)
+        now = time.time()
+        target = None
+        fallback = None
+        fallback_exp = None
+        for probe in range(_PROBES):
+            index = self._slot_index(h, probe)
+            slot_hash, _, _, _, slot_exp = self._read_slot(index)
+            if slot_hash == h or slot_hash == 0 or slot_exp < now:
+                target = index
+                if slot_hash == h or slot_hash == 0:
+                    break
+            elif fallback_exp is None or slot_exp < fallback_exp:
+                fallback, fallback_exp = index, slot_exp
+        if target is None:
+            target = fallback
+
+        start = self._data_at + head
+        rec = _RECORD.pack(seq, len(kb), len(payload), zlib.crc32(body)) + body
+        mm[start:start + length] = rec
+        _SLOT.pack_into(mm, self._slots_at + target * _SLOT_SIZE, h, head, length, seq, expires_at)
+        _HEADER.pack_into(mm, 0, magic, version, slots, data_size, head + length, seq + 1)
+        return True
+
+    async def get(self, key: str) -> Optional[tuple[Any, float, float, tuple[str, ...]]]:
+        """
+        Get an entry
+
+        Returns:
+            (value, stale_at, hard_at, tags) with wall-clock times, or None
+        """
+        payload = self._read(key)
+        if payload is None:
+            self._misses += 1
+            return None
+        try:
+            entry = loads(payload)
+        except Exception:
+            entry = None
+        if entry is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return entry
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, tuple[Any, float, float, tuple[str, ...]]]:
+        """Get several entries (no round trip to batch, kept for tier parity)"""
+        found = {}
+        for key in keys:
+            entry = await self.get(key)
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    async def set_many(self, entries: Iterable[tuple[str, Any, float, float, float, tuple[str, ...]]]):
+        """
+        Write entries under a single lock acquisition
+
+        Args:
+            entries: (key, value, stale_at, hard_at, ttl_seconds, tags) tuples
+                with wall-clock times
+        """
+        encoded = []
+        now = time.time()
+        for key, value, stale_at, hard_at, ttl_seconds, tags in entries:
+            if ttl_seconds <= 0:
+                continue
+            try:
+                encoded.append((key, dumps(value, stale_at, hard_at, tags), now + ttl_seconds))
+            except Exception as e:
+                logger.debug("Unpicklable cache value for %s: %s", key, e)
+        if not encoded:
+            return
+        with self._locked():
+            for key, payload, expires_at in encoded:
+                self._write(key, payload, expires_at)
+
+    async def set(
+        self, key: str, value: Any, stale_at: float, hard_at: float, ttl_seconds: float, tags: tuple[str, ...] = (),
+    ):
+        """Write one entry (see set_many)"""
+        await self.set_many([(key, value, stale_at, hard_at, ttl_seconds, tags)])
+
+    async def delete(self, key: str):
+        """Delete an entry"""
+        kb = key.encode()
+        h = _key_hash(kb)
+        with self._locked():
+            for probe in range(_PROBES):
+                index = self._slot_index(h, probe)
+                slot_hash = self._read_slot(index)[0]
+                if slot_hash == 0:
+                    return
+                if slot_hash == h:
+                    # Keep the hash so probing continues past this slot
+                    _SLOT.pack_into(self._mm, self._slots_at + index * _SLOT_SIZE, h, 0, 0, 0, 0.0)
+
+    async def close(self):
+        """Unmap the table (the file stays for the other workers)"""
+        try:
+            self._mm.close()
+            os.close(self._fd)
+        except (OSError, ValueError):
+            pass
+
+    def get_stats(self) -> dict:
+        """Get tier statistics"""
+        total = self._hits + self._misses
+        now = time.time()
+        used = 0
+        for index in range(self.n_slots):
+            slot_hash, _, length, _, expires_at = self._read_slot(index)
+            if slot_hash and length and expires_at >= now:
+                used += 1
+        return {
+            "path": self.path,
+            "slots": self.n_slots,
+            "slots_used": used,
+            "data_bytes": self.data_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "rejected": self._rejected,
+            "hit_rate_percent": round(self._hits / total * 100, 2) if total else 0,
+        }
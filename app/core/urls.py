@@ -0,0 +1,131 @@
+"""
+Canonical URLs for cache keys
+
+Upstream URLs reach us in many spellings: http vs https, www. vs bare
+host, trailing slashes, tracking params, params in any order, beeg's
+-0{id} ids. canonical_url() maps them to one form so they share cache
+entries and in-flight fetches. It is only used to build keys; requests
+still go to the URL the client sent.
+
+Stats track how often canonicalization merged a URL into a key already
+seen under another spelling, i.e. cache entries/fetches saved.
+"""
+
+import re
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Only click ids and analytics params no site uses for content. Generic
+# names (ref, source, from, ...) can select what a listing shows.
+_TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "_ga", "_gl", "mc_cid", "mc_eid",
+})
+
+_HOST_ALIASES = {
+    "redtube.net": "redtube.com",
+}
+
+_BEEG_ID = re.compile(r"^/-?0*(\d{6,})$")
+
+
+def _beeg(path: str, params: list[tuple[str, str]]):
+    m = _BEEG_ID.match(path)
+    if m:
+        path = "/" + m.group(1)
+    return path, params
+
+
+def _pornhub(path: str, params: list[tuple[str, str]]):
+    if path == "/view_video.php":
+        # Only the viewkey identifies the video
+        params = [(k, v) for k, v in params if k == "viewkey"]
+    return path, params
+
+
+_SITE_RULES: dict[str, Callable] = {
+    "beeg.com": _beeg,
+    "pornhub.com": _pornhub,
+}
+
+_MAX_TRACKED = 100_000
+_stats = {"calls": 0, "rewritten": 0, "merged": 0}
+_seen_raw: set[str] = set()
+_seen_canonical: set[str] = set()
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of an upstream URL for use in cache keys
+
+    - https scheme, lowercase host without www. or port
+    - no fragment, tracking params (utm_*, fbclid, ...) dropped
+    - remaining params sorted, trailing slash removed (except root)
+    - per-site rules (beeg -0{id}, pornhub viewkey only)
+
+    Args:
+        url: URL as received
+
+    Returns:
+        Canonical URL string (the input unchanged if it doesn't parse)
+    """
+    _stats["calls"] += 1
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = _HOST_ALIASES.get(host, host)
+
+    params = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    rule = _SITE_RULES.get(host)
+    if rule is not None:
+        path, params = rule(path, params)
+
+    canonical = urlunsplit(("https", host, path, urlencode(sorted(params)), ""))
+    _track(url, canonical)
+    return canonical
+
+
+def _track(raw: str, canonical: str):
+    if raw != canonical:
+        _stats["rewritten"] += 1
+    if len(_seen_raw) >= _MAX_TRACKED or raw in _seen_raw:
+        return
+    _seen_raw.add(raw)
+    if canonical in _seen_canonical:
+        # A new spelling of a URL we already key on: one entry instead of two
+        _stats["merged"] += 1
+    else:
+        _seen_canonical.add(canonical)
+
+
+def get_stats() -> dict:
+    """
+    Canonicalization statistics
+
+    Returns:
+        calls, rewritten (input differed from canonical form), merged (new
+        spellings folded into an existing key), distinct raw vs canonical
+        URLs seen (tracking stops after 100k raw URLs)
+    """
+    distinct_raw = len(_seen_raw)
+    distinct_canonical = len(_seen_canonical)
+    return {
+        **_stats,
+        "distinct_raw": distinct_raw,
+        "distinct_canonical": distinct_canonical,
+        "fragmentation_removed_percent": round((1 - distinct_canonical / distinct_raw) * 100, 2) if distinct_raw else 0,
+    }
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import httpx
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -13,13 +13,16 @@ import logging
 from app.config.settings import settings
 
 # Core Modules
-from app.core import cache, cache_cleanup, pool, rate_limit_middleware, rate_limit_cleanup
+from app.core import cache, cache_cleanup, cache_snapshot, pool, rate_limit_middleware, rate_limit_cleanup
+from app.core.etag import etag_matches
 
 # Exception handlers
 from app.exception_handlers import not_found_handler, internal_error_handler, general_exception_handler
 
 # API Routers
-from app.api.endpoints import recommendations, hls, media
+from app.api.endpoints import recommendations, hls, media, admin
+from app.api.middleware import HttpCacheMiddleware, ResponseCacheMiddleware
+from app.api.middleware.response_cache import RENDERING_SCOPE_KEY
 # We will define new standardized routers here or import them if we moved them.
 # For this refactor, we will define them inline or in a new api module. 
 # To keep it clean, I will implement the Router structure within main.py for now, 
@@ -28,7 +31,13 @@ from app.api.endpoints import recommendations, hls, media
 from fastapi import APIRouter
 
 # Scrapers & Models
-from app.scrapers import masa49, xhamster, xnxx, xvideos, pornhub, youporn, redtube, beeg, spankbang, fapnut
+from app.scrapers import masa49, xhamster, xnxx, xvideos, pornhub, youporn, redtube, beeg, spankbang, fapnut, list_scraper
+from app.scrapers.profiles import resolve_include
+from app.services.cache_warmer import warm_task as cache_warm
+from app.services.categories import SOURCES as CATEGORY_SOURCES, category_store
+from app.services.listing import cached_page
+from app.services.prefetch import prefetcher
+from app.services.video_cache import cached_scrape
 from app.models.schemas import ScrapeResponse, ListItem, CategoryItem, ScrapeRequest, ListRequest
 
 logging.basicConfig(level=logging.INFO)
@@ -38,7 +47,13 @@ logging.basicConfig(level=logging.INFO)
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
     # Startup
+    await category_store.start()
+    if settings.CACHE_SNAPSHOT_ENABLED:
+        cache.restore(settings.CACHE_SNAPSHOT_PATH)
+        asyncio.create_task(cache_snapshot())
     asyncio.create_task(cache_cleanup())
+    if settings.CACHE_WARM_ENABLED:
+        asyncio.create_task(cache_warm())
     asyncio.create_task(rate_limit_cleanup())
     logging.info("✅ Started background cleanup tasks")
     logging.info("✅ Zero-cost optimizations enabled")
@@ -48,6 +63,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     await pool.close()
     logging.info("✅ Closed HTTP connection pool")
+    if settings.CACHE_SNAPSHOT_ENABLED:
+        await cache.snapshot(settings.CACHE_SNAPSHOT_PATH)
+    await cache.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -66,6 +84,15 @@ app.add_exception_handler(500, internal_error_handler)
 app.add_exception_handler(StarletteHTTPException, general_exception_handler)
 app.add_exception_handler(HTTPException, general_exception_handler)
 
+# Cached response bytes for hot GETs; innermost, so CORS and rate limiting
+# still run on hits
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Cache-Control / ETag / 304 around it, so conditional hits skip the body
+if settings.HTTP_CACHE_ENABLED:
+    app.add_middleware(HttpCacheMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -90,6 +117,7 @@ import asyncio
 
 class ScrapeRequestV1(BaseModel):
     url: HttpUrl
+    include: Optional[str] = Field(None, description="Scrape profile(s) or fields: full, streams, metadata, related")
 
 class CrawlRequestV1(BaseModel):
     base_url: HttpUrl
@@ -100,31 +128,24 @@ class CrawlRequestV1(BaseModel):
 
 # Import loose dispatch functions (re-using existing ones for now)
 # Ideally these should be in services/scraper_service.py
-async def _scrape_dispatch(url: str, host: str) -> dict[str, object]:
-    if xhamster.can_handle(host): return await xhamster.scrape(url)
-    if masa49.can_handle(host): return await masa49.scrape(url)
-    if xnxx.can_handle(host): return await xnxx.scrape(url)
-    if xvideos.can_handle(host): return await xvideos.scrape(url)
-    if pornhub.can_handle(host): return await pornhub.scrape(url)
-    if youporn.can_handle(host): return await youporn.scrape(url)
-    if redtube.can_handle(host): return await redtube.scrape(url)
-    if beeg.can_handle(host): return await beeg.scrape(url)
-    if spankbang.can_handle(host): return await spankbang.scrape(url)
-    if fapnut.can_handle(host): return await fapnut.scrape(url)
+async def _scrape_dispatch(url: str, host: str, include: Optional[str] = None) -> dict[str, object]:
+    if xhamster.can_handle(host): return await cached_scrape(xhamster, url, include)
+    if masa49.can_handle(host): return await cached_scrape(masa49, url, include)
+    if xnxx.can_handle(host): return await cached_scrape(xnxx, url, include)
+    if xvideos.can_handle(host): return await cached_scrape(xvideos, url, include)
+    if pornhub.can_handle(host): return await cached_scrape(pornhub, url, include)
+    if youporn.can_handle(host): return await cached_scrape(youporn, url, include)
+    if redtube.can_handle(host): return await cached_scrape(redtube, url, include)
+    if beeg.can_handle(host): return await cached_scrape(beeg, url, include)
+    if spankbang.can_handle(host): return await cached_scrape(spankbang, url, include)
+    if fapnut.can_handle(host): return await cached_scrape(fapnut, url, include)
     raise HTTPException(status_code=400, detail="Unsupported host")
 
-async def _list_dispatch(base_url: str, host: str, page: int, limit: int) -> list[dict[str, object]]:
-    if xhamster.can_handle(host): return await xhamster.list_videos(base_url=base_url, page=page, limit=limit)
-    if masa49.can_handle(host): return await masa49.list_videos(base_url=base_url, page=page, limit=limit)
-    if xnxx.can_handle(host): return await xnxx.list_videos(base_url=base_url, page=page, limit=limit)
-    if xvideos.can_handle(host): return await xvideos.list_videos(base_url=base_url, page=page, limit=limit)
-    if pornhub.can_handle(host): return await pornhub.list_videos(base_url=base_url, page=page, limit=limit)
-    if youporn.can_handle(host): return await youporn.list_videos(base_url=base_url, page=page, limit=limit)
-    if redtube.can_handle(host): return await redtube.list_videos(base_url=base_url, page=page, limit=limit)
-    if beeg.can_handle(host): return await beeg.list_videos(base_url=base_url, page=page, limit=limit)
-    if spankbang.can_handle(host): return await spankbang.list_videos(base_url=base_url, page=page, limit=limit)
-    if fapnut.can_handle(host): return await fapnut.list_videos(base_url=base_url, page=page, limit=limit)
-    raise HTTPException(status_code=400, detail="Unsupported host")
+def _list_scraper(host: str):
+    scraper = list_scraper(host)
+    if scraper is None:
+        raise HTTPException(status_code=400, detail="Unsupported host")
+    return scraper
 
 async def _crawl_dispatch(base_url: str, host: str, start_page: int, max_pages: int, per_page_limit: int, max_items: int) -> list[dict[str, object]]:
     if xhamster.can_handle(host):
@@ -139,7 +160,11 @@ async def create_scrape(body: ScrapeRequestV1) -> ScrapeResponse:
     Renamed from /scrape to POST /scrapes (create a scrape).
     """
     try:
-        data = await _scrape_dispatch(str(body.url), body.url.host or "")
+        resolve_include(body.include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    try:
+        data = await _scrape_dispatch(str(body.url), body.url.host or "", body.include)
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail="Upstream returned error") from e
     except Exception as e:
@@ -147,7 +172,7 @@ async def create_scrape(body: ScrapeRequestV1) -> ScrapeResponse:
     return ScrapeResponse(**data)
 
 @api_v1_router.get("/videos", response_model=list[ListItem], response_model_exclude_unset=True, tags=["Videos"])
-async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[ListItem]:
+async def list_videos(request: Request, base_url: str, page: int = 1, limit: int = 20) -> list[ListItem]:
     """
     List videos from a category/channel URL.
     Renamed from /list to GET /videos.
@@ -156,13 +181,6 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[Lis
     if limit < 1: limit = 1
     if limit > 60: limit = 60
     
-    # Check cache (v2 optimization)
-    cache_key = f"list:{base_url}:p{page}:l{limit}"
-    cached_items = await cache.get(cache_key)
-    if cached_items:
-        logging.info(f"⚡ Cache HIT for list {base_url} page {page}")
-        return [ListItem(**it) for it in cached_items]
-
     host = ""
     try:
         parsed = HttpUrl(base_url)
@@ -170,16 +188,24 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[Lis
     except:
         pass 
 
+    scraper = _list_scraper(host)
+
+    # One cached entry per upstream page, sliced to limit; stale pages are
+    # served while one refresh runs, and survive upstream outages
     try:
-        items = await _list_dispatch(base_url, host, page, limit)
+        items = await cached_page(scraper, base_url, page, limit)
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail="Upstream returned error") from e
     except Exception as e:
         raise HTTPException(status_code=502, detail="Failed to fetch url") from e
-    
-    if items:
-        await cache.set(cache_key, items, ttl_seconds=900)
-    
+
+    # Users scroll on: load the next page(s) in the background. Responses
+    # rendered for the response cache are reported by it, hits included
+    if settings.PREFETCH_ENABLED and RENDERING_SCOPE_KEY not in request.scope:
+        prefetcher.observe(scraper, base_url, page, limit, len(items))
+
     return [ListItem(**it) for it in items]
 
 @api_v1_router.post("/crawls", response_model=list[ListItem], tags=["Crawling"])
@@ -208,25 +234,19 @@ async def create_crawl(body: CrawlRequestV1) -> list[ListItem]:
 # Aggregating categories into a cleaned up endpoint
 # GET /api/v1/categories?source=xnxx
 @api_v1_router.get("/categories", response_model=list[CategoryItem], tags=["Categories"])
-async def get_categories(source: str) -> list[CategoryItem]:
+async def get_categories(source: str, request: Request):
     """
     Get categories for a specific source.
+    Served from the pre-encoded category store, with a strong ETag (304 on If-None-Match).
     """
-    s = source.lower()
-    try:
-        if s == "xnxx": return [CategoryItem(**c) for c in xnxx.get_categories()]
-        if s == "masa": return [CategoryItem(**c) for c in masa49.get_categories()]
-        if s == "xvideos": return [CategoryItem(**c) for c in xvideos.get_categories()]
-        if s == "xhamster": return [CategoryItem(**c) for c in xhamster.get_categories()]
-        if s == "youporn": return [CategoryItem(**c) for c in youporn.get_categories()]
-        if s == "pornhub": return [CategoryItem(**c) for c in pornhub.get_categories()]
-        if s == "redtube": return [CategoryItem(**c) for c in redtube.get_categories()]
-        if s == "beeg": return [CategoryItem(**c) for c in beeg.get_categories()]
-        if s == "spankbang": return [CategoryItem(**c) for c in spankbang.get_categories()]
-        if s == "onlyfans" or s == "fapnut": return [CategoryItem(**c) for c in await fapnut.get_categories()]
+    site = CATEGORY_SOURCES.get(source.lower())
+    if site is None:
         raise HTTPException(status_code=400, detail="Unknown source")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to load categories: {str(e)}")
+    found = category_store.get(site)
+    headers = {"ETag": found.etag}
+    if etag_matches(request.headers.get("if-none-match"), found.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=found.body, media_type="application/json", headers=headers)
 
 # --- Global Search & Trending (Pro Features) ---
 from app.services.global_search import global_search as _global_search, global_trending
@@ -250,14 +270,21 @@ async def global_trending_endpoint(
 
 # --- Video Streaming Info ---
 from app.services.video_streaming import get_video_info, get_stream_url
-from fastapi import Request
 
 @api_v1_router.get("/videos/info", tags=["Streaming"])
-async def video_info_endpoint(request: Request, url: str = Query(..., description="Video page URL")):
+async def video_info_endpoint(
+    request: Request,
+    url: str = Query(..., description="Video page URL"),
+    include: Optional[str] = Query(None, description="Scrape profile(s) or fields: full, streams, metadata, related"),
+):
     from app.config.settings import settings
     api_base = settings.BASE_URL or str(request.base_url)
     try:
-        return await get_video_info(url, api_base_url=api_base)
+        resolve_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    try:
+        return await get_video_info(url, api_base_url=api_base, include=include)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch video info: {str(e)}")
 
@@ -295,6 +322,7 @@ app.include_router(api_v1_router)
 app.include_router(recommendations.router, prefix="/api/v1/recommendations", tags=["AI Recommendations"])
 app.include_router(hls.router, prefix="/api/v1/hls", tags=["HLS Proxy"])
 app.include_router(media.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 
 
 @app.get("/health", tags=["System"])
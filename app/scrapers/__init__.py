@@ -22,4 +22,12 @@ from . import beeg
 from . import spankbang
 from . import fapnut
 
-__all__ = ['xnxx', 'xhamster', 'xvideos', 'masa49', 'pornhub', 'youporn', 'redtube', 'beeg', 'spankbang', 'fapnut']
+__all__ = ['xnxx', 'xhamster', 'xvideos', 'masa49', 'pornhub', 'youporn', 'redtube', 'beeg', 'spankbang', 'fapnut', 'list_scraper']
+
+
+def list_scraper(host: str):
+    """Scraper package listing pages of a host, or None if unsupported"""
+    for module in (xhamster, masa49, xnxx, xvideos, pornhub, youporn, redtube, beeg, spankbang, fapnut):
+        if module.can_handle(host):
+            return module
+    return None
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import re
 import os
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
@@ -35,7 +35,8 @@ async def fetch_html(url: str) -> str:
         resp.raise_for_status()
         return resp.text
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    # One externulls call returns every field, so include= has nothing to skip
     # Beeg video URLs are usually https://beeg.com/{id}
     # New pattern: https://beeg.com/-0{id} or similar
     # API: https://store.externulls.com/facts/file/{id}
@@ -15,15 +15,19 @@ def can_handle(host: str) -> bool:
 import json
 import os
 
+def _read_categories() -> list[dict[str, object]]:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    json_path = os.path.join(current_dir, "categories.json")
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 async def get_categories() -> list[dict[str, object]]:
     """
     Get list of categories from static file.
+    The file is read in a worker thread, off the event loop.
     """
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(current_dir, "categories.json")
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return await asyncio.to_thread(_read_categories)
     except Exception as e:
         print(f"Error loading categories.json: {e}")
         return []
@@ -186,9 +190,11 @@ async def list_videos(base_url: str = BASE_URL, page: int = 1, limit: int = 20)
             
     return videos
 
-async def scrape(url: str) -> dict[str, object]:
+async def scrape(url: str, include: object = None) -> dict[str, object]:
     """
     Scrape a single video page.
+    include= is accepted for parity with the other scrapers; everything
+    comes from one page fetch.
     """
     html = await fetch_html(url)
     soup = BeautifulSoup(html, "html.parser")
@@ -0,0 +1,116 @@
+"""
+Fetch profiles
+
+Heavy sites (xhamster, pornhub, xvideos) define FETCH_PROFILES: request
+headers for the full "desktop" page and a lighter render ("mobile") that
+carries the same listing cards without ad slots, sprites and inline JS.
+
+fetch_listing() walks a listing's pagination candidates with the light
+profile first. The desktop page is fetched only for the candidate whose
+light page came back without cards (or failed for a reason other than the
+URL not existing), never for every candidate again. A site whose light
+pages keep coming back empty (layout change) is fetched desktop-only for a
+while, so a broken light extractor costs one request per listing, not two.
+"""
+
+import logging
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Light pages in a row without cards before a site goes desktop-only...
+LIGHT_MISS_LIMIT = 3
+# ...for this many seconds
+LIGHT_COOLDOWN_SECONDS = 600.0
+
+# Statuses meaning the URL doesn't exist whatever profile asks for it
+_MISSING_STATUSES = frozenset({404, 410})
+
+# site -> [consecutive light misses, desktop-only until]
+_light_state: dict[str, list[float]] = {}
+
+Parser = Callable[[str, str], list[dict[str, Any]]]
+
+
+def light_enabled(site: str) -> bool:
+    """Whether the site's light profile is currently worth trying"""
+    state = _light_state.get(site)
+    return state is None or monotonic() >= state[1]
+
+
+def _record_light(site: str, found_cards: bool):
+    state = _light_state.setdefault(site, [0, 0.0])
+    if found_cards:
+        state[0] = 0
+        return
+    state[0] += 1
+    if state[0] >= LIGHT_MISS_LIMIT:
+        state[0] = 0
+        state[1] = monotonic() + LIGHT_COOLDOWN_SECONDS
+        logger.info("%s: light listing pages have no cards, using desktop pages for %ds", site, LIGHT_COOLDOWN_SECONDS)
+
+
+def _url_missing(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    return isinstance(exc, httpx.HTTPStatusError) and response is not None and response.status_code in _MISSING_STATUSES
+
+
+async def fetch_listing(
+    site: str,
+    candidates: list[str],
+    fetch_html: Callable[[str, str], Awaitable[str]],
+    parse_light: Parser,
+    parse_desktop: Parser,
+    profile: str = "mobile",
+) -> list[dict[str, Any]]:
+    """
+    Fetch and parse the first listing candidate that exists
+
+    Args:
+        site: Site name (light profile health is tracked per site)
+        candidates: Pagination URLs to try, in order
+        fetch_html: The scraper's fetch_html(url, profile)
+        parse_light: Card extractor for the light page, (html, url) -> cards
+        parse_desktop: Card extractor for the desktop page
+        profile: Light profile name, or "desktop" to skip it
+
+    Returns:
+        Cards of the first candidate that could be fetched (possibly none)
+
+    Raises:
+        The last fetch error if no candidate could be fetched
+    """
+    use_light = profile != "desktop" and light_enabled(site)
+    last_exc: Optional[Exception] = None
+    for url in candidates:
+        if use_light:
+            try:
+                html = await fetch_html(url, profile)
+            except Exception as e:
+                if _url_missing(e):
+                    last_exc = e
+                    continue
+                html = ""
+            if html:
+                try:
+                    items = parse_light(html, url)
+                except Exception:
+                    items = []
+                _record_light(site, bool(items))
+                if items:
+                    return items
+
+        try:
+            html = await fetch_html(url, "desktop")
+        except Exception as e:
+            last_exc = e
+            continue
+        if html:
+            return parse_desktop(html, url)
+
+    if last_exc:
+        raise last_exc
+    return []
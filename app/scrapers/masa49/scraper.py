@@ -1,13 +1,25 @@
 
 from __future__ import annotations
 
+import html as html_lib
 import json
+import logging
 import re
-from typing import Any, Optional
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Iterable, Optional
+from urllib.parse import parse_qs, quote, urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.config.settings import settings
+from app.core.cache import SimpleCache
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+from app.scrapers.text_index import PageText
+
+logger = logging.getLogger(__name__)
+
 
 def can_handle(host: str) -> bool:
     return host.lower().endswith("masa49.org")
@@ -59,6 +71,23 @@ async def fetch_html(url: str) -> str:
         return resp.text
 
 
+async def fetch_json(url: str) -> Any:
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+        "Accept": "application/json",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=httpx.Timeout(20.0, connect=20.0),
+        headers=headers,
+    ) as client:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        return resp.json()
+
+
 def _first_non_empty(*values: Optional[str]) -> Optional[str]:
     for v in values:
         if v is not None and str(v).strip() != "":
@@ -143,7 +172,7 @@ def _normalize_duration(seconds_or_iso: Any) -> Optional[str]:
     return str(seconds_or_iso).strip() or None
 
 
-def _extract_views(video_obj: Optional[dict[str, Any]], html: str, soup: BeautifulSoup) -> Optional[str]:
+def _extract_views(video_obj: Optional[dict[str, Any]], html: str, text: PageText) -> Optional[str]:
     if video_obj:
         for key in ("interactionCount", "viewCount", "views"):
             v = video_obj.get(key)
@@ -173,22 +202,24 @@ def _extract_views(video_obj: Optional[dict[str, Any]], html: str, soup: Beautif
         if m:
             return m.group(1).replace(" ", "").upper()
 
-    text = soup.get_text(" ", strip=True)
-    m = re.search(r"(\d+(?:\.\d+)?)\s*([KMB])?\s*(?:views|view)\b", text, re.IGNORECASE)
+    m = text.search("views_compact")
     if m:
         num = m.group(1)
         suffix = (m.group(2) or "").upper()
         return f"{num}{suffix}" if suffix else num
 
-    m = re.search(r"([0-9][0-9,\.\s]*)\s*(?:views|view)", text, re.IGNORECASE)
+    m = text.search("views_loose")
     if m:
         return m.group(1).strip()
 
     return None
 
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
     soup = BeautifulSoup(html, "lxml")
+    if fields <= SCRAPE_PROFILES["streams"]:
+        return streams_only(url, _extract_video_streams(html, soup))
 
     og_title = _meta(soup, prop="og:title")
     og_desc = _meta(soup, prop="og:description")
@@ -241,7 +272,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
 
         tags = _as_list(video_obj.get("keywords"))
 
-    if not tags:
+    if not tags and "tags" in fields:
         for a in soup.select('a[href*="/tag/"]'):
             t = _text(a)
             if t:
@@ -252,21 +283,24 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
                 tags.append(t)
     tags = list(dict.fromkeys([t for t in tags if t]))
 
-    views = _extract_views(video_obj, html, soup)
+    page_text = PageText(soup)
+    views = _extract_views(video_obj, html, page_text) if "views" in fields else None
 
-    if not duration:
-        m = re.search(r"\b(\d{1,2}:\d{2}(?::\d{2})?)\b", soup.get_text(" ", strip=True))
+    if not duration and "duration" in fields:
+        m = page_text.search("duration")
         if m:
             duration = m.group(1)
 
     # ZERO-COST VIDEO EXTRACTION
-    video_data = _extract_video_streams(html, soup)
+    video_data = _extract_video_streams(html, soup) if "video" in fields else empty_video()
 
     # Related Videos Extraction
     related_videos = []
     # Masa49: Look for "Related Videos" section
     # Usually <div class="related-posts"> or similar
-    rel_container = soup.find(class_=re.compile("related-posts|related-videos"))
+    rel_container = None
+    if "related_videos" in fields:
+        rel_container = soup.find(class_=re.compile("related-posts|related-videos"))
     if rel_container:
          # Masa uses standard 'article' or 'div.post' usually
          for art in rel_container.find_all(["article", "div"], class_=re.compile("post|video")):
@@ -380,12 +414,346 @@ def _extract_video_streams(html: str, soup: BeautifulSoup) -> dict[str, Any]:
     }
 
 
-async def scrape(url: str) -> dict[str, Any]:
+# ==============================================================================
+# WordPress REST API (wp-json) ingestion
+# ==============================================================================
+# masa49 runs on WordPress, so posts, tags and categories are also exposed as
+# JSON under /wp-json/wp/v2/. Those payloads are a fraction of the themed HTML
+# and need no JSON-LD / JW Player regexes. Every helper below returns None when
+# a URL has no REST equivalent, and callers then fall back to the HTML path;
+# when wp-json errors or can't stand in for the HTML, callers also stop trying
+# it for WP_REST_COOLDOWN_SECONDS.
+
+# Matches the theme's posts_per_page so REST pages line up with HTML pages
+WP_POSTS_PER_PAGE = 20
+
+_WP_LIST_FIELDS = "id,link,slug,title,date_gmt,featured_media,meta,_links,_embedded"
+_WP_POST_FIELDS = _WP_LIST_FIELDS + ",excerpt,content"
+
+# (api_root, taxonomy, slug) -> term id (0: no such term, or the lookup
+# failed). Bounded, and each slug costs at most one request per TTL, however
+# many distinct (or bogus) category/tag URLs are listed.
+_wp_term_ids = SimpleCache(max_size=1024, policy="lru")
+WP_TERM_TTL = 24 * 3600
+WP_TERM_FAILURE_TTL = 300
+
+# After wp-json fails to serve a listing (or a scrape) it is skipped for
+# that path for this long, so a site whose post meta lacks the card fields
+# doesn't pay a wasted REST request before every HTML fetch
+WP_REST_COOLDOWN_SECONDS = 600.0
+# "list" / "scrape" -> wp-json skipped until (monotonic)
+_rest_off_until: dict[str, float] = {}
+
+
+class _RestUnusable(Exception):
+    """wp-json answered, but not with something the HTML path can be replaced by"""
+
+
+def _rest_enabled(kind: str) -> bool:
+    return settings.MASA49_WP_REST and monotonic() >= _rest_off_until.get(kind, 0.0)
+
+
+def _rest_failed(kind: str, url: str, reason: Exception):
+    _rest_off_until[kind] = monotonic() + WP_REST_COOLDOWN_SECONDS
+    logger.debug(
+        "masa49 wp-json %s failed for %s (%s), using HTML for %ds",
+        kind, url, str(reason) or type(reason).__name__, WP_REST_COOLDOWN_SECONDS,
+    )
+
+
+def _wp_api_root(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme or 'https'}://{parsed.netloc}/wp-json/wp/v2"
+
+
+def _wp_rendered(field: Any) -> Optional[str]:
+    if isinstance(field, dict):
+        field = field.get("rendered")
+    if not field:
+        return None
+    text = BeautifulSoup(str(field), "html.parser").get_text(" ", strip=True)
+    return html_lib.unescape(text).strip() or None
+
+
+def _wp_meta_value(post: dict[str, Any], *keys: str) -> Any:
+    meta = post.get("meta")
+    if not isinstance(meta, dict):
+        return None
+    for key in keys:
+        v = meta.get(key)
+        if isinstance(v, list):
+            v = v[0] if v else None
+        if v is not None and str(v).strip():
+            return v
+    return None
+
+
+def _wp_duration(post: dict[str, Any]) -> Optional[str]:
+    v = _wp_meta_value(post, "duration", "video_duration", "_duration")
+    if v is None:
+        return None
+    if isinstance(v, str) and v.strip().isdigit():
+        v = int(v.strip())
+    return _normalize_duration(v)
+
+
+def _wp_views(post: dict[str, Any], short: bool = True) -> Optional[str]:
+    v = _wp_meta_value(post, "views", "post_views_count", "post_views")
+    if v is None:
+        return None
+    try:
+        n = int(str(v).replace(",", "").strip())
+    except ValueError:
+        return str(v).strip()
+    if not short:
+        # Video pages carry the exact count (JSON-LD interactionCount)
+        return str(n)
+    # Same short form the theme prints on cards ("1.8k")
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.1f}".rstrip("0").rstrip(".") + "m"
+    if n >= 1_000:
+        return f"{n / 1_000:.1f}".rstrip("0").rstrip(".") + "k"
+    return str(n)
+
+
+def _wp_time_ago(date_gmt: Any) -> Optional[str]:
+    # Mirrors WordPress human_time_diff(), which the theme prints as "X ago"
+    if not date_gmt:
+        return None
+    try:
+        posted = datetime.fromisoformat(str(date_gmt)).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    diff = max(0, int((datetime.now(timezone.utc) - posted).total_seconds()))
+    for unit, seconds in (
+        ("year", 365 * 86400),
+        ("month", 30 * 86400),
+        ("week", 7 * 86400),
+        ("day", 86400),
+        ("hour", 3600),
+        ("min", 60),
+    ):
+        if diff >= seconds:
+            n = diff // seconds
+            label = unit if n == 1 else f"{unit}s"
+            return f"{n} {label} ago"
+    return f"{max(diff, 1)} {'second' if diff <= 1 else 'seconds'} ago"
+
+
+# Card thumbnails on listings; og:image (the full upload) on video pages
+_WP_CARD_SIZES = ("medium_large", "medium", "large", "full")
+_WP_PAGE_SIZES = ("full",)
+
+
+def _wp_featured_image(post: dict[str, Any], sizes_wanted: tuple[str, ...] = _WP_CARD_SIZES) -> Optional[str]:
+    media = (post.get("_embedded") or {}).get("wp:featuredmedia") or []
+    if not media or not isinstance(media[0], dict):
+        return None
+    sizes = (media[0].get("media_details") or {}).get("sizes") or {}
+    for size in sizes_wanted:
+        src = (sizes.get(size) or {}).get("source_url")
+        if src:
+            return str(src)
+    return media[0].get("source_url") or None
+
+
+def _wp_terms(post: dict[str, Any], taxonomy: str) -> list[str]:
+    out: list[str] = []
+    for group in (post.get("_embedded") or {}).get("wp:term") or []:
+        for term in group or []:
+            if isinstance(term, dict) and term.get("taxonomy") == taxonomy and term.get("name"):
+                out.append(html_lib.unescape(str(term["name"])).strip())
+    return list(dict.fromkeys(t for t in out if t))
+
+
+def _wp_post_to_list_item(post: dict[str, Any]) -> Optional[dict[str, Any]]:
+    url = post.get("link")
+    thumb = _wp_featured_image(post)
+    # The HTML path skips cards without a thumbnail, so do the same here
+    if not url or not thumb:
+        return None
+    return {
+        "url": str(url),
+        "title": _wp_rendered(post.get("title")),
+        "thumbnail_url": thumb,
+        "duration": _wp_duration(post),
+        "views": _wp_views(post),
+        "upload_time": _wp_time_ago(post.get("date_gmt")),
+    }
+
+
+async def _wp_term_id(api_root: str, taxonomy: str, slug: str) -> Optional[int]:
+    key = f"{api_root}|{taxonomy}|{slug}"
+
+    async def lookup() -> int:
+        terms = await fetch_json(f"{api_root}/{taxonomy}?slug={quote(slug)}&_fields=id")
+        return int(terms[0]["id"]) if isinstance(terms, list) and terms else 0
+
+    try:
+        term_id = await _wp_term_ids.get_or_set(key, lookup, ttl_seconds=WP_TERM_TTL)
+    except Exception:
+        # Don't retry on every request while wp-json is failing
+        _wp_term_ids.set_nowait(key, 0, WP_TERM_FAILURE_TTL)
+        raise
+    return term_id or None
+
+
+async def _wp_posts_url(base_url: str, page: int) -> Optional[str]:
+    """Map a listing URL onto the equivalent /wp/v2/posts query."""
+    parsed = urlparse(base_url)
+    api_root = _wp_api_root(base_url)
+    path = [seg for seg in parsed.path.split("/") if seg]
+    # Theme pagination segment (/page/N/) is handled by the page argument
+    if len(path) >= 2 and path[-2] == "page" and path[-1].isdigit():
+        path = path[:-2]
+
+    params = [f"per_page={WP_POSTS_PER_PAGE}", f"page={page}"]
+    search = parse_qs(parsed.query).get("s", [""])[0]
+    if search:
+        params.append(f"search={quote(search)}")
+    elif not path:
+        pass  # Home page: newest posts first, which is the REST default
+    elif len(path) == 2 and path[0] == "search":
+        params.append(f"search={quote(path[1].replace('+', ' '))}")
+    elif len(path) == 2 and path[0] in ("category", "tag"):
+        taxonomy = "categories" if path[0] == "category" else "tags"
+        term_id = await _wp_term_id(api_root, taxonomy, path[1])
+        if term_id is None:
+            return None
+        params.append(f"{taxonomy}={term_id}")
+    else:
+        # popular-video and other theme pages have no REST equivalent
+        return None
+
+    params.append(f"_fields={_WP_LIST_FIELDS}")
+    params.append("_embed=wp:featuredmedia")
+    return f"{api_root}/posts?" + "&".join(params)
+
+
+async def _list_videos_rest(base_url: str, page: int, limit: int) -> Optional[list[dict[str, Any]]]:
+    """
+    Listing page from wp-json
+
+    Returns:
+        Up to limit cards, or None when the URL has no REST equivalent
+
+    Raises:
+        _RestUnusable: the posts lack the duration/views the HTML cards carry
+    """
+    posts_url = await _wp_posts_url(base_url, page)
+    if not posts_url:
+        return None
+    posts = await fetch_json(posts_url)
+    if not isinstance(posts, list):
+        raise _RestUnusable("posts response is not a list")
+
+    items: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for post in posts:
+        if not isinstance(post, dict):
+            continue
+        item = _wp_post_to_list_item(post)
+        if item and item["url"] not in seen:
+            if not item["duration"] or not item["views"]:
+                # Not exposed in this post's meta: the themed cards have them
+                raise _RestUnusable("posts lack duration/views meta")
+            seen.add(item["url"])
+            items.append(item)
+    return items[:limit]
+
+
+async def _scrape_rest(url: str, fields: frozenset[str]) -> Optional[dict[str, Any]]:
+    """
+    Video page from wp-json, for profiles without related_videos
+
+    Returns:
+        Scrape result, or None when the URL isn't a post
+
+    Raises:
+        _RestUnusable: the post body has no player, or its meta lacks a
+            requested duration/views
+    """
+    path = [seg for seg in urlparse(url).path.split("/") if seg]
+    if not path:
+        return None
+    api_root = _wp_api_root(url)
+    streams_profile = fields <= SCRAPE_PROFILES["streams"]
+    if streams_profile:
+        query = "_fields=id,link,content"
+    else:
+        query = f"_fields={_WP_POST_FIELDS}&_embed=wp:featuredmedia,wp:term,author"
+    posts = await fetch_json(f"{api_root}/posts?slug={quote(path[-1])}&{query}")
+    if not isinstance(posts, list) or not posts or not isinstance(posts[0], dict):
+        return None
+    post = posts[0]
+
+    video_data = empty_video()
+    if "video" in fields:
+        content = (post.get("content") or {}).get("rendered") or ""
+        video_data = _extract_video_streams(content, BeautifulSoup(content, "lxml"))
+        if not video_data["has_video"]:
+            # Player is injected by the theme template rather than the post body
+            raise _RestUnusable("post body has no player")
+    if streams_profile:
+        return streams_only(url, video_data)
+
+    authors = (post.get("_embedded") or {}).get("author") or []
+    uploader = None
+    if authors and isinstance(authors[0], dict):
+        uploader = _first_non_empty(authors[0].get("name"))
+
+    duration = _wp_duration(post)
+    views = _wp_views(post, short=False)
+    if ("duration" in fields and not duration) or ("views" in fields and not views):
+        # Not exposed in the post meta: the themed page has them (JSON-LD)
+        raise _RestUnusable("post lacks duration/views meta")
+    categories = _wp_terms(post, "category")
+
+    return {
+        "url": url,
+        "title": _wp_rendered(post.get("title")),
+        "description": _wp_rendered(post.get("excerpt")),
+        "thumbnail_url": _wp_featured_image(post, _WP_PAGE_SIZES),
+        "duration": duration,
+        "views": views,
+        "uploader_name": uploader,
+        "category": categories[0] if categories else None,
+        "tags": _wp_terms(post, "post_tag"),
+        "video": video_data,
+        "related_videos": [],
+    }
+
+
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    # Related videos only exist in the themed page, so scrapes asking for
+    # them (the default "full" profile included) go straight to HTML; wp-json
+    # serves the narrower profiles
+    if "related_videos" not in fields and _rest_enabled("scrape"):
+        try:
+            data = await _scrape_rest(url, fields)
+            if data:
+                return data
+        except Exception as e:
+            _rest_failed("scrape", url, e)
+
     html = await fetch_html(url)
-    return parse_page(html, url)
+    return parse_page(html, url, fields)
 
 
 async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
+    if _rest_enabled("list"):
+        try:
+            items = await _list_videos_rest(base_url, page, limit)
+            if items:
+                return items
+        except Exception as e:
+            _rest_failed("list", base_url, e)
+
+    return await _list_videos_html(base_url, page=page, limit=limit)
+
+
+async def _list_videos_html(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
     lower_url = base_url.lower()
     is_single_page = "popular-video" in lower_url or "latest-videos" in lower_url
     is_search = "?s=" in base_url
@@ -403,7 +771,6 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
         else:
             # For WordPress search, pagination uses /page/X/ after the base domain
             # Extract domain and search query
-            from urllib.parse import urlparse, parse_qs
             parsed = urlparse(base_url)
             search_query = parse_qs(parsed.query).get('s', [''])[0]
             
@@ -515,7 +882,7 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
         if not views:
             # Fallback 3: try to extract views using the general extraction logic on the card
             # This handles cases where views might be in a different element or format
-            views = _extract_views(None, str(card), card)
+            views = _extract_views(None, str(card), PageText(card))
         
         # Extract upload time from time div
         upload_time = None 
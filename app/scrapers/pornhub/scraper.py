@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scrapers.fetch_profiles import fetch_listing
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+
 
 def can_handle(host: str) -> bool:
     return "pornhub.com" in host.lower()
@@ -57,12 +60,28 @@ def get_categories() -> list[dict]:
         return []
 
 
-async def fetch_html(url: str) -> str:
-    headers = {
+# Fetch profiles: "desktop" pins platform=pc for the structure list_videos was
+# written against; "mobile" asks for the mobile site, whose listing pages are a
+# fraction of the size (no sidebar, ad iframes or preview sprites).
+FETCH_PROFILES: dict[str, dict[str, str]] = {
+    "desktop": {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
         "Cookie": "platform=pc" # Critical for consistent desktop HTML structure
-    }
+    },
+    "mobile": {
+        "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Cookie": "platform=mobile",
+    },
+}
+
+# Profile list_videos tries first (see fetch_profiles.fetch_listing)
+LIST_PROFILE = "mobile"
+
+
+async def fetch_html(url: str, profile: str = "desktop") -> str:
+    headers = FETCH_PROFILES.get(profile) or FETCH_PROFILES["desktop"]
     async with httpx.AsyncClient(
         follow_redirects=True,
         timeout=httpx.Timeout(20.0, connect=20.0),
@@ -150,7 +169,12 @@ def _extract_video_streams(html: str) -> dict[str, Any]:
         "has_video": len(streams) > 0
     }
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # flashvars are read straight from the script text
+        return streams_only(url, _extract_video_streams(html))
+
     soup = BeautifulSoup(html, "lxml")
     
     # Title
@@ -206,7 +230,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         if txt: tags.append(txt)
         
     # Video Streams
-    video_data = _extract_video_streams(html)
+    video_data = _extract_video_streams(html) if "video" in fields else empty_video()
     
     return {
         "url": url,
@@ -223,11 +247,11 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         "preview_url": None # TODO
     }
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    return parse_page(html, url)
+    return parse_page(html, url, include)
 
-async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
+def _list_url(base_url: str, page: int) -> str:
     # PH search/list url: /video?o=new&page=2
     # simple listing: pornhub.com/video?page=2
     
@@ -242,13 +266,76 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
             url += f"&page={page}"
         else:
             url += f"?page={page}"
-        
+    return url
+
+
+def _parse_listing_mobile(html: str) -> list[dict[str, Any]]:
+    """Extract cards from the mobile listing (li/div carrying data-video-vkey)."""
+    soup = BeautifulSoup(html, "lxml")
+
+    items = []
+    seen: set[str] = set()
+    for card in soup.select("li[data-video-vkey], div[data-video-vkey]"):
+        try:
+            link = card.select_one('a[href*="view_video.php"]') or card.select_one("a")
+            if not link: continue
+
+            href = link.get("href")
+            if not href or "javascript" in href.lower(): continue
+
+            if not href.startswith("http"):
+                href = "https://www.pornhub.com" + href
+            if href in seen: continue
+
+            img_el = card.select_one("img")
+            title = link.get("title")
+            if not title:
+                t_el = card.select_one(".title a, .videoTitle, .title")
+                if t_el: title = t_el.get_text(strip=True)
+            if not title and img_el:
+                title = img_el.get("alt")
+
+            dur_el = card.select_one(".duration, .time, var.duration")
+            # Same order as the desktop parser: the bare count, not the "N views" wrapper
+            views_el = card.select_one(".network-view-count") or card.select_one(".views var")
+            u_el = card.select_one(".usernameWrap a, .uploaderLink, a[href*='/model/'], a[href*='/channels/']")
+
+            seen.add(href)
+            items.append({
+                "url": href,
+                "title": title,
+                "thumbnail_url": _best_image_url(img_el),
+                "duration": dur_el.get_text(strip=True) if dur_el else None,
+                "views": views_el.get_text(strip=True) if views_el else None,
+                "uploader_name": u_el.get_text(strip=True) if u_el else None,
+            })
+        except Exception:
+            continue
+
+    return items
+
+
+async def list_videos(
+    base_url: str,
+    page: int = 1,
+    limit: int = 20,
+    profile: Optional[str] = None,
+) -> list[dict[str, Any]]:
     try:
-        html = await fetch_html(url)
+        return await fetch_listing(
+            "pornhub",
+            [_list_url(base_url, page)],
+            fetch_html,
+            lambda html, _url: _parse_listing_mobile(html),
+            lambda html, _url: _parse_listing_desktop(html),
+            profile or LIST_PROFILE,
+        )
     except Exception:
         # Fallback or return empty if fetch fails (e.g. 403 Forbidden)
         return []
 
+
+def _parse_listing_desktop(html: str) -> list[dict[str, Any]]:
     soup = BeautifulSoup(html, "lxml")
     
     items = []
@@ -0,0 +1,105 @@
+"""
+Scrape profiles
+
+Named subsets of the scrape() fields so callers only pay for what they use.
+Scrapers check the resolved field set and skip extractors (and follow-up
+HTTP calls) whose output nobody asked for.
+
+Profiles:
+- full: everything (default)
+- streams: video streams only
+- metadata: title, description, thumbnail, duration, views, uploader, tags
+- related: what recommendations need (title, tags, category, related videos)
+"""
+
+from typing import Any, Iterable, Optional, Union
+
+ALL_FIELDS = frozenset({
+    "title",
+    "description",
+    "thumbnail_url",
+    "duration",
+    "views",
+    "uploader_name",
+    "category",
+    "tags",
+    "video",
+    "related_videos",
+    "preview_url",
+})
+
+SCRAPE_PROFILES: dict[str, frozenset[str]] = {
+    "full": ALL_FIELDS,
+    "streams": frozenset({"video"}),
+    "metadata": frozenset({
+        "title",
+        "description",
+        "thumbnail_url",
+        "duration",
+        "views",
+        "uploader_name",
+        "category",
+        "tags",
+        "preview_url",
+    }),
+    "related": frozenset({"title", "category", "tags", "related_videos"}),
+}
+
+
+def resolve_include(include: Union[str, Iterable[str], None] = None) -> frozenset[str]:
+    """
+    Resolve an include= value into the set of fields to extract
+
+    Args:
+        include: Profile name(s) and/or field names, comma separated or as an
+            iterable. None or empty means the full profile.
+
+    Returns:
+        Frozen set of field names
+
+    Raises:
+        ValueError: If a name is neither a profile nor a field
+    """
+    if include is None:
+        return ALL_FIELDS
+    if isinstance(include, frozenset) and include <= ALL_FIELDS:
+        return include
+
+    names = include.split(",") if isinstance(include, str) else list(include)
+    fields: set[str] = set()
+    for raw in names:
+        name = raw.strip().lower()
+        if not name:
+            continue
+        if name in SCRAPE_PROFILES:
+            fields |= SCRAPE_PROFILES[name]
+        elif name in ALL_FIELDS:
+            fields.add(name)
+        else:
+            raise ValueError(
+                f"Unknown include '{name}'. Profiles: {', '.join(SCRAPE_PROFILES)}"
+            )
+    return frozenset(fields) if fields else ALL_FIELDS
+
+
+def empty_video() -> dict[str, Any]:
+    """Video block used when streams were not requested or not found"""
+    return {"streams": [], "default": None, "has_video": False}
+
+
+def streams_only(url: str, video: Optional[dict[str, Any]]) -> dict[str, Any]:
+    """Scrape result for the streams profile, skipping every DOM extractor"""
+    return {
+        "url": url,
+        "title": None,
+        "description": None,
+        "thumbnail_url": None,
+        "duration": None,
+        "views": None,
+        "uploader_name": None,
+        "category": None,
+        "tags": [],
+        "video": video or empty_video(),
+        "related_videos": [],
+        "preview_url": None,
+    }
@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 import re
 import os
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+from app.scrapers.selector_plans import SelectorPlan, page_shape
+
 def can_handle(host: str) -> bool:
     host_lower = host.lower()
     return "redtube.com" in host_lower or "redtube.net" in host_lower
@@ -180,7 +183,12 @@ def _extract_video_streams(html: str) -> dict[str, Any]:
         "has_video": len(streams) > 0
     }
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # mediaDefinition is read straight from the script text
+        return streams_only(url, _extract_video_streams(html))
+
     soup = BeautifulSoup(html, "lxml")
     
     title = None
@@ -221,7 +229,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         txt = t.get_text(strip=True)
         if txt: tags.append(txt)
         
-    video_data = _extract_video_streams(html)
+    video_data = _extract_video_streams(html) if "video" in fields else empty_video()
     
     return {
         "url": url,
@@ -238,9 +246,13 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         "preview_url": None
     }
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    result = parse_page(html, url)
+    fields = resolve_include(include)
+    result = parse_page(html, url, fields)
+    if "video" not in fields:
+        # Proxy resolution is an extra round trip per stream; skip it
+        return result
     
     # Check if we have proxy URLs and resolve them to real CDN streams
     video_data = result.get("video", {})
@@ -281,6 +293,9 @@ async def scrape(url: str) -> dict[str, Any]:
     
     return result
 
+# Modern RedTube cards are li.videoblock_list; the others are older/alternate layouts
+_CARD_PLAN = SelectorPlan("redtube", "cards", ["li.videoblock_list", ".video_id_container", ".ph-video-block"])
+
 async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
     # RedTube: /?page=2 or /videos?page=2
     url = base_url.rstrip("/")
@@ -304,7 +319,8 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
     # Modern RedTube selectors: li.videoblock_list, also check for others just in case
     # The IDs in debug HTML were like id="mrv_198642241"
     
-    for box in soup.select("li.videoblock_list, .video_id_container, .ph-video-block"):
+    shape = page_shape(url)
+    for box in _CARD_PLAN.select(soup, shape):
         try:
             # Title & HREF
             # .video-title-wrapper a.video-title-text (modern) OR .video_title a (legacy)
@@ -372,5 +388,9 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
         except Exception as e:
             # print(f"Error parsing item: {e}")
             continue
+    
+    if not items:
+        # Cards matched but none parsed: relearn the layout next time
+        _CARD_PLAN.forget(shape)
             
     return items
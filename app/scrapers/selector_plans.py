@@ -0,0 +1,202 @@
+"""
+Selector plans
+
+Some sites serve several card layouts depending on the page type (home,
+search, category, channel). Instead of matching every selector variant on
+every parse, a SelectorPlan remembers which variant matched for each page
+shape and tries it first. When the learned variant stops matching (layout
+change, A/B test) the plan re-learns from the full variant list.
+
+The full list is always searched in a single walk, through one selector
+(or class regex) joining every variant, and each match is then attributed
+to its variant. A shape whose cards are split across variants learns that
+union rather than the biggest variant, so no cards are dropped.
+"""
+
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import soupsieve
+from bs4.element import Tag
+
+_PLANS: dict[str, "SelectorPlan"] = {}
+
+# Learned "variant" meaning all of them
+_UNION = -1
+# A learned variant matching fewer than this share of the cards it matched
+# when learned falls back to the union (and re-learns)
+MIN_MATCH_SHARE = 0.5
+
+
+def page_shape(url: str) -> str:
+    """
+    Coarse page shape of a listing URL, used to key learned variants
+
+    Path depth (ignoring pagination segments) plus the sorted query keys,
+    so "/", "/redhead", "/?search=x" and "/channels/x/2" land in
+    different buckets while page numbers and slugs don't matter.
+    """
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s and not s.isdigit()]
+    keys = sorted({k for k, _ in parse_qsl(parts.query) if k not in ("page", "p")})
+    shape = str(len(segments))
+    if keys:
+        shape += "?" + "&".join(keys)
+    return shape
+
+
+class SelectorPlan:
+    """
+    Ordered selector variants for one extraction slot of one site
+
+    Args:
+        site: Site name (for stats)
+        slot: What the selectors extract (e.g. "cards", "views")
+        variants: CSS selectors, or class-name regexes when kind="class"
+        kind: "css" (select/select_one) or "class" (find/find_all by class_)
+    """
+
+    def __init__(self, site: str, slot: str, variants: list[str], kind: str = "css"):
+        if kind not in ("css", "class"):
+            raise ValueError(f"Unknown selector kind: {kind}")
+        self.site = site
+        self.slot = slot
+        self.variants = tuple(variants)
+        self.kind = kind
+        if kind == "css":
+            self._compiled = [soupsieve.compile(v) for v in variants]
+            self._union = soupsieve.compile(", ".join(variants))
+        else:
+            self._compiled = [re.compile(v) for v in variants]
+            self._union = re.compile("|".join(f"(?:{v})" for v in variants))
+        # shape -> (variant index or _UNION, matches when learned)
+        self._learned: dict[str, tuple[int, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.relearns = 0
+        _PLANS[f"{site}:{slot}"] = self
+
+    def _select(self, node: Tag, index: int) -> list[Tag]:
+        matcher = self._union if index == _UNION else self._compiled[index]
+        if self.kind == "css":
+            return matcher.select(node)
+        return node.find_all(class_=matcher)
+
+    def _select_one(self, node: Tag, index: int) -> Optional[Tag]:
+        matcher = self._union if index == _UNION else self._compiled[index]
+        if self.kind == "css":
+            return matcher.select_one(node)
+        return node.find(class_=matcher)
+
+    def _variant_of(self, el: Tag) -> Optional[int]:
+        """Index of the first variant an element matches"""
+        if self.kind == "css":
+            for i, compiled in enumerate(self._compiled):
+                if compiled.match(el):
+                    return i
+            return None
+        classes = el.get("class") or []
+        joined = " ".join(classes)
+        for i, pattern in enumerate(self._compiled):
+            if pattern.search(joined) or any(pattern.search(c) for c in classes):
+                return i
+        return None
+
+    def _learn(self, shape: str, found: list[Tag]):
+        counts = [0] * len(self.variants)
+        for el in found:
+            i = self._variant_of(el)
+            if i is not None:
+                counts[i] += 1
+        if not found:
+            self._learned.pop(shape, None)
+            return
+        best = max(range(len(counts)), key=counts.__getitem__)
+        # One variant only if it covers every card the union found
+        index = best if counts[best] == len(found) else _UNION
+        self._learned[shape] = (index, len(found))
+
+    def select(self, node: Tag, shape: str) -> list[Tag]:
+        """
+        All matches of the learned variant for this page shape
+
+        With nothing learned yet, or when the learned variant yields fewer
+        than MIN_MATCH_SHARE of the matches it had when learned, the union
+        of all variants is returned and the plan re-learns from it.
+        """
+        learned = self._learned.get(shape)
+        if learned is not None:
+            index, count = learned
+            found = self._select(node, index)
+            if found and (index == _UNION or len(found) >= count * MIN_MATCH_SHARE):
+                self.hits += 1
+                return found
+            if index == _UNION:
+                # The union is everything there is; nothing to fall back to
+                self.relearns += 1
+                self._learned.pop(shape, None)
+                return found
+            self.relearns += 1
+
+        self.misses += 1
+        found = self._select(node, _UNION)
+        self._learn(shape, found)
+        return found
+
+    def select_one(self, node: Tag, shape: str) -> Optional[Tag]:
+        """
+        First match, trying the learned variant for this page shape first
+
+        Meant for per-card slots where a miss on one card is normal: a miss
+        costs one more walk, with the union of all variants, and re-learns
+        if another variant hit.
+        """
+        learned = self._learned.get(shape)
+        if learned is not None:
+            found = self._select_one(node, learned[0])
+            if found is not None:
+                self.hits += 1
+                return found
+
+        self.misses += 1
+        found = self._select_one(node, _UNION)
+        if found is None:
+            return None
+        index = self._variant_of(found)
+        if index is not None and (learned is None or index != learned[0]):
+            if learned is not None:
+                self.relearns += 1
+            self._learned[shape] = (index, 1)
+        return found
+
+    def forget(self, shape: Optional[str] = None) -> None:
+        """Drop learned variants (for one shape, or all of them)"""
+        if shape is None:
+            self._learned.clear()
+        else:
+            self._learned.pop(shape, None)
+
+    def get_stats(self) -> dict:
+        """
+        Get plan statistics
+
+        Returns:
+            Dictionary with hit/miss/relearn counts and learned variants
+        """
+        return {
+            "site": self.site,
+            "slot": self.slot,
+            "hits": self.hits,
+            "misses": self.misses,
+            "relearns": self.relearns,
+            "learned": {
+                shape: "union" if i == _UNION else self.variants[i]
+                for shape, (i, _) in self._learned.items()
+            },
+        }
+
+
+def get_plan_stats() -> list[dict]:
+    """Statistics for every registered selector plan"""
+    return [plan.get_stats() for plan in _PLANS.values()]
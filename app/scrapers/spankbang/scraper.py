@@ -4,11 +4,14 @@ import json
 import re
 import os
 import ast
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from curl_cffi.requests import AsyncSession
 from bs4 import BeautifulSoup
 
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+from app.scrapers.selector_plans import SelectorPlan, page_shape
+
 def can_handle(host: str) -> bool:
     return "spankbang.com" in host.lower()
 
@@ -166,7 +169,12 @@ def _extract_video_streams(html: str) -> dict[str, Any]:
         "has_video": len(streams) > 0
     }
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # _extract_video_streams builds its own soup; don't parse the page twice
+        return streams_only(url, _extract_video_streams(html))
+
     soup = BeautifulSoup(html, "lxml")
     
     title = None
@@ -196,13 +204,13 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         tags = [t.strip() for t in keywords.split(",") if t.strip()]
     
     # Fallback: try HTML tags
-    if not tags:
+    if not tags and "tags" in fields:
         for t in soup.select(".categories a, .tags a"):
             txt = t.get_text(strip=True)
             if txt and txt.lower() not in ["tags", "categories"]:
                 tags.append(txt)
             
-    video_data = _extract_video_streams(html)
+    video_data = _extract_video_streams(html) if "video" in fields else empty_video()
     
     return {
         "url": url,
@@ -219,9 +227,11 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         "preview_url": None
     }
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    return parse_page(html, url)
+    return parse_page(html, url, include)
+
+_CARD_PLAN = SelectorPlan("spankbang", "cards", [".js-video-item", ".video-item", ".video-list-video"])
 
 async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
     # Pagination: spankbang.com/upcoming/2
@@ -252,8 +262,8 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
     # Updated Selectors based on browser analysis
     # Strategy: Find all potential video items, then group by parent container.
     # The container with the most items is the Main List.
-    container_selector = ".js-video-item, .video-item, .video-list-video"
-    all_items = soup.select(container_selector)
+    shape = page_shape(url)
+    all_items = _CARD_PLAN.select(soup, shape)
     selected_items = []
     
     if all_items:
@@ -339,5 +349,9 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
             
         except Exception:
             continue
+    
+    if not items:
+        # Cards matched but none parsed: relearn the layout next time
+        _CARD_PLAN.forget(shape)
             
     return items
@@ -0,0 +1,64 @@
+"""
+Page text index
+
+Lazily built, memoized visible-text view of a parsed document for the
+"scan the whole page" fallbacks (durations, view counts). The text is
+serialized at most once per document and each fallback matcher runs over
+it at most once, so the fallback cost per page stays constant however
+many fields miss their primary extractor.
+"""
+
+import re
+from typing import Optional
+
+from bs4.element import Tag
+
+# Precompiled fallback matchers, shared by the scrapers
+FALLBACK_MATCHERS: dict[str, re.Pattern[str]] = {
+    # "12:34" or "1:02:03"
+    "duration": re.compile(r"\b(\d{1,2}:\d{2}(?::\d{2})?)\b"),
+    # "1.2M views", "345 views"
+    "views_compact": re.compile(r"(\d+(?:\.\d+)?)\s*([KMB])?\s*(?:views|view)\b", re.IGNORECASE),
+    # "1,234,567 views" with loose separators
+    "views_loose": re.compile(r"([0-9][0-9,\.\s]*)\s*(?:views|view)", re.IGNORECASE),
+}
+
+_MISS = object()
+
+
+class PageText:
+    """
+    Memoized text view of a document or element
+
+    Nothing is serialized until the first fallback actually needs the text.
+    """
+
+    __slots__ = ("_node", "_text", "_matches")
+
+    def __init__(self, node: Tag):
+        self._node = node
+        self._text: Optional[str] = None
+        self._matches: dict[str, Optional[re.Match[str]]] = {}
+
+    @property
+    def text(self) -> str:
+        """Visible text, joined with single spaces (built on first access)"""
+        if self._text is None:
+            self._text = self._node.get_text(" ", strip=True)
+        return self._text
+
+    def search(self, matcher: str) -> Optional[re.Match[str]]:
+        """
+        Run a named fallback matcher over the text
+
+        Args:
+            matcher: Key of FALLBACK_MATCHERS
+
+        Returns:
+            First match or None; repeated calls return the memoized result
+        """
+        m = self._matches.get(matcher, _MISS)
+        if m is _MISS:
+            m = FALLBACK_MATCHERS[matcher].search(self.text)
+            self._matches[matcher] = m
+        return m
@@ -3,11 +3,16 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+from app.scrapers.fetch_profiles import fetch_listing
+from app.scrapers.text_index import PageText
+from app.scrapers.selector_plans import SelectorPlan, page_shape
+
 
 def can_handle(host: str) -> bool:
     return host.lower().endswith("xhamster.com")
@@ -42,12 +47,28 @@ def _find_duration_like_text(node: Any) -> Optional[str]:
     return m.group(0) if m else None
 
 
-async def fetch_html(url: str) -> str:
-    headers = {
+# Fetch profiles: "desktop" is the full themed page, "mobile" asks for the
+# lighter mobile render, which still carries the window.initials JSON the
+# listing extractor reads, without the desktop ad slots and sprite markup.
+FETCH_PROFILES: dict[str, dict[str, str]] = {
+    "desktop": {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
-    }
+    },
+    "mobile": {
+        "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    },
+}
+
+# Profile list_videos tries first (see fetch_profiles.fetch_listing)
+LIST_PROFILE = "mobile"
+
+
+async def fetch_html(url: str, profile: str = "desktop") -> str:
+    headers = FETCH_PROFILES.get(profile) or FETCH_PROFILES["desktop"]
 
     async with httpx.AsyncClient(
         follow_redirects=True,
@@ -143,7 +164,7 @@ def _normalize_duration(seconds_or_iso: Any) -> Optional[str]:
     return str(seconds_or_iso).strip() or None
 
 
-def _extract_views(video_obj: Optional[dict[str, Any]], html: str, soup: BeautifulSoup) -> Optional[str]:
+def _extract_views(video_obj: Optional[dict[str, Any]], html: str, text: PageText) -> Optional[str]:
     if video_obj:
         for key in ("interactionCount", "viewCount", "views"):
             v = video_obj.get(key)
@@ -176,14 +197,13 @@ def _extract_views(video_obj: Optional[dict[str, Any]], html: str, soup: Beautif
             v = v.rstrip(".")
             return v or None
 
-    text = soup.get_text(" ", strip=True)
-    m = re.search(r"(\d+(?:\.\d+)?)\s*([KMB])?\s*(?:views|view)\b", text, re.IGNORECASE)
+    m = text.search("views_compact")
     if m:
         num = m.group(1)
         suffix = (m.group(2) or "").upper()
         return f"{num}{suffix}" if suffix else num
 
-    m = re.search(r"([0-9][0-9,\.\s]*)\s*(?:views|view)", text, re.IGNORECASE)
+    m = text.search("views_loose")
     if m:
         v = m.group(1).strip().replace(" ", "")
         v = v.rstrip(",")
@@ -192,7 +212,12 @@ def _extract_views(video_obj: Optional[dict[str, Any]], html: str, soup: Beautif
     return None
 
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # Streams come from window.initials; no need to build a soup at all
+        return streams_only(url, _extract_video_data(html))
+
     soup = BeautifulSoup(html, "lxml")
 
     og_title = _meta(soup, prop="og:title")
@@ -246,7 +271,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
 
         tags = _as_list(video_obj.get("keywords"))
 
-    if not tags:
+    if not tags and "tags" in fields:
         for a in soup.select('a[href*="/tags/"]'):
             t = _text(a)
             if t:
@@ -267,15 +292,16 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
                 uploader = t
                 break
 
-    views = _extract_views(video_obj, html, soup)
+    page_text = PageText(soup)
+    views = _extract_views(video_obj, html, page_text) if "views" in fields else None
 
-    if not duration:
-        m = re.search(r"\b(\d{1,2}:\d{2}(?::\d{2})?)\b", soup.get_text(" ", strip=True))
+    if not duration and "duration" in fields:
+        m = page_text.search("duration")
         if m:
             duration = m.group(1)
 
     # ZERO-COST VIDEO EXTRACTION
-    video_data = _extract_video_data(html)
+    video_data = _extract_video_data(html) if "video" in fields else empty_video()
 
     # Related Videos Extraction
     related_videos = []
@@ -283,7 +309,9 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     # Using a generic selector closer to what list_videos uses
     
     # Try finding the related container
-    rel_container = soup.find(class_=re.compile(r"related-videos|upsell-videos"))
+    rel_container = None
+    if "related_videos" in fields:
+        rel_container = soup.find(class_=re.compile(r"related-videos|upsell-videos"))
     if rel_container:
          # xHamster video cards
          for a in rel_container.find_all("a", class_="video-thumb__image-container"):
@@ -329,7 +357,9 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     # scrubber: { sprite: "..." }
     # or look for "url":".../sprite..."
     
-    scrubber_match = re.search(r'["\']scrubber["\']\s*:\s*\{\s*["\']sprite["\']\s*:\s*["\']([^"\']+)["\']', html)
+    scrubber_match = None
+    if "preview_url" in fields:
+        scrubber_match = re.search(r'["\']scrubber["\']\s*:\s*\{\s*["\']sprite["\']\s*:\s*["\']([^"\']+)["\']', html)
     if scrubber_match:
         preview_url = scrubber_match.group(1).replace("\\/", "/")
 
@@ -507,18 +537,14 @@ def _extract_video_data(html: str) -> dict[str, Any]:
     }
 
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    return parse_page(html, url)
+    return parse_page(html, url, include)
 
 
-async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
+def _list_candidates(base_url: str, page: int) -> list[str]:
     root = base_url if base_url.endswith("/") else base_url + "/"
 
-    effective_limit: int | None = None
-    if limit is not None and limit > 0:
-        effective_limit = limit
-
     candidates: list[str] = []
     if page <= 1:
         candidates.append(root)
@@ -534,27 +560,134 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
                 f"{root}videos?page={page}",
             ]
         )
+    return candidates
+
+
+def _load_initials(html: str) -> Optional[dict[str, Any]]:
+    idx = html.find("window.initials")
+    if idx == -1:
+        return None
+    start = html.find("{", idx)
+    if start == -1:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, start)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _iter_video_thumbs(node: Any):
+    # Thumb props sit at different depths per page type, so walk the tree
+    if isinstance(node, dict):
+        if node.get("pageURL") and (node.get("thumbURL") or node.get("imageURL")):
+            yield node
+            return
+        for v in node.values():
+            yield from _iter_video_thumbs(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _iter_video_thumbs(v)
+
+
+def _compact_count(value: Any) -> Optional[str]:
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        n = int(value)
+    except (TypeError, ValueError):
+        return str(value).strip()
+    # Same short form the cards render ("1.2M", "35.1K")
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.1f}".rstrip("0").rstrip(".") + "M"
+    if n >= 1_000:
+        return f"{n / 1_000:.1f}".rstrip("0").rstrip(".") + "K"
+    return str(n)
+
+
+def _parse_listing_initials(html: str, used: str) -> list[dict[str, Any]]:
+    """Extract listing cards from the window.initials JSON without building a soup."""
+    data = _load_initials(html)
+    if not data:
+        return []
+    base_uri = httpx.URL(used)
 
-    html = ""
-    used = ""
-    last_exc: Exception | None = None
-    for c in candidates:
+    items: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for thumb in _iter_video_thumbs(data):
+        href = str(thumb.get("pageURL"))
+        if "/videos/" not in href:
+            continue
         try:
-            html = await fetch_html(c)
-            used = c
-            if html:
-                break
-        except Exception as e:
-            last_exc = e
+            abs_url = str(base_uri.join(href))
+        except Exception:
+            continue
+        if abs_url in seen:
             continue
 
-    if not html:
-        if last_exc:
-            raise last_exc
-        return []
+        landing = thumb.get("landing") if isinstance(thumb.get("landing"), dict) else {}
+        seen.add(abs_url)
+        items.append(
+            {
+                "url": abs_url,
+                "title": _first_non_empty(thumb.get("title")),
+                "thumbnail_url": _first_non_empty(thumb.get("thumbURL"), thumb.get("imageURL")),
+                "duration": _normalize_duration(thumb.get("duration")),
+                "views": _compact_count(thumb.get("views")),
+                "uploader_name": _first_non_empty(landing.get("name")),
+                "uploader_avatar_url": _first_non_empty(landing.get("logo")),
+            }
+        )
+    return items
+
 
+async def list_videos(
+    base_url: str,
+    page: int = 1,
+    limit: int = 20,
+    profile: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    return await fetch_listing(
+        "xhamster",
+        _list_candidates(base_url, page),
+        fetch_html,
+        _parse_listing_initials,
+        _parse_listing_desktop,
+        profile or LIST_PROFILE,
+    )
+
+
+def _parse_listing_desktop(html: str, used: str) -> list[dict[str, Any]]:
+    # Desktop pages carry the same initials JSON; only parse the DOM if it is absent
+    items = _parse_listing_initials(html, used)
+    if items:
+        return items
+    return _parse_listing_html(html, used)
+
+
+# Per-card metadata classes differ between the home, search, category and
+# channel grids; each plan learns which one the current page shape uses.
+_VIEWS_PLAN = SelectorPlan(
+    "xhamster", "views",
+    [r"video-thumb-views", r"video-thumb-info__views", r"entity-views-container__value"],
+    kind="class",
+)
+_UPLOADER_PLAN = SelectorPlan(
+    "xhamster", "uploader",
+    [r"video-uploader__name", r"video-thumb-uploader__name", r"video-user-info__name"],
+    kind="class",
+)
+_AVATAR_PLAN = SelectorPlan(
+    "xhamster", "avatar",
+    [r"video-uploader-logo", r"video-thumb-uploader__logo", r"video-user-info__avatar"],
+    kind="class",
+)
+
+
+def _parse_listing_html(html: str, used: str) -> list[dict[str, Any]]:
     soup = BeautifulSoup(html, "lxml")
     base_uri = httpx.URL(used)
+    shape = page_shape(used)
 
     items: list[dict[str, Any]] = []
     seen: set[str] = set()
@@ -596,7 +729,7 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
 
         # Extract views
         views = None
-        views_el = card.find(class_=re.compile(r"video-thumb-views|video-thumb-info__views|entity-views-container__value"))
+        views_el = _VIEWS_PLAN.select_one(card, shape)
         if views_el:
             views_text = _text(views_el)
             if views_text:
@@ -607,7 +740,7 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
         uploader_name = None
         uploader_avatar_url = None
         
-        uploader_el = card.find(class_=re.compile(r"video-uploader__name|video-thumb-uploader__name|video-user-info__name"))
+        uploader_el = _UPLOADER_PLAN.select_one(card, shape)
         if not uploader_el:
              # Try finding uploader link within the card only
             uploader_link = card.find('a', href=re.compile(r"/users/|/channels/"))
@@ -618,7 +751,7 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
             
         # Extract uploader logo/avatar
         # Typical classes: video-uploader-logo, video-thumb-uploader__logo, etc.
-        logo_el = card.find(class_=re.compile(r"video-uploader-logo|video-thumb-uploader__logo|video-user-info__avatar"))
+        logo_el = _AVATAR_PLAN.select_one(card, shape)
         if logo_el:
             # Check for data-background-image first (often used for avatars)
             bg_img = logo_el.get("data-background-image")
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+
 
 def can_handle(host: str) -> bool:
     return host.lower().endswith("xnxx.com")
@@ -212,7 +214,12 @@ def _extract_video_urls(html: str) -> dict[str, Any]:
     }
 
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # html5player setters are plain regex hits; skip the DOM entirely
+        return streams_only(url, _extract_video_urls(html))
+
     soup = BeautifulSoup(html, "lxml")
 
     og_title = _meta(soup, prop="og:title")
@@ -302,22 +309,22 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
 
         tags = _as_list(video_obj.get("keywords"))
 
-    if not tags:
+    if not tags and "tags" in fields:
         for a in soup.select('a[href*="/tags/"]'):
             t = _text(a)
             if t:
                 tags.append(t)
     tags = list(dict.fromkeys([t for t in tags if t]))
 
-    if not duration:
+    if not duration and "duration" in fields:
          # Try specific duration class first
         dur_node = soup.find(class_=re.compile(r"duration", re.IGNORECASE))
         if dur_node:
             duration = _find_duration_like_text(_text(dur_node) or "")
-    if not duration:
+    if not duration and "duration" in fields:
         duration = _find_duration_like_text(soup.get_text(" ", strip=True))
 
-    if not views:
+    if not views and "views" in fields:
         # Strategy 3: Regex for visible view count in metadata text
         # e.g. " - 402,455" at the end of the metadata block
         # or "7min | 360p - 402,455"
@@ -332,7 +339,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
                   suf = (m_fallback.group(2) or "").upper()
                   views = f"{num}{suf}" if suf else num
 
-    if not views:
+    if not views and "views" in fields:
         # Strategy 4: Layout with .metadata .right containing "16.3M 100%"
         right_span = soup.select_one(".metadata .right")
         if right_span:
@@ -357,7 +364,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
                 views = f"{val}{suf}" if suf else val
                 break
 
-    if not views:
+    if not views and "views" in fields:
         m = re.search(r'"viewCount"\s*:\s*"?([0-9][0-9,\.]*\s*[KMB]?)"?', html, re.IGNORECASE)
         if m:
             views = m.group(1).replace(" ", "")
@@ -372,7 +379,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     # Related Videos Extraction
     related_videos = []
     # XNXX typically uses 'div#related-videos' containing 'div.thumb-block'
-    rel_container = soup.find(id="related-videos")
+    rel_container = soup.find(id="related-videos") if "related_videos" in fields else None
     if rel_container:
         for block in rel_container.select(".thumb-block"):
             try:
@@ -412,7 +419,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
                 continue
 
     # NEW: Extract video URLs for streaming
-    video_info = _extract_video_urls(html)
+    video_info = _extract_video_urls(html) if "video" in fields else empty_video()
 
     # Preview Extraction
     preview_url = None
@@ -430,7 +437,9 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     
     # Let's try to capture the "ThumbSlide" url as a "preview_image" or "preview_scrubber"
     # For now, let's look for setThumbSlideBig
-    pv_match = re.search(r"html5player\.setThumbSlideBig\(['\"](.+?)['\"]\)", html)
+    pv_match = None
+    if "preview_url" in fields:
+        pv_match = re.search(r"html5player\.setThumbSlideBig\(['\"](.+?)['\"]\)", html)
     if pv_match:
         preview_url = pv_match.group(1)
 
@@ -450,9 +459,9 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     }
 
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    return parse_page(html, url)
+    return parse_page(html, url, include)
 
 
 async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
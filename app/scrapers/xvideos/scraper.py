@@ -3,11 +3,14 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+from app.scrapers.fetch_profiles import fetch_listing
+
 
 def can_handle(host: str) -> bool:
     return host.lower().endswith("xvideos.com")
@@ -23,12 +26,27 @@ def get_categories() -> list[dict]:
         return []
 
 
-async def fetch_html(url: str) -> str:
-    headers = {
+# Fetch profiles: the mobile render of a listing keeps the same div.thumb-block
+# cards as desktop but drops the ad columns, sprite preloads and most inline JS.
+FETCH_PROFILES: dict[str, dict[str, str]] = {
+    "desktop": {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
-    }
+    },
+    "mobile": {
+        "User-Agent": "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    },
+}
+
+# Profile list_videos tries first (see fetch_profiles.fetch_listing)
+LIST_PROFILE = "mobile"
+
+
+async def fetch_html(url: str, profile: str = "desktop") -> str:
+    headers = FETCH_PROFILES.get(profile) or FETCH_PROFILES["desktop"]
     async with httpx.AsyncClient(
         follow_redirects=True,
         timeout=httpx.Timeout(20.0, connect=20.0),
@@ -136,7 +154,12 @@ def _find_duration_like_text(text: str) -> Optional[str]:
     return m.group(0) if m else None
 
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # html5player setters are plain regex hits; skip the DOM entirely
+        return streams_only(url, _extract_video_streams(html))
+
     soup = BeautifulSoup(html, "lxml")
 
     og_title = _meta(soup, prop="og:title")
@@ -146,7 +169,9 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
 
     # Preview URL extraction
     preview_url = None
-    m_preview = re.search(r"setThumbSlide\s*\(\s*['\"]([^'\"]+)['\"]\s*\)", html)
+    m_preview = None
+    if "preview_url" in fields:
+        m_preview = re.search(r"setThumbSlide\s*\(\s*['\"]([^'\"]+)['\"]\s*\)", html)
     if m_preview:
         preview_url = m_preview.group(1)
 
@@ -208,19 +233,19 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
 
         tags = _as_list(video_obj.get("keywords"))
 
-    if not tags:
+    if not tags and "tags" in fields:
         for a in soup.select('a[href*="/tags/"]'):
             t = _text(a)
             if t:
                 tags.append(t)
     tags = list(dict.fromkeys([t for t in tags if t]))
 
-    if not duration:
+    if not duration and "duration" in fields:
         # Try specific duration class first
         dur_node = soup.find(class_=re.compile(r"duration", re.IGNORECASE))
         if dur_node:
             duration = _find_duration_like_text(_text(dur_node) or "")
-    if not duration:
+    if not duration and "duration" in fields:
         duration = _find_duration_like_text(soup.get_text(" ", strip=True))
 
     views: Optional[str] = None
@@ -229,7 +254,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         views = m.group(1).replace(" ", "")
 
     # ZERO-COST VIDEO EXTRACTION
-    video_data = _extract_video_streams(html)
+    video_data = _extract_video_streams(html) if "video" in fields else empty_video()
 
     # Related Videos Extraction
     related_videos = []
@@ -245,7 +270,9 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     # Or specifically looked for the container
     
     # XVideos usually has <div id="video_related_content">
-    rel_container = soup.find(id=re.compile("video_related_content|video-suggestions"))
+    rel_container = None
+    if "related_videos" in fields:
+        rel_container = soup.find(id=re.compile("video_related_content|video-suggestions"))
     if rel_container:
         for block in rel_container.select(".thumb-block"):
             try:
@@ -349,12 +376,12 @@ def _extract_video_streams(html: str) -> dict[str, Any]:
     }
 
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    return parse_page(html, url)
+    return parse_page(html, url, include)
 
 
-async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dict[str, Any]]:
+def _list_candidates(base_url: str, page: int) -> list[str]:
     root = base_url if base_url.endswith("/") else base_url + "/"
 
     candidates: list[str] = []
@@ -373,26 +400,28 @@ async def list_videos(base_url: str, page: int = 1, limit: int = 20) -> list[dic
                 f"{root}{sep}page={page}",
             ]
         )
-
-    html = ""
-    used = ""
-    last_exc: Exception | None = None
-    for c in candidates:
-        try:
-            html = await fetch_html(c)
-            used = c
-            if html:
-                break
-        except Exception as e:
-            last_exc = e
-            continue
-
-    if not html:
-        if last_exc:
-            raise last_exc
-        return []
-
-    soup = BeautifulSoup(html, "html.parser")
+    return candidates
+
+
+async def list_videos(
+    base_url: str,
+    page: int = 1,
+    limit: int = 20,
+    profile: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    # Mobile and desktop renders share the thumb-block markup
+    return await fetch_listing(
+        "xvideos",
+        _list_candidates(base_url, page),
+        fetch_html,
+        _parse_listing,
+        _parse_listing,
+        profile or LIST_PROFILE,
+    )
+
+
+def _parse_listing(html: str, used: str) -> list[dict[str, Any]]:
+    soup = BeautifulSoup(html, "lxml")
     base_uri = httpx.URL(used)
 
     items: list[dict[str, Any]] = []
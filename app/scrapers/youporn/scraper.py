@@ -3,11 +3,13 @@ from __future__ import annotations
 import json
 import re
 import os
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scrapers.profiles import SCRAPE_PROFILES, empty_video, resolve_include, streams_only
+
 def can_handle(host: str) -> bool:
     return "youporn.com" in host.lower()
 
@@ -222,7 +224,12 @@ def _extract_video_streams(html: str) -> dict[str, Any]:
         "has_video": len(streams) > 0
     }
 
-def parse_page(html: str, url: str) -> dict[str, Any]:
+def parse_page(html: str, url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
+    fields = resolve_include(include)
+    if fields <= SCRAPE_PROFILES["streams"]:
+        # mediaDefinition is read straight from the script text
+        return streams_only(url, _extract_video_streams(html))
+
     soup = BeautifulSoup(html, "lxml")
     
     # Title
@@ -261,10 +268,11 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
     # Usually in a div with class "video-infos" or similar
     # Look for explicit structure or regex
     # "x,xxx,xxx Views"
-    text_blob = soup.get_text(" ", strip=True)
-    m_views = re.search(r'([\d,]+)\s+views', text_blob, re.IGNORECASE)
-    if m_views:
-        views = m_views.group(1)
+    if "views" in fields:
+        text_blob = soup.get_text(" ", strip=True)
+        m_views = re.search(r'([\d,]+)\s+views', text_blob, re.IGNORECASE)
+        if m_views:
+            views = m_views.group(1)
 
     # Uploader
     uploader = None
@@ -281,7 +289,7 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         if txt: tags.append(txt)
     
     # Streams
-    video_data = _extract_video_streams(html)
+    video_data = _extract_video_streams(html) if "video" in fields else empty_video()
 
     return {
         "url": url,
@@ -298,9 +306,13 @@ def parse_page(html: str, url: str) -> dict[str, Any]:
         "preview_url": None 
     }
 
-async def scrape(url: str) -> dict[str, Any]:
+async def scrape(url: str, include: str | Iterable[str] | None = None) -> dict[str, Any]:
     html = await fetch_html(url)
-    result = parse_page(html, url)
+    fields = resolve_include(include)
+    result = parse_page(html, url, fields)
+    if "video" not in fields:
+        # Proxy resolution is an extra round trip per stream; skip it
+        return result
     
     # Check if we have proxy URLs and resolve them to real CDN streams
     video_data = result.get("video", {})
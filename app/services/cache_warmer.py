@@ -0,0 +1,144 @@
+"""
+Cache Warmer
+Refreshes popular listing pages before they go stale
+
+Every CACHE_WARM_INTERVAL seconds a pass walks:
+- pages 1..CACHE_WARM_PAGES of each site's trending URL (global_search.TRENDING_URLS)
+- page 1 of each site's top CACHE_WARM_TOP_CATEGORIES categories (by video_count
+  in its categories.json)
+- page 1 of every site's search for the CACHE_WARM_TOP_SEARCHES most searched queries
+
+and reloads each page whose cache entry is missing or would go stale
+before the next pass, through the same page cache /videos and global search
+read, so users find them fresh.
+
+Warming yields to live traffic: it runs one fetch at a time, waits while
+requests are loading from upstream and spends the per-site background
+budget (core.budget), skipping a site until its bucket refills.
+"""
+
+import asyncio
+import importlib
+import logging
+
+from app.config.settings import settings
+from app.core.budget import background_budget
+from app.core.cache import cache
+from app.services.categories import category_store
+from app.services.global_search import TRENDING_URLS, build_search_url, top_queries
+from app.services.listing import page_key, page_limits, refresh_page
+
+logger = logging.getLogger(__name__)
+
+SITES = ("xhamster", "masa49", "xnxx", "xvideos", "pornhub", "youporn", "redtube", "beeg", "spankbang", "fapnut")
+
+# Listing limits warmed. They only matter for sites whose pages depend on
+# the limit; those are warmed at the limits callers actually request
+# (listing.page_limits), these are the defaults until requests are seen.
+WARM_LIMIT = 20
+SEARCH_LIMIT = 10
+
+# Longest wait for live loads to drain before a job is skipped
+IDLE_WAIT_SECONDS = 10.0
+
+_stats = {"passes": 0, "warmed": 0, "fresh": 0, "over_budget": 0, "busy": 0, "failed": 0}
+
+
+def _scraper(site: str):
+    return importlib.import_module(f"app.scrapers.{site}")
+
+
+def _top_categories(site: str, n: int) -> list[str]:
+    ranked = sorted(category_store.items(site), key=lambda c: c.get("video_count") or 0, reverse=True)
+    return [c["url"] for c in ranked[:n] if c.get("url")]
+
+
+async def build_jobs() -> list[tuple[str, str, int, int, int]]:
+    """
+    Pages to keep warm, most valuable first
+
+    Returns:
+        (site, url, page, limit, ttl_seconds) tuples
+    """
+    jobs = []
+    for site, url in TRENDING_URLS.items():
+        for page in range(1, settings.CACHE_WARM_PAGES + 1):
+            for limit in page_limits(site, WARM_LIMIT):
+                jobs.append((site, url, page, limit, settings.CACHE_TTL_LIST))
+    for site in SITES:
+        for url in _top_categories(site, settings.CACHE_WARM_TOP_CATEGORIES):
+            for limit in page_limits(site, WARM_LIMIT):
+                jobs.append((site, url, 1, limit, settings.CACHE_TTL_LIST))
+    for query in top_queries(settings.CACHE_WARM_TOP_SEARCHES):
+        for site in TRENDING_URLS:
+            url = build_search_url(site, query, None)
+            if url:
+                for limit in page_limits(site, SEARCH_LIMIT):
+                    jobs.append((site, url, 1, limit, settings.CACHE_TTL_SEARCH))
+    return jobs
+
+
+async def _wait_for_idle() -> bool:
+    """Wait (bounded) until no live request is loading from upstream"""
+    waited = 0.0
+    while cache.loads_in_flight:
+        if waited >= IDLE_WAIT_SECONDS:
+            return False
+        await asyncio.sleep(0.5)
+        waited += 0.5
+    return True
+
+
+async def warm_once() -> dict:
+    """
+    Run one warming pass
+
+    Returns:
+        Counters for this pass
+    """
+    # Anything going stale before the next pass is refreshed now
+    lead = settings.CACHE_WARM_INTERVAL * 1.5
+    counts = dict.fromkeys(_stats, 0)
+    counts["passes"] = 1
+    for site, url, page, limit, ttl in await build_jobs():
+        remaining = cache.ttl_remaining(page_key(site, url, page, limit))
+        if remaining is not None and remaining > min(lead, ttl / 2):
+            counts["fresh"] += 1
+            continue
+        if not await _wait_for_idle():
+            counts["busy"] += 1
+            continue
+        if not background_budget.try_acquire(site):
+            counts["over_budget"] += 1
+            continue
+        try:
+            await refresh_page(_scraper(site), url, page, limit, ttl_seconds=ttl)
+            counts["warmed"] += 1
+        except Exception as e:
+            counts["failed"] += 1
+            logger.debug("Warming %s page %s failed: %s", url, page, e)
+        await asyncio.sleep(settings.CACHE_WARM_PAUSE)
+
+    for name, value in counts.items():
+        _stats[name] += value
+    logger.info(
+        "Cache warm pass: %(warmed)s warmed, %(fresh)s fresh, %(over_budget)s over budget, "
+        "%(busy)s deferred, %(failed)s failed", counts,
+    )
+    return counts
+
+
+def get_stats() -> dict:
+    """Totals over all passes"""
+    return {**_stats, "budget": background_budget.get_stats()}
+
+
+async def warm_task():
+    """Periodic warming passes (started from the app lifespan)"""
+    await asyncio.sleep(settings.CACHE_WARM_INITIAL_DELAY)
+    while True:
+        try:
+            await warm_once()
+        except Exception as e:
+            logger.warning(f"Cache warm pass failed: {e}")
+        await asyncio.sleep(settings.CACHE_WARM_INTERVAL)
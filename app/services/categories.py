@@ -0,0 +1,195 @@
+"""
+Categories Store
+Every source's categories.json, loaded once and served as pre-encoded bytes
+
+The category lists are static files shipped next to each scraper. They are
+read once (at startup, or on first use) into an immutable snapshot holding,
+per site, the frozen items, the JSON body /api/v1/categories returns
+(already validated through CategoryItem and encoded) and a strong ETag of
+that body.
+
+Files are re-checked at most every CATEGORIES_RELOAD_CHECK_SECONDS. The
+check and any reload run in a worker thread while requests keep reading the
+current snapshot, which is then swapped in whole. A file that fails to
+parse (e.g. caught mid-write) keeps its previous list.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from time import monotonic
+from typing import Optional
+
+from app.config.settings import settings
+from app.core.etag import make_etag
+from app.core.frozen import freeze
+from app.models.schemas import CategoryItem
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scrapers")
+
+SITES = ("xnxx", "masa49", "xvideos", "xhamster", "youporn", "pornhub", "redtube", "beeg", "spankbang", "fapnut")
+
+# ?source= values accepted by /api/v1/categories
+SOURCES: dict[str, str] = {
+    "xnxx": "xnxx",
+    "masa": "masa49",
+    "xvideos": "xvideos",
+    "xhamster": "xhamster",
+    "youporn": "youporn",
+    "pornhub": "pornhub",
+    "redtube": "redtube",
+    "beeg": "beeg",
+    "spankbang": "spankbang",
+    "onlyfans": "fapnut",
+    "fapnut": "fapnut",
+}
+
+
+class CategorySet:
+    """One site's categories: items, encoded body and ETag"""
+
+    __slots__ = ("items", "body", "etag", "stamp")
+
+    def __init__(self, items: tuple, body: bytes, stamp: Optional[tuple[int, int]]):
+        self.items = items
+        self.body = body
+        self.etag = make_etag(body)
+        self.stamp = stamp
+
+
+def _path(site: str) -> str:
+    return os.path.join(SCRAPERS_DIR, site, "categories.json")
+
+
+def _stamp(path: str) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _encode(items: list) -> bytes:
+    # Same shape and encoding FastAPI would produce for list[CategoryItem]
+    payload = [CategoryItem(**c).model_dump() for c in items]
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _read(site: str) -> CategorySet:
+    """
+    Load and encode one site's categories.json
+
+    Raises:
+        OSError, ValueError or pydantic.ValidationError for unreadable files
+    """
+    path = _path(site)
+    stamp = _stamp(path)
+    if stamp is None:
+        return CategorySet((), b"[]", None)
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    if not isinstance(items, list):
+        raise ValueError(f"{path}: expected a list")
+    return CategorySet(freeze(items), _encode(items), stamp)
+
+
+class CategoryStore:
+    """Immutable per-site category snapshots with background reload"""
+
+    def __init__(self, sites: tuple[str, ...] = SITES, check_interval: Optional[float] = None):
+        """
+        Args:
+            sites: Scraper packages with a categories.json
+            check_interval: Seconds between file change checks
+                (default: settings.CATEGORIES_RELOAD_CHECK_SECONDS)
+        """
+        self.sites = sites
+        self.check_interval = (
+            settings.CATEGORIES_RELOAD_CHECK_SECONDS if check_interval is None else check_interval
+        )
+        self._sets: Optional[dict[str, CategorySet]] = None
+        self._checked = 0.0
+        self._checking: Optional[asyncio.Task] = None
+        self._reloads = 0
+        self._errors = 0
+
+    def load(self) -> int:
+        """
+        Load every site's file (blocking; run at startup or in a thread)
+
+        Returns:
+            Number of sites whose list changed
+        """
+        current = self._sets or {}
+        sets = dict(current)
+        changed = 0
+        for site in self.sites:
+            old = current.get(site)
+            if old is not None and old.stamp == _stamp(_path(site)):
+                continue
+            try:
+                sets[site] = _read(site)
+            except Exception as e:
+                self._errors += 1
+                logger.warning("Failed to load categories for %s: %s", site, e)
+                if old is None:
+                    sets[site] = CategorySet((), b"[]", None)
+                continue
+            changed += 1
+        if self._sets is not None and changed:
+            self._reloads += changed
+            logger.info("Reloaded categories for %d site(s)", changed)
+        self._sets = sets
+        self._checked = monotonic()
+        return changed
+
+    async def start(self):
+        """Initial load off the event loop"""
+        await asyncio.to_thread(self.load)
+
+    def get(self, site: str) -> Optional[CategorySet]:
+        """
+        Current categories of a site
+
+        Never waits for a reload: a due change check is started in the
+        background and later calls see its result.
+
+        Returns:
+            CategorySet, or None for an unknown site
+        """
+        if self._sets is None:
+            self.load()
+        elif monotonic() - self._checked >= self.check_interval and self._checking is None:
+            try:
+                self._checking = asyncio.get_running_loop().create_task(self._check())
+            except RuntimeError:
+                pass
+        return self._sets.get(site)
+
+    async def _check(self):
+        try:
+            await asyncio.to_thread(self.load)
+        finally:
+            self._checking = None
+            self._checked = monotonic()
+
+    def items(self, site: str) -> tuple:
+        """Frozen category dicts of a site"""
+        found = self.get(site)
+        return found.items if found is not None else ()
+
+    def get_stats(self) -> dict:
+        """Get store statistics"""
+        sets = self._sets or {}
+        return {
+            "sites": {site: len(s.items) for site, s in sets.items()},
+            "bytes": sum(len(s.body) for s in sets.values()),
+            "reloads": self._reloads,
+            "errors": self._errors,
+        }
+
+
+category_store = CategoryStore()
@@ -5,13 +5,48 @@ Killer feature from porn-app.com's Pro tier ($3.99/mo)
 """
 
 from fastapi import Query
-from typing import Optional
+from typing import Optional, Sequence
 from app.core.exceptions import ScraperException
+from app.core.frozen import overlay
+from app.services.listing import cached_page, page_key
+from collections import Counter
 import asyncio
+import importlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Trending page per site (also warmed ahead of expiry, see cache_warmer)
+TRENDING_URLS = {
+    'xhamster': "https://xhamster.com/trending",
+    'xnxx': "https://www.xnxx.com/hits",
+    'xvideos': "https://www.xvideos.com/",
+    'masa49': "https://masa49.org/",
+    'pornhub': "https://www.pornhub.com/video?o=ht",
+    'youporn': "https://www.youporn.com/top-rated/",
+    'redtube': "https://www.redtube.com/top",
+    'beeg': "https://beeg.com/asian",
+    'spankbang': "https://spankbang.com/trending_videos",
+}
+
+# How often each query was searched, for warming the popular ones
+_query_counts: Counter = Counter()
+_MAX_TRACKED_QUERIES = 2000
+
+
+def record_query(query: str):
+    """Count a search query (the tail is trimmed once the table is full)"""
+    _query_counts[query.strip().lower()] += 1
+    if len(_query_counts) > _MAX_TRACKED_QUERIES:
+        kept = _query_counts.most_common(_MAX_TRACKED_QUERIES // 2)
+        _query_counts.clear()
+        _query_counts.update(dict(kept))
+
+
+def top_queries(n: int) -> list[str]:
+    """Most searched queries"""
+    return [q for q, _ in _query_counts.most_common(n)]
+
 
 async def global_search(
     query: str,
@@ -89,11 +124,12 @@ async def global_search(
     
     # Build search tasks
     tasks = []
+    cache_keys = []
     for site_name in sites_to_search:
         scraper_module = available_scrapers[site_name]
         
         # Build search URL for each site
-        search_url = _build_search_url(site_name, query, scraper_module)
+        search_url = build_search_url(site_name, query, scraper_module)
         
         if search_url:
             task = _search_site(
@@ -103,6 +139,11 @@ async def global_search(
                 limit=limit_per_site
             )
             tasks.append(task)
+            cache_keys.append(page_key(site_name, search_url, 1, limit_per_site))
+    
+    # One L2 round trip for every site's cached results
+    from app.core.cache import cache
+    await cache.preload(cache_keys)
     
     # Execute all searches concurrently (ZERO-COST POWER!)
     results_by_site = await asyncio.gather(*tasks, return_exceptions=True)
@@ -116,12 +157,12 @@ async def global_search(
             logger.error(f"Search failed for {site_name}: {site_results}")
             continue
         
-        if isinstance(site_results, list):
+        # Pages come from the page cache as frozen tuples
+        if isinstance(site_results, (list, tuple)):
             successful_sites += 1
-            for item in site_results:
-                # Add source site to each result
-                item["source_site"] = site_name
-                combined_results.append(item)
+            # Tag each result with its source site (cached items are
+            # read-only, the tag goes on a per-request overlay)
+            combined_results.extend(overlay(item, source_site=site_name) for item in site_results)
     
     search_time = time() - start_time
     
@@ -140,7 +181,7 @@ async def global_search(
     }
 
 
-def _build_search_url(site_name: str, query: str, scraper_module) -> str:
+def build_search_url(site_name: str, query: str, scraper_module) -> str:
     """
     Build search URL for each site
     Each site has different search URL patterns
@@ -168,34 +209,24 @@ async def _search_site(
     scraper_module,
     search_url: str,
     limit: int
-) -> list:
+) -> Sequence:
     """
     Search a single site and return results
     
     Uses existing list_videos() function from each scraper
     """
     try:
-        # Check cache first (ZERO-COST OPTIMIZATION)
-        from app.core.cache import cache
-        cache_key = f"search:{site_name}:{search_url}:{limit}"
-        
-        cached = await cache.get(cache_key)
-        if cached:
-            logger.info(f"⚡ Cache HIT for search on {site_name}")
-            return cached
-        
-        # Use scraper's list_videos function
-        results = await scraper_module.list_videos(
-            base_url=search_url,
+        # Shares the page cache with /videos: the same upstream page is
+        # fetched and stored once whatever limit either side asks for
+        from app.config.settings import settings
+        return await cached_page(
+            scraper_module,
+            search_url,
             page=1,
-            limit=limit
+            limit=limit,
+            ttl_seconds=settings.CACHE_TTL_SEARCH,
         )
         
-        # Cache search results for 10 minutes
-        await cache.set(cache_key, results, ttl_seconds=600)
-        
-        return results
-        
     except Exception as e:
         logger.error(f"Search error for {site_name}: {e}")
         return []
@@ -211,42 +242,36 @@ async def global_trending(
     
     Similar to global search but uses trending pages
     """
-    from app.scrapers import xhamster, xnxx, xvideos, masa49, pornhub, youporn, redtube, beeg, spankbang
-    
     available_scrapers = {
-        'xhamster': (xhamster, "https://xhamster.com/trending"),
-        'xnxx': (xnxx, "https://www.xnxx.com/hits"),
-        'xvideos': (xvideos, "https://www.xvideos.com/"),
-        'masa49': (masa49, "https://masa49.org/"),
-        'pornhub': (pornhub, "https://www.pornhub.com/video?o=ht"),
-        'youporn': (youporn, "https://www.youporn.com/top-rated/"),
-        'redtube': (redtube, "https://www.redtube.com/top"),
-        'beeg': (beeg, "https://beeg.com/asian"),
-        'spankbang': (spankbang, "https://spankbang.com/trending_videos")
+        site: (importlib.import_module(f"app.scrapers.{site}"), url)
+        for site, url in TRENDING_URLS.items()
     }
     
     if not sites:
         sites = list(available_scrapers.keys())
     
     tasks = []
+    cache_keys = []
     for site_name in sites:
         if site_name in available_scrapers:
             scraper, trending_url = available_scrapers[site_name]
             task = _search_site(site_name, scraper, trending_url, limit_per_site)
             tasks.append((site_name, task))
+            cache_keys.append(page_key(site_name, trending_url, 1, limit_per_site))
+    
+    from app.core.cache import cache
+    await cache.preload(cache_keys)
     
     results = await asyncio.gather(*[t for _, t in tasks], return_exceptions=True)
     
     combined = []
     for (site_name, _), site_results in zip(tasks, results):
-        if isinstance(site_results, list):
-            for item in site_results:
-                item["source_site"] = site_name
-                combined.append(item)
+        if isinstance(site_results, (list, tuple)):
+            combined.extend(overlay(item, source_site=site_name) for item in site_results)
     
     return {
         "type": "trending",
-        "sites": len([r for r in results if isinstance(r, list)]),
+        "sites": len([r for r in results if isinstance(r, (list, tuple))]),
         "total_results": len(combined),
         "results": combined
     }
@@ -0,0 +1,215 @@
+"""
+Listing Page Cache
+Caches each parsed upstream listing page once per (site, canonical page URL)
+
+Scrapers parse every card on an upstream page whatever limit is asked for,
+so the full page is cached and each caller takes its own slice: /videos
+with limit=20 and limit=60 and a global search over the same URL all read
+one entry (and share one in-flight fetch on a miss).
+
+Cached pages hold VideoCard records rather than dicts: one slotted object
+per card, with low-cardinality strings (durations, uploaders, tags, ...)
+interned so every page shares a single copy. Cards are read-only mappings,
+so callers build ListItem(**card) or overlay(card, ...) as before.
+"""
+
+import sys
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator
+
+from app.config.settings import settings
+from app.core.cache import cache
+from app.core.frozen import freeze
+from app.core.negative import negative_cache
+from app.core.urls import canonical_url
+from app.services.video_cache import site_name
+
+# Requested from scrapers on a miss; large enough for any caller's slice
+PAGE_LIMIT = 60
+
+# Sites whose upstream page size is the requested limit (offset = (page-1)*limit),
+# so a page is only reusable at the same limit
+_LIMIT_PAGED = {"beeg"}
+
+# Limits live callers asked limit-paged sites for, so background loads can
+# fill the keys that are actually read
+_requested_limits: dict[str, Counter] = {}
+
+
+_MISSING = object()
+
+
+class VideoCard(Mapping):
+    """Compact read-only listing card (a Mapping over the scraper's dict keys)"""
+
+    __slots__ = (
+        "url", "title", "thumbnail_url", "duration", "views",
+        "uploader_name", "uploader_avatar_url", "category", "tags", "extra",
+    )
+    _FIELDS = __slots__[:-1]
+    _FIELD_SET = frozenset(_FIELDS)
+    _INTERNED = frozenset({"duration", "views", "uploader_name", "uploader_avatar_url", "category"})
+
+    def __init__(self, item: Mapping[str, Any]):
+        """
+        Args:
+            item: Card dict from a scraper's list_videos(); keys that are
+                not card fields are kept (frozen) in extra
+        """
+        for name in self._FIELDS:
+            value = item.get(name, _MISSING)
+            if isinstance(value, str) and name in self._INTERNED:
+                value = sys.intern(value)
+            elif name == "tags" and isinstance(value, (list, tuple)):
+                value = tuple(sys.intern(t) if isinstance(t, str) else t for t in value)
+            object.__setattr__(self, name, value)
+        extra = {k: v for k, v in item.items() if k not in self._FIELD_SET}
+        object.__setattr__(self, "extra", freeze(extra) if extra else None)
+
+    def __setattr__(self, name, value):
+        raise TypeError("VideoCard is read-only; use overlay() to add fields")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        # Rebuild through __init__ so strings are interned in the loading process
+        return VideoCard, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"VideoCard({dict(self)!r})"
+
+
+def page_key(site: str, base_url: str, page: int, limit: int) -> str:
+    """Cache key of one upstream listing page"""
+    key = f"page:{site}:{canonical_url(base_url)}:p{page}"
+    if site in _LIMIT_PAGED:
+        key += f":l{limit}"
+    return key
+
+
+def page_limits(site: str, default: int, n: int = 2) -> list[int]:
+    """
+    Limits to load a site's pages at in the background
+
+    Args:
+        site: Site name
+        default: Limit used before any request was seen, and for every
+            site whose pages don't depend on the limit
+        n: At most this many limits, most requested first
+
+    Returns:
+        [default], or the n limits callers requested most for limit-paged sites
+    """
+    seen = _requested_limits.get(site) if site in _LIMIT_PAGED else None
+    if not seen:
+        return [default]
+    return [limit for limit, _ in seen.most_common(n)]
+
+
+async def cached_page(
+    scraper_module,
+    base_url: str,
+    page: int = 1,
+    limit: int = 20,
+    ttl_seconds: float = settings.CACHE_TTL_LIST,
+) -> Sequence[Mapping[str, Any]]:
+    """
+    Listing page through the shared page cache
+
+    Empty pages are not cached. Errors propagate, except that a stale
+    entry is served while still inside the stale-if-error window. Pages
+    that just failed (404, challenge, no cards, ...) fail fast from the
+    negative cache.
+
+    Args:
+        scraper_module: Scraper package (app.scrapers.<site>)
+        base_url: Listing/search URL
+        page: Page number
+        limit: Max items returned
+        ttl_seconds: Freshness of a newly loaded page
+
+    Returns:
+        Up to limit VideoCards from the cached page
+    """
+    site = site_name(scraper_module)
+    if site in _LIMIT_PAGED:
+        _requested_limits.setdefault(site, Counter())[limit] += 1
+    key = page_key(site, base_url, page, limit)
+    if negative_cache.check(key, base_url):
+        return ()
+    try:
+        items = await cache.get_or_set(
+            key,
+            _loader(scraper_module, base_url, page, limit),
+            ttl_seconds=ttl_seconds,
+            stale_ttl_seconds=settings.CACHE_STALE_TTL,
+            cache_if=bool,
+            tags=(site_name(scraper_module),),
+        )
+    except Exception as e:
+        negative_cache.remember_error(key, e)
+        raise
+    if not items:
+        negative_cache.remember(key, "empty")
+    return items[:limit]
+
+
+async def refresh_page(
+    scraper_module,
+    base_url: str,
+    page: int = 1,
+    limit: int = 20,
+    ttl_seconds: float = settings.CACHE_TTL_LIST,
+) -> int:
+    """
+    Reload a listing page into the cache even if it is still fresh
+
+    Returns:
+        Number of cards on the page
+    """
+    key = page_key(site_name(scraper_module), base_url, page, limit)
+    if negative_cache.check(key, base_url):
+        return 0
+    try:
+        items = await cache.refresh(
+            key,
+            _loader(scraper_module, base_url, page, limit),
+            ttl_seconds=ttl_seconds,
+            stale_ttl_seconds=settings.CACHE_STALE_TTL,
+            cache_if=bool,
+            tags=(site_name(scraper_module),),
+        )
+    except Exception as e:
+        negative_cache.remember_error(key, e)
+        raise
+    if not items:
+        negative_cache.remember(key, "empty")
+    return len(items)
+
+
+def _loader(scraper_module, base_url: str, page: int, limit: int):
+    fetch_limit = limit if site_name(scraper_module) in _LIMIT_PAGED else max(limit, PAGE_LIMIT)
+
+    async def load():
+        items = await scraper_module.list_videos(base_url=base_url, page=page, limit=fetch_limit)
+        return tuple(VideoCard(item) for item in items)
+
+    return load
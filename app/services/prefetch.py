@@ -0,0 +1,180 @@
+"""
+Next-Page Prefetch
+Loads page N+1 (and further) of a listing into the page cache after page N is served
+
+App users scroll /videos?page=N sequentially, so the next page is usually
+requested seconds later, and without prefetching it is a cold upstream fetch.
+After serving a full page, the prefetcher schedules the following pages of
+the same (site, base_url) in the background through the shared page cache.
+A user who gets there first joins the in-flight load.
+
+Depth adapts per site to the observed scroll-through rate: the share of
+served pages whose next page was also requested within PREFETCH_WINDOW.
+Pages are prefetched while rate**depth (the chance the user gets that
+far) stays at or above PREFETCH_MIN_PROBABILITY, up to PREFETCH_MAX_DEPTH,
+so sites whose users rarely page on get no prefetch at all.
+
+Prefetching is background traffic: every fetch spends the per-site
+background budget (core.budget) shared with the cache warmer, at most
+PREFETCH_CONCURRENCY fetches run at once, and jobs beyond that are dropped
+rather than queued. Pages that are still fresh, or that are remembered as
+failed by the negative cache, are not fetched again.
+
+Requests answered from the response cache never reach the route, so the
+response cache reports every /videos page it serves, hits included, and
+the scroll-through rate sees all traffic rather than only misses.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from time import monotonic
+
+from app.config.settings import settings
+from app.core.budget import background_budget
+from app.core.cache import cache
+from app.core.urls import canonical_url
+from app.services.listing import page_key, refresh_page
+from app.services.video_cache import site_name
+
+logger = logging.getLogger(__name__)
+
+# Listings whose recently served pages are remembered
+MAX_TRACKED = 10000
+# Served pages remembered per listing
+PAGES_PER_LISTING = 32
+# Per-site counters are halved past this many served pages, so the rate
+# follows recent behaviour
+RATE_WINDOW = 500
+# Starting estimate (followed, served) before a site has any history
+_PRIOR = (2.0, 4.0)
+
+
+class _SiteRate:
+    __slots__ = ("followed", "served")
+
+    def __init__(self):
+        self.followed, self.served = _PRIOR
+
+    @property
+    def rate(self) -> float:
+        return self.followed / self.served
+
+
+class PagePrefetcher:
+    """Adaptive next-page prefetch for paginated listings"""
+
+    def __init__(self):
+        # (site, canonical base_url, limit) -> {page: last served}
+        self._listings: OrderedDict[tuple, dict[int, float]] = OrderedDict()
+        self._rates: dict[str, _SiteRate] = {}
+        # Page keys loaded by the prefetcher and not requested yet
+        self._prefetched: OrderedDict[str, float] = OrderedDict()
+        self._pending: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = {"scheduled": 0, "prefetched": 0, "used": 0, "fresh": 0, "over_budget": 0, "busy": 0, "failed": 0}
+
+    def depth(self, site: str) -> int:
+        """Pages to prefetch ahead for a site at its current scroll-through rate"""
+        rate = self._rate(site).rate
+        depth = 0
+        while depth < settings.PREFETCH_MAX_DEPTH and rate ** (depth + 1) >= settings.PREFETCH_MIN_PROBABILITY:
+            depth += 1
+        return depth
+
+    def _rate(self, site: str) -> _SiteRate:
+        found = self._rates.get(site)
+        if found is None:
+            found = self._rates[site] = _SiteRate()
+        return found
+
+    def _record(self, site: str, base_url: str, page: int, limit: int):
+        """Update the scroll-through estimate with one served page"""
+        now = monotonic()
+        listing = (site, canonical_url(base_url), limit)
+        pages = self._listings.pop(listing, None) or {}
+        self._listings[listing] = pages
+        while len(self._listings) > MAX_TRACKED:
+            self._listings.popitem(last=False)
+
+        rate = self._rate(site)
+        previous = pages.get(page - 1)
+        if previous is not None and now - previous <= settings.PREFETCH_WINDOW:
+            rate.followed += 1
+        rate.served += 1
+        if rate.served > RATE_WINDOW:
+            rate.followed /= 2
+            rate.served /= 2
+
+        pages[page] = now
+        if len(pages) > PAGES_PER_LISTING:
+            del pages[min(pages, key=pages.get)]
+
+        key = page_key(site, base_url, page, limit)
+        if self._prefetched.pop(key, None) is not None:
+            self._stats["used"] += 1
+
+    def observe(self, scraper_module, base_url: str, page: int, limit: int, served: int):
+        """
+        Note that a listing page was served, and prefetch what follows it
+
+        Args:
+            scraper_module: Scraper package (app.scrapers.<site>)
+            base_url: Listing URL as requested
+            page: Page number served
+            limit: Page size requested
+            served: Items returned; a short page is the last one
+        """
+        site = site_name(scraper_module)
+        self._record(site, base_url, page, limit)
+        if served < limit:
+            return
+        for ahead in range(1, self.depth(site) + 1):
+            self._schedule(scraper_module, site, base_url, page + ahead, limit)
+
+    def _schedule(self, scraper_module, site: str, base_url: str, page: int, limit: int):
+        key = page_key(site, base_url, page, limit)
+        if key in self._pending:
+            return
+        remaining = cache.ttl_remaining(key)
+        if remaining is not None and remaining > settings.CACHE_TTL_LIST / 2:
+            self._stats["fresh"] += 1
+            return
+        if len(self._pending) >= settings.PREFETCH_CONCURRENCY:
+            self._stats["busy"] += 1
+            return
+        if not background_budget.try_acquire(site):
+            self._stats["over_budget"] += 1
+            return
+        self._stats["scheduled"] += 1
+        self._pending.add(key)
+        task = asyncio.create_task(self._fetch(scraper_module, key, base_url, page, limit))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, scraper_module, key: str, base_url: str, page: int, limit: int):
+        try:
+            if await refresh_page(scraper_module, base_url, page, limit):
+                self._stats["prefetched"] += 1
+                self._prefetched[key] = monotonic()
+                while len(self._prefetched) > MAX_TRACKED:
+                    self._prefetched.popitem(last=False)
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.debug("Prefetching %s page %s failed: %s", base_url, page, e)
+        finally:
+            self._pending.discard(key)
+
+    def get_stats(self) -> dict:
+        """Get prefetch statistics"""
+        return {
+            **self._stats,
+            "in_flight": len(self._pending),
+            "sites": {
+                site: {"scroll_through": round(rate.rate, 3), "depth": self.depth(site)}
+                for site, rate in self._rates.items()
+            },
+        }
+
+
+prefetcher = PagePrefetcher()
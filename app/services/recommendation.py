@@ -8,6 +8,7 @@ Handles video recommendations using hybrid approach:
 
 from typing import List, Dict, Any, Optional
 import random
+from app.core.frozen import overlay
 from app.services.global_search import global_trending
 
 class RecommendationEngine:
@@ -40,8 +41,7 @@ class RecommendationEngine:
         for vid in source_related:
             if vid["url"] not in seen_urls:
                 # Add 'source_score' to indicate high relevance
-                vid["score"] = 1.0 
-                recommendations.append(vid)
+                recommendations.append(overlay(vid, score=1.0))
                 seen_urls.add(vid["url"])
                 
         # If we have enough, return early (Zero-Cost Optimization)
@@ -86,8 +86,7 @@ class RecommendationEngine:
                     if category and res.get("category") == category:
                         score += 0.2
                         
-                    res["score"] = score
-                    scored_results.append(res)
+                    scored_results.append(overlay(res, score=score))
                     seen_urls.add(res["url"])
                 
                 # Sort by score descending
@@ -0,0 +1,148 @@
+"""
+Video Info Cache
+Caches scrape results under a canonical (site, video_id) identity
+
+Different URL spellings of the same video (slug changes, tracking params,
+mobile hosts) share one entry. Entries never outlive their stream URLs:
+the TTL is the earliest expiry embedded in the signed CDN URLs (validto=,
+expires=, e=, ...) minus a safety margin.
+"""
+
+import re
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from app.config.settings import settings
+from app.core.cache import cache
+from app.core.frozen import overlay
+from app.core.negative import negative_cache
+from app.core.urls import canonical_url
+from app.scrapers.profiles import ALL_FIELDS, resolve_include
+
+# Video id patterns per site (first group is the id)
+_ID_PATTERNS: dict[str, re.Pattern[str]] = {
+    "xnxx": re.compile(r"/video-([a-z0-9]+)", re.IGNORECASE),
+    "xvideos": re.compile(r"/video\.?([a-z0-9]+)(?:/|$)", re.IGNORECASE),
+    "xhamster": re.compile(r"/videos/(?:[^/?#]*-)?([a-z0-9]+)(?:[/?#]|$)", re.IGNORECASE),
+    "pornhub": re.compile(r"[?&]viewkey=([a-z0-9]+)", re.IGNORECASE),
+    "youporn": re.compile(r"/watch/(\d+)"),
+    "redtube": re.compile(r"^/(\d+)(?:[/?#]|$)"),
+    "spankbang": re.compile(r"^/([a-z0-9]+)/(?:video|play|embed)/", re.IGNORECASE),
+    "beeg": re.compile(r"(\d{6,})"),
+}
+
+# Expiry timestamps in signed CDN URLs (query params or path/token segments)
+_EXPIRY_RE = re.compile(r"(?:^|[?&/,;_])(?:validto|expires|expire|exp|e)=(\d{10})(?!\d)", re.IGNORECASE)
+
+
+def site_name(scraper_module) -> str:
+    """Short site name of a scraper package (app.scrapers.xnxx -> xnxx)"""
+    return scraper_module.__name__.split(".")[-1]
+
+
+def video_identity(site: str, url: str) -> str:
+    """
+    Canonical id of a video page URL
+
+    Args:
+        site: Site name
+        url: Video page URL
+
+    Returns:
+        The site's video id, or the path of the canonical URL when the URL
+        doesn't match the site's id pattern. Case is kept: ids and paths
+        are case-sensitive on several sites (only the host isn't)
+    """
+    parsed = urlparse(url)
+    pattern = _ID_PATTERNS.get(site)
+    if pattern is not None:
+        target = f"{parsed.path}?{parsed.query}" if site == "pornhub" else parsed.path
+        m = pattern.search(target)
+        if m:
+            vid = m.group(1)
+            if site == "beeg":
+                # beeg.com/-0123456 and beeg.com/123456 are the same video
+                vid = vid.lstrip("0") or "0"
+            return vid
+    return urlparse(canonical_url(url)).path or "/"
+
+
+def stream_expiry(video: Optional[dict[str, Any]]) -> Optional[float]:
+    """
+    Earliest expiry (epoch seconds) embedded in a video block's stream URLs
+
+    Returns:
+        Epoch seconds, or None if no URL carries an expiry
+    """
+    if not video:
+        return None
+    urls = [s.get("url") for s in video.get("streams") or []]
+    urls += [video.get("default"), video.get("hls")]
+    expiries = [
+        int(m.group(1))
+        for u in urls if isinstance(u, str)
+        for m in _EXPIRY_RE.finditer(u)
+    ]
+    return min(expiries) if expiries else None
+
+
+def info_ttl(result: dict[str, Any]) -> float:
+    """
+    Cache TTL for a scrape result
+
+    Signed stream URLs bound the TTL (expiry minus CACHE_INFO_EXPIRY_MARGIN,
+    at most CACHE_TTL_SCRAPE). Streams without a visible expiry get the
+    short CACHE_TTL_INFO; metadata-only results get CACHE_TTL_SCRAPE.
+    """
+    video = result.get("video") or {}
+    expiry = stream_expiry(video)
+    if expiry is not None:
+        ttl = expiry - time.time() - settings.CACHE_INFO_EXPIRY_MARGIN
+        return min(ttl, settings.CACHE_TTL_SCRAPE)
+    if video.get("streams"):
+        return settings.CACHE_TTL_INFO
+    return settings.CACHE_TTL_SCRAPE
+
+
+async def cached_scrape(scraper_module, url: str, include=None) -> dict[str, Any]:
+    """
+    scraper_module.scrape(url, include) through the video info cache
+
+    A cached full-profile result also serves narrower include= requests.
+
+    Args:
+        scraper_module: Scraper package handling the URL
+        url: Video page URL
+        include: Scrape profile(s) or fields (see app.scrapers.profiles)
+
+    Returns:
+        Scrape result dict (shared with the cache, do not mutate)
+    """
+    fields = resolve_include(include)
+    site = site_name(scraper_module)
+    key = f"video:{site}:{video_identity(site, url)}"
+
+    result = None
+    if fields != ALL_FIELDS:
+        result = cache.get_nowait(key)
+        if result is None:
+            key = f"{key}:{','.join(sorted(fields))}"
+    if result is None:
+        # Removed/blocked videos fail fast for a while instead of re-scraping
+        negative_cache.check(key, url)
+        try:
+            result = await cache.get_or_set(
+                key,
+                lambda: scraper_module.scrape(url, fields),
+                ttl_seconds=info_ttl,
+                tags=(site,),
+            )
+        except Exception as e:
+            negative_cache.remember_error(key, e)
+            raise
+
+    if isinstance(result, dict) and result.get("url") not in (None, url):
+        # Same video reached through another URL spelling
+        result = overlay(result, url=url)
+    return result
@@ -10,13 +10,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-async def get_video_info(url: str, api_base_url: str = "http://localhost:8000") -> dict:
+async def get_video_info(url: str, api_base_url: str = "http://localhost:8000", include: Optional[str] = None) -> dict:
     """
     Get video streaming information for a given URL
     
     Args:
         url: Video page URL (e.g., https://xnxx.com/video-123)
         api_base_url: Base URL of the API for proxy links (e.g., https://my-api.com)
+        include: Scrape profile(s) or field names (see app.scrapers.profiles).
+            Only the requested fields are extracted and returned.
         
     Returns:
         {
@@ -25,8 +27,14 @@ async def get_video_info(url: str, api_base_url: str = "http://localhost:8000")
     """
     # Import here to avoid circular dependency
     from app.scrapers import xnxx, xhamster, xvideos, masa49, pornhub, youporn, redtube, beeg, spankbang, fapnut
+    from app.scrapers.profiles import ALL_FIELDS, resolve_include
     from urllib.parse import urlparse
     
+    try:
+        fields = resolve_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     # Parse URL to get host
     parsed = urlparse(url)
     host = parsed.netloc
@@ -61,9 +69,12 @@ async def get_video_info(url: str, api_base_url: str = "http://localhost:8000")
             detail=f"Unsupported host: {host}. Supported: xnxx, xhamster, xvideos, masa49, pornhub, youporn, redtube, beeg, spankbang, fapnut"
         )
     
+    from app.services.video_cache import cached_scrape
+    
     try:
-        # Scrape the page (now includes video URLs)
-        metadata = await scraper_module.scrape(url)
+        # Scrape the page (now includes video URLs), cached per video until
+        # just before its signed stream URLs expire
+        metadata = await cached_scrape(scraper_module, url, fields)
     except Exception as e:
         logger.error(f"Failed to scrape video info: {e}")
         raise HTTPException(
@@ -71,9 +82,12 @@ async def get_video_info(url: str, api_base_url: str = "http://localhost:8000")
             detail=f"Failed to extract video info: {str(e)}"
         )
     
-    # Check if video URLs were extracted
-    video_data = metadata.get("video", {})
-    if not video_data.get("has_video"):
+    # Check if video URLs were extracted. Copy before proxy-wrapping below,
+    # the scrape result is the read-only cached value.
+    video_data = dict(metadata.get("video") or {})
+    if video_data.get("streams"):
+        video_data["streams"] = [dict(s) for s in video_data["streams"]]
+    if "video" in fields and not video_data.get("has_video"):
         raise HTTPException(
             status_code=404,
             detail="No video streams found for this URL. Video may be premium or removed."
@@ -147,6 +161,10 @@ async def get_video_info(url: str, api_base_url: str = "http://localhost:8000")
             "playable": True,
         }
     
+    if fields != ALL_FIELDS:
+        # Partial profile: drop what wasn't extracted rather than return empty stubs
+        response = {k: v for k, v in response.items() if k in fields or k in ("url", "playable")}
+    
     return response
 
 
@@ -166,7 +184,7 @@ async def get_stream_url(url: str, quality: str = "default", api_base_url: str =
     # But usually this is called by endpoint which calls get_video_info first.
     # Refactoring: we'll just call get_video_info here too.
     # Using default localhost for this low-level helper as it returns raw data
-    info = await get_video_info(url, api_base_url=api_base_url) 
+    info = await get_video_info(url, api_base_url=api_base_url, include="streams")
     video_data = info["video"]
     
     if quality == "default":
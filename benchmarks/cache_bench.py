@@ -0,0 +1,241 @@
+"""
+Cache microbenchmarks
+
+Run from the repository root:
+
+    python -m benchmarks.cache_bench [fast|policy|canon|cards ...] [--trace FILE]
+
+fast:   compares app.core.cache.SimpleCache against the previous
+        implementation (global asyncio.Lock, datetime.utcnow() timestamps,
+        dict-per-entry), kept here as LegacyCache so the numbers stay
+        reproducible.
+policy: replays a key trace against LRU and W-TinyLFU at equal capacity
+        and reports hit rates. FILE holds one cache key per line (e.g.
+        grepped from debug logs); without it a synthetic trace is used.
+canon:  replays a trace of upstream URLs as clients spell them (scheme,
+        www., trailing slash, tracking params, param order, beeg -0{id})
+        keyed raw vs through app.core.urls.canonical_url and reports both
+        hit rates.
+cards:  memory per cached listing item, frozen dicts vs VideoCard records,
+        over many pages parsed separately (so strings are not shared
+        unless interned).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from app.core.cache import SimpleCache, estimate_size
+from app.core.frozen import freeze
+from app.core.urls import canonical_url
+from app.services.listing import VideoCard
+
+N_KEYS = 10_000
+N_OPS = 200_000
+
+
+class LegacyCache:
+    """SimpleCache as it was before the monotonic/lock-free rework"""
+
+    def __init__(self, max_size: int = 10000):
+        self.cache = OrderedDict()
+        self.max_size = max_size
+        self._lock = asyncio.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    async def set(self, key: str, value: Any, ttl_seconds: int = 3600):
+        async with self._lock:
+            if len(self.cache) >= self.max_size and key not in self.cache:
+                self.cache.popitem(last=False)
+            self.cache[key] = {
+                "value": value,
+                "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds),
+                "created_at": datetime.utcnow(),
+            }
+            self.cache.move_to_end(key)
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            if key not in self.cache:
+                self._misses += 1
+                return None
+            item = self.cache[key]
+            if datetime.utcnow() > item["expires_at"]:
+                del self.cache[key]
+                self._misses += 1
+                return None
+            self.cache.move_to_end(key)
+            self._hits += 1
+            return item["value"]
+
+
+async def _bench(cache, label: str) -> dict[str, float]:
+    keys = [f"list:https://example.com/c/{i}:p1:l20" for i in range(N_KEYS)]
+    value = [{"url": "https://example.com/v/1", "title": "x"}] * 20
+
+    start = time.perf_counter()
+    for i in range(N_OPS):
+        await cache.set(keys[i % N_KEYS], value, 900)
+    set_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(N_OPS):
+        await cache.get(keys[i % N_KEYS])
+    hit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(N_OPS):
+        await cache.get("missing")
+    miss_s = time.perf_counter() - start
+
+    result = {
+        "set": N_OPS / set_s,
+        "get_hit": N_OPS / hit_s,
+        "get_miss": N_OPS / miss_s,
+    }
+    print(f"{label:<12}" + "".join(f"{k:>10}: {v / 1000:8.0f}k ops/s" for k, v in result.items()))
+    return result
+
+
+async def bench_fast_path() -> None:
+    """Legacy vs current SimpleCache get/set throughput"""
+    print(f"{N_OPS} ops over {N_KEYS} keys")
+    legacy = await _bench(LegacyCache(max_size=N_KEYS * 2), "legacy")
+    current = await _bench(SimpleCache(max_size=N_KEYS * 2), "current")
+    print("speedup     " + "".join(f"{k:>10}: {current[k] / legacy[k]:8.2f}x       " for k in current))
+
+
+def synthetic_trace(n: int = 200_000, seed: int = 7) -> list[str]:
+    """
+    Popular pages with a Zipf-like tail, interleaved with one-off lookups
+
+    Mirrors production traffic: category/trending/search pages are
+    requested over and over, while most /videos/info URLs are seen once.
+    """
+    rng = random.Random(seed)
+    popular = [f"list:https://site{i % 10}.com/c/{i}:p1:l20" for i in range(5_000)]
+    weights = [1 / (rank + 1) for rank in range(len(popular))]
+    hot = rng.choices(popular, weights=weights, k=n)
+    trace = []
+    for i in range(n):
+        if rng.random() < 0.4:
+            trace.append(f"info:https://site{i % 10}.com/v/{i}")
+        else:
+            trace.append(hot[i])
+    return trace
+
+
+def replay(trace: list[str], policy: str, capacity: int) -> float:
+    """Hit rate (%) of a cache-aside replay of trace"""
+    cache = SimpleCache(max_size=capacity, policy=policy)
+    for key in trace:
+        if cache.get_nowait(key) is None:
+            cache.set_nowait(key, 1)
+    return cache.get_stats()["hit_rate_percent"]
+
+
+def bench_policies(trace: list[str]) -> None:
+    """LRU vs W-TinyLFU hit rate at a few cache sizes"""
+    print(f"{len(trace)} requests, {len(set(trace))} distinct keys")
+    for capacity in (250, 1_000, 4_000):
+        lru = replay(trace, "lru", capacity)
+        tinylfu = replay(trace, "tinylfu", capacity)
+        print(f"capacity {capacity:>6}:  lru {lru:6.2f}%   tinylfu {tinylfu:6.2f}%")
+
+
+def url_trace(n: int = 100_000, seed: int = 11) -> list[str]:
+    """Popular pages requested under the spellings real clients send"""
+    rng = random.Random(seed)
+    pages = [f"xvideos.com/c/{i}" for i in range(300)]
+    pages += [f"beeg.com/-0{1_000_000 + i}" for i in range(200)]
+    pages += [f"xhamster.com/search/q{i}?sort=new&page=1" for i in range(300)]
+    weights = [1 / (rank + 1) for rank in range(len(pages))]
+
+    def spell(page: str) -> str:
+        url = rng.choice(("https://", "http://")) + rng.choice(("www.", "")) + page
+        if "?" in url and rng.random() < 0.5:
+            base, query = url.split("?", 1)
+            url = base + "?" + "&".join(reversed(query.split("&")))
+        if rng.random() < 0.3:
+            url += "/" if "?" not in url else ""
+        if rng.random() < 0.2:
+            url += ("&" if "?" in url else "?") + f"utm_source=s{rng.randrange(5)}"
+        return url
+
+    return [spell(page) for page in rng.choices(pages, weights=weights, k=n)]
+
+
+def bench_canonical(urls: list[str], capacity: int = 1_000) -> None:
+    """Hit rate with raw vs canonical URL keys"""
+    raw = [f"list:{url}:p1:l20" for url in urls]
+    canonical = [f"list:{canonical_url(url)}:p1:l20" for url in urls]
+    print(f"{len(urls)} requests, {len(set(raw))} raw keys, {len(set(canonical))} canonical keys")
+    print(f"capacity {capacity:>6}:  raw {replay(raw, 'tinylfu', capacity):6.2f}%   "
+          f"canonical {replay(canonical, 'tinylfu', capacity):6.2f}%")
+
+
+def parsed_pages(n_pages: int = 200, per_page: int = 40, seed: int = 3) -> list[list[dict]]:
+    """Listing pages as scrapers return them: fresh strings for every field"""
+    rng = random.Random(seed)
+    uploaders = [f"uploader{i}" for i in range(50)]
+    tags = [f"tag{i}" for i in range(40)]
+    pages = []
+    for p in range(n_pages):
+        page = []
+        for i in range(per_page):
+            n = p * per_page + i
+            # join() copies, like a parser producing a new string per card
+            uploader = "".join(rng.choice(uploaders))
+            page.append({
+                "url": f"https://www.example.com/video-{n:x}/some_title_{n}",
+                "title": f"Some video title number {n}",
+                "thumbnail_url": f"https://img.example.com/thumbs/{n % 97}/{n}.jpg",
+                "duration": f"{rng.randrange(1, 40)}:{rng.randrange(60):02d}",
+                "views": f"{rng.randrange(1, 999)}K",
+                "uploader_name": uploader,
+                "uploader_avatar_url": f"https://img.example.com/avatars/{uploader}.jpg",
+                "category": "".join(rng.choice(("amateur", "hd", "popular"))),
+                "tags": ["".join(t) for t in rng.sample(tags, 5)],
+            })
+        pages.append(page)
+    return pages
+
+
+def bench_cards() -> None:
+    """Bytes per cached listing item, frozen dicts vs VideoCards"""
+    pages = parsed_pages()
+    n_items = sum(len(page) for page in pages)
+    as_dicts = estimate_size([freeze(page) for page in pages]) / n_items
+    as_cards = estimate_size([tuple(VideoCard(item) for item in page) for page in pages]) / n_items
+    print(f"{n_items} items over {len(pages)} pages")
+    print(f"frozen dict {as_dicts:8.0f} B/item   VideoCard {as_cards:8.0f} B/item   ({as_cards / as_dicts:.0%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benches", nargs="*", default=["fast", "policy", "canon", "cards"])
+    parser.add_argument("--trace", help="File with one cache key per line")
+    args = parser.parse_args()
+
+    if "fast" in args.benches:
+        asyncio.run(bench_fast_path())
+    if "policy" in args.benches:
+        if args.trace:
+            with open(args.trace) as f:
+                trace = [line.strip() for line in f if line.strip()]
+        else:
+            trace = synthetic_trace()
+        bench_policies(trace)
+    if "canon" in args.benches:
+        bench_canonical(url_trace())
+    if "cards" in args.benches:
+        bench_cards()
+
+
+if __name__ == "__main__":
+    main()
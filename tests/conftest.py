@@ -0,0 +1,9 @@
+import pytest
+
+from app.config.settings import settings
+
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    """A private cache signing key, as a real deployment would set"""
+    monkeypatch.setattr(settings, "CACHE_SIGNING_KEY", "test-only-private-signing-key")
@@ -0,0 +1,51 @@
+import asyncio
+
+from app.core.cache import SimpleCache
+
+
+def test_waiters_survive_cancelled_leader():
+    async def main():
+        cache = SimpleCache(max_size=16)
+        calls = 0
+        started = asyncio.Event()
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return calls
+
+        leader = asyncio.create_task(cache.get_or_set("k", factory, 60))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_set("k", factory, 60))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == 2
+        assert leader.cancelled()
+        assert calls == 2
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_leaves_load_running():
+    async def main():
+        cache = SimpleCache(max_size=16)
+        started = asyncio.Event()
+
+        async def factory():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "v"
+
+        leader = asyncio.create_task(cache.get_or_set("k", factory, 60))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_set("k", factory, 60))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        assert await leader == "v"
+        assert waiter.cancelled()
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import asyncio
+
+from app.core.cache import SimpleCache
+from app.core.redis_cache import dumps, loads
+
+
+class _MemoryTier:
+    """Dict-backed lower tier storing the same encoded records as Redis"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        data = self.data.get(key)
+        return loads(data) if data is not None else None
+
+    async def get_many(self, keys):
+        return {k: v for k in keys if (v := await self.get(k)) is not None}
+
+    async def set_many(self, entries):
+        for key, value, stale_at, hard_at, ttl_seconds, tags in entries:
+            self.data[key] = dumps(value, stale_at, hard_at, tags)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def close(self):
+        pass
+
+    def get_stats(self):
+        return {}
+
+
+def test_tags_survive_l2(signing_key):
+    async def main():
+        tier = _MemoryTier()
+        writer = SimpleCache(max_size=16, l2=tier)
+        await writer.set("page:xnxx:a", (1, 2), 60, tags=("xnxx",))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        reader = SimpleCache(max_size=16, l2=tier)
+        await reader.preload(["page:xnxx:a"])
+        assert await reader.invalidate(tag="xnxx") == 1
+
+    asyncio.run(main())
+
+
+def test_tags_survive_snapshot(tmp_path):
+    async def main():
+        path = str(tmp_path / "snap")
+        source = SimpleCache(max_size=16)
+        await source.set("page:beeg:a", "v", 60, tags=("beeg",))
+        assert await source.snapshot(path) == 1
+
+        restored = SimpleCache(max_size=16)
+        assert restored.restore(path) == 1
+        assert await restored.invalidate(tag="beeg") == 1
+
+    asyncio.run(main())
+
+
+def test_clear_resets_namespace_stats():
+    async def main():
+        cache = SimpleCache(max_size=16)
+        await cache.get("page:missing")
+        assert cache.namespace_stats()["page"]["misses"] == 1
+        await cache.clear()
+        assert cache.namespace_stats() == {}
+
+    asyncio.run(main())
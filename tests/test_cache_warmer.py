@@ -0,0 +1,21 @@
+import asyncio
+
+from app.scrapers import beeg
+from app.services import cache_warmer
+from app.services.global_search import TRENDING_URLS, global_trending
+from app.services.listing import page_key
+
+
+def test_beeg_is_warmed_at_the_limit_trending_reads(monkeypatch):
+    async def fake_list(base_url, page=1, limit=20):
+        return [{"url": f"https://beeg.com/{i:07d}", "title": str(i)} for i in range(limit)]
+
+    monkeypatch.setattr(beeg, "list_videos", fake_list)
+
+    async def main():
+        await global_trending(sites=["beeg"], limit_per_site=10)
+        jobs = await cache_warmer.build_jobs()
+        warmed = {page_key(site, url, page, limit) for site, url, page, limit, _ in jobs}
+        assert page_key("beeg", TRENDING_URLS["beeg"], 1, 10) in warmed
+
+    asyncio.run(main())
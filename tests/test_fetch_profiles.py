@@ -0,0 +1,109 @@
+"""Light (mobile) listing profiles: same cards as desktop, per-URL fallback"""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.scrapers import fetch_profiles
+from app.scrapers.pornhub import scraper as pornhub
+from app.scrapers.xhamster import scraper as xhamster
+from app.scrapers.xvideos import scraper as xvideos
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(autouse=True)
+def fresh_light_state(monkeypatch):
+    monkeypatch.setattr(fetch_profiles, "_light_state", {})
+
+
+@pytest.mark.parametrize(
+    "module, site, base_url",
+    [
+        (xhamster, "xhamster", "https://xhamster.com/"),
+        (pornhub, "pornhub", "https://www.pornhub.com/video"),
+        (xvideos, "xvideos", "https://www.xvideos.com/"),
+    ],
+)
+def test_mobile_listing_matches_desktop(monkeypatch, module, site, base_url):
+    pages = {profile: _fixture(f"{site}/listing_{profile}.html") for profile in ("mobile", "desktop")}
+    fetched: list[str] = []
+
+    async def fetch_html(url, profile="desktop"):
+        fetched.append(profile)
+        return pages[profile]
+
+    monkeypatch.setattr(module, "fetch_html", fetch_html)
+    mobile = asyncio.run(module.list_videos(base_url, 1, 20))
+    desktop = asyncio.run(module.list_videos(base_url, 1, 20, profile="desktop"))
+
+    assert len(desktop) == 3
+    assert mobile == desktop
+    assert fetched == ["mobile", "desktop"]
+    assert len(pages["mobile"]) < len(pages["desktop"])
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.invalid/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def _run(candidates, pages):
+    """fetch_listing over fake pages: {(url, profile): html or exception}"""
+    calls = []
+
+    async def fetch_html(url, profile):
+        calls.append((url, profile))
+        page = pages.get((url, profile), "")
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def parse(html, url):
+        return [{"url": f"{url}#{html}"}] if html.startswith("cards") else []
+
+    items = asyncio.run(fetch_profiles.fetch_listing("site", candidates, fetch_html, parse, parse))
+    return items, calls
+
+
+def test_empty_light_page_refetches_only_that_url():
+    items, calls = _run(["a", "b", "c"], {("a", "mobile"): "no cards here", ("a", "desktop"): "cards"})
+
+    assert items == [{"url": "a#cards"}]
+    assert calls == [("a", "mobile"), ("a", "desktop")]
+
+
+def test_missing_url_is_not_refetched_with_desktop():
+    items, calls = _run(["a", "b"], {("a", "mobile"): _status_error(404), ("b", "mobile"): "cards"})
+
+    assert items == [{"url": "b#cards"}]
+    assert calls == [("a", "mobile"), ("b", "mobile")]
+
+
+def test_failing_light_fetch_falls_back_for_that_url():
+    items, calls = _run(["a", "b"], {("a", "mobile"): _status_error(403), ("a", "desktop"): "cards"})
+
+    assert items == [{"url": "a#cards"}]
+    assert calls == [("a", "mobile"), ("a", "desktop")]
+
+
+def test_site_goes_desktop_only_after_repeated_light_misses():
+    pages = {("a", "mobile"): "no cards", ("a", "desktop"): "cards"}
+    for _ in range(fetch_profiles.LIGHT_MISS_LIMIT):
+        _run(["a"], pages)
+
+    items, calls = _run(["a"], pages)
+
+    assert items == [{"url": "a#cards"}]
+    assert calls == [("a", "desktop")]
+
+
+def test_no_candidate_fetched_raises_last_error():
+    with pytest.raises(httpx.HTTPStatusError):
+        _run(["a"], {("a", "mobile"): _status_error(404)})
@@ -0,0 +1,44 @@
+import asyncio
+
+from app.scrapers import redtube, xnxx
+from app.services.global_search import global_search, global_trending
+
+
+def _cards(site, n):
+    return [{"url": f"https://{site}.example/v/{i}", "title": f"{site} {i}"} for i in range(n)]
+
+
+def test_global_search_reads_frozen_cached_pages(monkeypatch):
+    async def fake_xnxx(base_url, page=1, limit=20):
+        return _cards("xnxx", 3)
+
+    async def fake_redtube(base_url, page=1, limit=20):
+        return _cards("redtube", 2)
+
+    monkeypatch.setattr(xnxx, "list_videos", fake_xnxx)
+    monkeypatch.setattr(redtube, "list_videos", fake_redtube)
+
+    async def main():
+        # Second call is served from the page cache (frozen tuples)
+        for _ in range(2):
+            result = await global_search("frozen-regression", sites=["xnxx", "redtube"])
+            assert result["sites_searched"] == 2
+            assert result["total_results"] == 5
+            assert {r["source_site"] for r in result["results"]} == {"xnxx", "redtube"}
+
+    asyncio.run(main())
+
+
+def test_global_trending_reads_frozen_cached_pages(monkeypatch):
+    async def fake_xnxx(base_url, page=1, limit=20):
+        return _cards("xnxx", 4)
+
+    monkeypatch.setattr(xnxx, "list_videos", fake_xnxx)
+
+    async def main():
+        for _ in range(2):
+            result = await global_trending(sites=["xnxx"], limit_per_site=10)
+            assert result["sites"] == 1
+            assert result["total_results"] == 4
+
+    asyncio.run(main())
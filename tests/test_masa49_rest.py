@@ -0,0 +1,156 @@
+"""masa49: the wp-json path must produce what the themed HTML path does"""
+
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.scrapers.masa49 import scraper
+
+FIXTURES = Path(__file__).parent / "fixtures" / "masa49"
+LISTING_URL = "https://masa49.org/"
+VIDEO_URL = "https://masa49.org/bhabhis-night/"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+class _FixedNow(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2026, 10, 19, 12, 0, 0, tzinfo=tz)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Serve fixtures instead of the network; records every URL fetched"""
+    fetched: list[str] = []
+    responses: dict[str, str] = {}
+
+    async def fetch_html(url):
+        fetched.append(url)
+        return _fixture(responses["html"])
+
+    async def fetch_json(url):
+        fetched.append(url)
+        for marker, name in responses.items():
+            if marker != "html" and marker in url:
+                return json.loads(_fixture(name))
+        raise AssertionError(f"unexpected REST call {url}")
+
+    monkeypatch.setattr(scraper, "fetch_html", fetch_html)
+    monkeypatch.setattr(scraper, "fetch_json", fetch_json)
+    monkeypatch.setattr(scraper, "datetime", _FixedNow)
+    monkeypatch.setattr(scraper.settings, "MASA49_WP_REST", True)
+    monkeypatch.setattr(scraper, "_rest_off_until", {})
+    return responses, fetched
+
+
+def test_rest_listing_matches_html(upstream):
+    responses, fetched = upstream
+    responses.update({"html": "listing.html", "/posts?": "posts.json"})
+
+    html_items = asyncio.run(scraper._list_videos_html(LISTING_URL, 1, 20))
+    rest_items = asyncio.run(scraper.list_videos(LISTING_URL, 1, 20))
+
+    assert len(html_items) == 3
+    assert rest_items == html_items
+    assert ["wp-json" in url for url in fetched] == [False, True]
+
+
+def test_rest_listing_honours_limit(upstream):
+    responses, _ = upstream
+    responses.update({"html": "listing.html", "/posts?": "posts.json"})
+
+    assert len(asyncio.run(scraper.list_videos(LISTING_URL, 1, 2))) == 2
+
+
+def test_rest_listing_without_duration_or_views_falls_back_to_html(upstream):
+    responses, fetched = upstream
+    responses.update({"html": "listing.html", "/posts?": "posts_no_meta.json"})
+
+    items = asyncio.run(scraper.list_videos(LISTING_URL, 1, 20))
+
+    assert items == asyncio.run(scraper._list_videos_html(LISTING_URL, 1, 20))
+    assert items[0]["duration"] == "12:34" and items[0]["views"] == "1.8k"
+    assert "wp-json" in fetched[0] and fetched[1] == LISTING_URL
+
+    # Given up on: the next listing goes straight to HTML
+    fetched.clear()
+    asyncio.run(scraper.list_videos(LISTING_URL, 2, 20))
+    assert fetched and not any("wp-json" in url for url in fetched)
+
+
+def test_rest_scrape_matches_html(upstream):
+    responses, fetched = upstream
+    responses.update({"html": "video.html", "/posts?slug=": "post.json"})
+    include = "metadata,video"
+
+    html_data = scraper.parse_page(_fixture("video.html"), VIDEO_URL, include)
+    rest_data = asyncio.run(scraper.scrape(VIDEO_URL, include))
+
+    assert html_data["video"]["has_video"]
+    assert rest_data == html_data
+    assert all("wp-json" in url for url in fetched)
+
+
+def test_rest_scrape_streams_profile_matches_html(upstream):
+    responses, fetched = upstream
+    responses.update({"html": "video.html", "/posts?slug=": "post.json"})
+
+    html_data = scraper.parse_page(_fixture("video.html"), VIDEO_URL, "streams")
+    assert asyncio.run(scraper.scrape(VIDEO_URL, "streams")) == html_data
+    assert all("wp-json" in url for url in fetched)
+
+
+def test_rest_scrape_without_duration_falls_back_to_html(upstream, monkeypatch):
+    responses, fetched = upstream
+    responses["html"] = "video.html"
+
+    async def fetch_json(url):
+        fetched.append(url)
+        posts = json.loads(_fixture("post.json"))
+        posts[0]["meta"] = {}
+        return posts
+
+    monkeypatch.setattr(scraper, "fetch_json", fetch_json)
+    data = asyncio.run(scraper.scrape(VIDEO_URL, "metadata"))
+
+    assert data["duration"] == "12:34" and data["views"] == "1834"
+    assert fetched[-1] == VIDEO_URL
+
+    fetched.clear()
+    asyncio.run(scraper.scrape(VIDEO_URL, "metadata"))
+    assert fetched == [VIDEO_URL]
+
+
+def test_full_profile_scrape_skips_rest(upstream):
+    responses, fetched = upstream
+    responses["html"] = "video.html"
+
+    asyncio.run(scraper.scrape(VIDEO_URL))
+
+    assert fetched == [VIDEO_URL]
+
+
+def test_term_lookups_are_cached(upstream, monkeypatch):
+    _, fetched = upstream
+    monkeypatch.setattr(scraper, "_wp_term_ids", scraper.SimpleCache(max_size=8, policy="lru"))
+
+    async def fetch_json(url):
+        fetched.append(url)
+        if "/categories?slug=" in url:
+            return [{"id": 3}]
+        return json.loads(_fixture("posts.json"))
+
+    monkeypatch.setattr(scraper, "fetch_json", fetch_json)
+    url = "https://masa49.org/category/desi/"
+    for page in (1, 2, 3):
+        asyncio.run(scraper.list_videos(url, page, 20))
+
+    lookups = [u for u in fetched if "/categories?slug=" in u]
+    assert len(lookups) == 1
+    assert all("categories=3" in u for u in fetched if "/posts?" in u)
@@ -0,0 +1,31 @@
+import pickle
+
+from app.config.settings import settings
+from app.core.redis_cache import _FORMAT_VERSION, _HEADER, dumps, loads, signing_key_configured
+
+
+def test_round_trip(signing_key):
+    data = dumps({"a": (1, 2)}, 10.0, 20.0, ("xnxx",))
+    assert loads(data) == ({"a": (1, 2)}, 10.0, 20.0, ("xnxx",))
+
+
+def test_tampered_payload_is_not_unpickled(signing_key):
+    data = bytearray(dumps("value", 10.0, 20.0))
+    data[-2] ^= 0xFF
+    assert loads(bytes(data)) is None
+
+
+def test_unsigned_pickle_is_rejected(signing_key):
+    class Boom:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('unpickled')",))
+
+    forged = _HEADER.pack(_FORMAT_VERSION, 10.0, 20.0) + b"\0" * 32 + pickle.dumps(Boom())
+    assert loads(forged) is None
+
+
+def test_placeholder_key_reports_misses(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_SIGNING_KEY", "")
+    monkeypatch.setattr(settings, "SECRET_KEY", "your-secret-key-change-in-production-min-32-chars")
+    assert not signing_key_configured()
+    assert loads(dumps("value", 10.0, 20.0)) is None
@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+from app.api.middleware.response_cache import (
+    SEARCH_PATH,
+    ResponseCacheMiddleware,
+    response_key,
+    response_ttl,
+)
+from app.config.settings import settings
+from app.core.cache import cache
+
+
+def _search_body(sites, total):
+    return json.dumps({"query": "q", "sites_searched": sites, "total_results": total, "results": []}).encode()
+
+
+def test_response_ttl():
+    assert response_ttl("/api/v1/videos", b"[]", 900) == settings.NEGATIVE_TTL_EMPTY
+    assert response_ttl("/api/v1/videos", b'[{"url":"u"}]', 900) == 900
+    assert response_ttl(SEARCH_PATH, _search_body(0, 0), 600) == 0
+    assert response_ttl(SEARCH_PATH, _search_body(3, 0), 600) == settings.NEGATIVE_TTL_EMPTY
+    assert response_ttl(SEARCH_PATH, _search_body(3, 12), 600) == 600
+
+
+def _app(body: bytes):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def _get(middleware, path, query):
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, None, send)
+    return sent
+
+
+def test_failed_search_is_not_stored():
+    async def main():
+        query = b"query=nothing-answered"
+        await _get(ResponseCacheMiddleware(_app(_search_body(0, 0))), SEARCH_PATH, query)
+        assert cache.ttl_remaining(response_key(SEARCH_PATH, query)) is None
+
+    asyncio.run(main())
+
+
+def test_empty_listing_ttl_is_capped():
+    async def main():
+        query = b"base_url=https://xnxx.com/empty-listing&page=1"
+        await _get(ResponseCacheMiddleware(_app(b"[]")), "/api/v1/videos", query)
+        remaining = cache.ttl_remaining(response_key("/api/v1/videos", query))
+        assert remaining is not None and remaining <= settings.NEGATIVE_TTL_EMPTY
+
+    asyncio.run(main())
+
+
+def test_listing_response_is_purged_with_its_site():
+    async def main():
+        query = b"base_url=https://www.xnxx.com/search/tagged&page=1"
+        await _get(ResponseCacheMiddleware(_app(b'[{"url":"u"}]')), "/api/v1/videos", query)
+        key = response_key("/api/v1/videos", query)
+        assert cache.ttl_remaining(key) is not None
+        await cache.invalidate(tag="xnxx")
+        assert cache.ttl_remaining(key) is None
+
+    asyncio.run(main())
+
+
+def test_listing_hits_are_reported_to_prefetcher(monkeypatch):
+    from app.api.middleware import response_cache
+
+    observed = []
+    monkeypatch.setattr(
+        response_cache.prefetcher, "observe",
+        lambda scraper, base_url, page, limit, served: observed.append((scraper.__name__, page, limit, served)),
+    )
+
+    async def main():
+        query = b"base_url=https://www.xnxx.com/search/observed&page=2&limit=2"
+        middleware = ResponseCacheMiddleware(_app(b'[{"url":"a"},{"url":"b"}]'))
+        await _get(middleware, "/api/v1/videos", query)
+        sent = await _get(middleware, "/api/v1/videos", query)
+        assert (b"x-cache", b"HIT") in sent[0]["headers"]
+
+    asyncio.run(main())
+    assert observed == [("app.scrapers.xnxx", 2, 2, 2)] * 2
+
+
+def _page_app(key: str, body: bytes):
+    """Route reading one cached data entry, like /videos reads its page"""
+    async def app(scope, receive, send):
+        await cache.get_or_set(key, lambda: ("card",), 60, stale_ttl_seconds=600)
+        await _app(body)(scope, receive, send)
+    return app
+
+
+def test_response_is_no_fresher_than_its_data():
+    async def main():
+        data_key = "page:test:fresh"
+        await cache.set(data_key, ("card",), 30, stale_ttl_seconds=600)
+        query = b"base_url=https://xnxx.com/fresh-data"
+        await _get(ResponseCacheMiddleware(_page_app(data_key, b'[{"url":"u"}]')), "/api/v1/videos", query)
+        remaining = cache.ttl_remaining(response_key("/api/v1/videos", query))
+        assert remaining is not None and remaining <= 30
+
+    asyncio.run(main())
+
+
+def test_response_built_from_stale_data_is_not_stored():
+    async def main():
+        data_key = "page:test:stale"
+        await cache.set(data_key, ("card",), 0.01, stale_ttl_seconds=600)
+        await asyncio.sleep(0.02)
+        query = b"base_url=https://xnxx.com/stale-data"
+        sent = await _get(ResponseCacheMiddleware(_page_app(data_key, b'[{"url":"u"}]')), "/api/v1/videos", query)
+        assert sent[1]["body"] == b'[{"url":"u"}]'
+        assert cache.ttl_remaining(response_key("/api/v1/videos", query)) is None
+
+    asyncio.run(main())
+
+
+def test_route_renders_with_a_synthetic_scope():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope)
+        await _app(b'[{"url":"u"}]')(scope, receive, send)
+
+    async def main():
+        scope = {
+            "type": "http", "method": "GET", "path": "/api/v1/videos",
+            "query_string": b"base_url=https://xnxx.com/synthetic",
+            "headers": [(b"host", b"api.example"), (b"cookie", b"session=1")],
+            "client": ("10.0.0.1", 1234),
+        }
+
+        async def send(message):
+            pass
+
+        await ResponseCacheMiddleware(app)(scope, None, send)
+
+    asyncio.run(main())
+    assert seen[0] is not None and seen[0]["headers"] == [(b"host", b"api.example")]
+    assert seen[0]["client"] is None
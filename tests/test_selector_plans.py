@@ -0,0 +1,57 @@
+from bs4 import BeautifulSoup
+
+from app.scrapers.selector_plans import SelectorPlan, get_plan_stats
+
+MIXED = """
+<ul>
+  <li class="card">a</li><li class="card">b</li><li class="card">c</li>
+  <li class="legacy">d</li>
+</ul>
+"""
+
+ONLY_CARDS = "<ul>" + '<li class="card">x</li>' * 6 + "</ul>"
+
+
+def test_select_keeps_union_when_cards_are_split_across_variants():
+    plan = SelectorPlan("test", "mixed", [".card", ".legacy"])
+    soup = BeautifulSoup(MIXED, "lxml")
+
+    assert [el.text for el in plan.select(soup, "0")] == ["a", "b", "c", "d"]
+    # Learned the union, so the next parse still returns every card
+    assert len(plan.select(soup, "0")) == 4
+    assert plan.get_stats()["learned"] == {"0": "union"}
+
+
+def test_select_falls_back_to_union_when_learned_variant_finds_too_few():
+    plan = SelectorPlan("test", "fallback", [".card", ".legacy"])
+    assert len(plan.select(BeautifulSoup(ONLY_CARDS, "lxml"), "0")) == 6
+    assert plan.get_stats()["learned"] == {"0": ".card"}
+
+    few = "<ul>" + '<li class="card">x</li><li class="legacy">y</li>' + '<li class="legacy">z</li>' * 4 + "</ul>"
+    assert len(plan.select(BeautifulSoup(few, "lxml"), "0")) == 6
+    assert plan.relearns == 1
+    assert plan.get_stats()["learned"] == {"0": "union"}
+
+
+def test_select_one_class_plan_learns_matched_variant():
+    plan = SelectorPlan("test", "views", [r"views-a", r"views-b"], kind="class")
+    card = BeautifulSoup('<div><span class="x views-b">12</span></div>', "lxml").div
+
+    assert plan.select_one(card, "1").text == "12"
+    assert plan.select_one(card, "1").text == "12"
+    assert plan.select_one(BeautifulSoup("<div></div>", "lxml").div, "1") is None
+    stats = plan.get_stats()
+    assert stats["learned"] == {"1": "views-b"}
+    assert stats["hits"] == 1
+    assert any(s["site"] == "test" and s["slot"] == "views" for s in get_plan_stats())
+
+
+def test_select_one_relearns_when_learned_variant_misses():
+    plan = SelectorPlan("test", "uploader", [r"name-a", r"name-b"], kind="class")
+    a = BeautifulSoup('<div><span class="name-a">A</span></div>', "lxml").div
+    b = BeautifulSoup('<div><span class="name-b">B</span></div>', "lxml").div
+
+    assert plan.select_one(a, "1").text == "A"
+    assert plan.select_one(b, "1").text == "B"
+    assert plan.relearns == 1
+    assert plan.get_stats()["learned"] == {"1": "name-b"}
@@ -0,0 +1,10 @@
+from app.core.urls import canonical_url
+
+
+def test_click_ids_and_utm_are_dropped():
+    assert canonical_url("http://www.xnxx.com/search/x/?utm_source=a&fbclid=b&gclid=c") == "https://xnxx.com/search/x"
+
+
+def test_generic_params_are_kept():
+    url = "https://xhamster.com/channels?from=2&source=top&ref=home&referrer=x&spm=1"
+    assert canonical_url(url) == "https://xhamster.com/channels?from=2&ref=home&referrer=x&source=top&spm=1"
@@ -0,0 +1,18 @@
+from app.services.video_cache import video_identity
+
+
+def test_id_case_is_kept():
+    assert video_identity("xhamster", "https://xhamster.com/videos/some-title-xhAbC12") == "xhAbC12"
+    assert video_identity("xvideos", "https://www.xvideos.com/video.kAbC123/title") == "kAbC123"
+
+
+def test_same_video_across_host_spellings():
+    a = video_identity("xnxx", "https://WWW.XNXX.com/video-Ab12cd/title")
+    b = video_identity("xnxx", "https://xnxx.com/video-Ab12cd/other-slug")
+    assert a == b == "Ab12cd"
+
+
+def test_fallback_path_keeps_case_lowercases_host():
+    a = video_identity("fapnut", "https://FAPNUT.net/Some/Path?utm_source=x")
+    b = video_identity("fapnut", "https://fapnut.net/Some/Path")
+    assert a == b == "/Some/Path"